@@ -2,7 +2,7 @@ from django.contrib import admin
 
 from core.admin import BaseAdmin
 
-from .models import PriceChartingConnect
+from .models import GamePriceChartingLink, PriceChartingConnect
 
 
 @admin.register(PriceChartingConnect)
@@ -14,3 +14,12 @@ class PriceChartingConnectAdmin(BaseAdmin):
 
     def items_count(self, obj):
         return obj.items.count()
+
+
+@admin.register(GamePriceChartingLink)
+class GamePriceChartingLinkAdmin(BaseAdmin):
+    list_display = ("game_id", "title", "platform", "connect", "source", "confidence")
+    list_filter = ("source",)
+    search_fields = ("game_id", "title", "connect__url")
+    readonly_fields = ("created_at", "updated_at")
+    raw_id_fields = ("connect",)
@@ -1,11 +1,52 @@
 from __future__ import annotations
 
+import logging
+import resource
+import time
 from pathlib import Path
+from typing import Optional
 
 from django.apps import AppConfig
 from django.conf import settings
 
-from .services.registry import REGISTRY
+from .services.registry import REGISTRY, GameRegistry
+from .services.reloader import RegistryReloader
+from .services.snapshot import SnapshotError
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent
+
+
+def rss_bytes() -> int:
+    """
+    return current resident set size of this process (peak rss if unknown).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def load_registry(registry: Optional[GameRegistry] = None) -> str:
+    """
+    load games registry from snapshot if available, else from json files.
+
+    returns the source that was used: "snapshot" or "json".
+    """
+    registry = registry or REGISTRY
+    snapshot = Path(getattr(settings, "GAMES_DB_SNAPSHOT", APP_DIR / "gamesdb.snap"))
+    if snapshot.exists():
+        try:
+            registry.load_snapshot(snapshot)
+            return "snapshot"
+        except SnapshotError as e:
+            logger.warning("games snapshot unusable, loading json: %s", e)
+
+    db_dir = Path(getattr(settings, "GAMES_DB_DIR", APP_DIR / "gamesdb"))
+    registry.load_from_dir(db_dir)
+    return "json"
 
 
 class GamesConfig(AppConfig):
@@ -15,7 +56,16 @@ class GamesConfig(AppConfig):
 
     def ready(self):
         if getattr(settings, "GAMES_DB_AUTOLOAD", True):
-            db_dir = Path(
-                getattr(settings, "GAMES_DB_DIR", Path(__file__).resolve().parent / "gamesdb")
+            started = time.perf_counter()
+            source = load_registry()
+            logger.info(
+                "games registry warmed up from %s: games=%d load_ms=%.1f rss_mb=%.1f",
+                source,
+                len(REGISTRY.games),
+                (time.perf_counter() - started) * 1000,
+                rss_bytes() / 1024 / 1024,
             )
-            REGISTRY.load_from_dir(db_dir)
+
+        interval = float(getattr(settings, "GAMES_DB_RELOAD_INTERVAL", 0) or 0)
+        if interval > 0:
+            RegistryReloader(REGISTRY, interval).start()
@@ -2,13 +2,40 @@
 integration with pricecharting
 
 this package contains
-- low-level http client
+- low-level http client and its asyncio variant
+- shared pooled http connection client
+- redis token-bucket rate limiter for outbound requests
+- benchmarks of fetching and parsing pages (`bench`)
 - simple schemas
 - shared types
 """
 
+from .async_client import AsyncPricechartingClient, HostThrottle
 from .client import PricechartingClient
+from .http import HTTP, SharedHttpClient
+from .ratelimit import (
+    LIMITER,
+    PricechartingBlocked,
+    PricechartingThrottled,
+    RateLimiter,
+    RateLimitExceeded,
+    lane,
+)
 from .schemas import SearchItem
 from .types import Region
 
-__all__ = ["PricechartingClient", "SearchItem", "Region"]
+__all__ = [
+    "PricechartingClient",
+    "AsyncPricechartingClient",
+    "HostThrottle",
+    "SearchItem",
+    "Region",
+    "SharedHttpClient",
+    "HTTP",
+    "RateLimiter",
+    "LIMITER",
+    "PricechartingThrottled",
+    "PricechartingBlocked",
+    "RateLimitExceeded",
+    "lane",
+]
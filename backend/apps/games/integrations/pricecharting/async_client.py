@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from .client import BASE, PricechartingClient
+from .http import client_options
+from .ratelimit import LIMITER, Lane
+from .schemas import SearchItem
+from .types import Region
+
+logger = logging.getLogger(__name__)
+
+
+class HostThrottle:
+    """
+    politeness delay: requests to one host start at least `delay` seconds
+    apart, however many of them are in flight.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self._next: Dict[str, float] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def wait(self, host: str) -> None:
+        if self.delay <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class AsyncPricechartingClient:
+    """
+    asyncio variant of `PricechartingClient` over one `httpx.AsyncClient`.
+
+    at most `concurrency` requests are in flight at once and requests to
+    the same host are spaced by `delay` seconds. every request also takes
+    a slot of the shared rate limiter in `lane` (background by default,
+    so bulk fetches give way to interactive calls). pages are parsed by
+    the same code as the blocking client. use as an async context manager.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 8,
+        delay: float = 0.0,
+        client: Optional[httpx.AsyncClient] = None,
+        lane: Lane = "background",
+    ) -> None:
+        self.lane = lane
+        self.concurrency = max(1, concurrency)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._throttle = HostThrottle(delay)
+        self._client = client
+        self._owns_client = client is None
+
+    async def __aenter__(self) -> "AsyncPricechartingClient":
+        if self._client is None:
+            options = client_options()
+            limits = options["limits"]
+            options["limits"] = httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+                keepalive_expiry=limits.keepalive_expiry,
+            )
+            self._client = httpx.AsyncClient(**options)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, url: str, params: Optional[Dict[str, str]] = None) -> httpx.Response:
+        assert self._client is not None, "use AsyncPricechartingClient as a context manager"
+        async with self._semaphore:
+            await LIMITER.acquire_async(self.lane)
+            await self._throttle.wait(urlsplit(url).netloc)
+            r = await self._client.get(url, params=params)
+        logger.debug("Pricecharting.async <- %s [%s]", str(r.request.url), r.status_code)
+        await asyncio.to_thread(LIMITER.observe, r)
+        r.raise_for_status()
+        return r
+
+    async def search(self, q: str, region: Region = "all", limit: int = 10) -> List[SearchItem]:
+        """
+        Search games on PriceCharting and return a list of SearchItem.
+        """
+        q = (q or "").strip()
+        params = PricechartingClient.search_params(q, region)
+        r = await self._get(f"{BASE}/search-products", params)
+        return PricechartingClient.parse_search(r.text, q, region, limit, str(r.request.url))
+
+    async def item_details(self, url_or_slug: str) -> Dict:
+        """
+        Fetch and parse a single game page.
+        """
+        url = PricechartingClient.item_url(url_or_slug)
+        r = await self._get(url)
+        return PricechartingClient.parse_item_details(url, r.text)
+
+    async def item_details_many(
+        self, tokens: Iterable[str]
+    ) -> AsyncIterator[Tuple[str, Union[Dict, Exception]]]:
+        """
+        fetch many game pages concurrently, yielding (token, details) in
+        completion order; a failed page yields its exception instead.
+        """
+
+        async def one(token: str) -> Tuple[str, Union[Dict, Exception]]:
+            try:
+                return token, await self.item_details(token)
+            except Exception as e:
+                return token, e
+
+        tasks = [asyncio.ensure_future(one(token)) for token in tokens]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+__all__ = ["AsyncPricechartingClient", "HostThrottle"]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Mapping
+
+from bs4 import BeautifulSoup
+
+from .async_client import AsyncPricechartingClient
+from .client import PricechartingClient
+from .parsing import html_parser, make_soup
+
+LEGACY_PRICE_LABELS = {
+    "loose": r"(?:Loose Price)",
+    "cib": r"(?:Complete Price|CIB Price)",
+    "new": r"(?:New Price)",
+    "graded": r"(?:Graded Price)",
+    "box_only": r"(?:Box Only Price)",
+    "manual_only": r"(?:Manual Only Price)",
+}
+
+
+def best_ms(fn: Callable[..., Any], *args: Any, rounds: int) -> float:
+    """
+    fastest of `rounds` calls of `fn(*args)`, in milliseconds.
+    """
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def measure_refresh(tokens: List[str], *, concurrency: int, delay: float = 0.0) -> Dict[str, Any]:
+    """
+    fetch and parse game pages like a bulk price refresh does, with at
+    most `concurrency` requests in flight; concurrency 0 runs the blocking
+    client one page after another. returns throughput and failures.
+    """
+
+    async def run() -> int:
+        failed = 0
+        async with AsyncPricechartingClient(concurrency=concurrency, delay=delay) as api:
+            async for _token, result in api.item_details_many(tokens):
+                failed += isinstance(result, Exception)
+        return failed
+
+    started = time.perf_counter()
+    if concurrency:
+        failed = asyncio.run(run())
+    else:
+        failed = 0
+        for token in tokens:
+            try:
+                PricechartingClient.item_details(token)
+            except Exception:
+                failed += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "pages": len(tokens),
+        "failed": failed,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "pages_per_s": round(len(tokens) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _parse_search(name: str, html: str) -> Any:
+    return PricechartingClient.parse_search(html, "", "all", 100)
+
+
+def _parse_item(name: str, html: str) -> Any:
+    return PricechartingClient.parse_item_details(name, html)
+
+
+def _full_tree(name: str, html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+def measure_parsing(pages: Mapping[str, str], *, rounds: int = 20) -> Dict[str, Any]:
+    """
+    per-page parse time of saved pricecharting pages. pages whose name
+    starts with "search" are parsed as search results, the rest as game
+    pages. `full_tree_ms` is the old baseline of building the whole
+    page with the stdlib parser; `parse_ms` is the client's parse.
+    """
+    out: Dict[str, Any] = {"parser": html_parser(), "pages": {}}
+    for name, html in sorted(pages.items()):
+        parse = _parse_search if name.startswith("search") else _parse_item
+        full = best_ms(_full_tree, name, html, rounds=rounds)
+        fast = best_ms(parse, name, html, rounds=rounds)
+        out["pages"][name] = {
+            "kb": round(len(html.encode("utf-8")) / 1024, 1),
+            "full_tree_ms": round(full, 2),
+            "parse_ms": round(fast, 2),
+            "speedup": round(full / fast, 1) if fast else 0.0,
+        }
+    return out
+
+
+def legacy_prices(soup) -> Dict[str, Any]:
+    """
+    the old price extraction: six regex scans over the flattened page text.
+    """
+    text = soup.get_text(" ", strip=True)
+    out = {}
+    for kind, label in LEGACY_PRICE_LABELS.items():
+        m = re.search(
+            label + r".{0,80}?\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{1,2})?)", text, re.I | re.S
+        )
+        out[kind] = Decimal(m.group(1).replace(",", "")) if m else None
+    return out
+
+
+def measure_price_extraction(pages: Mapping[str, str], *, rounds: int = 20) -> Dict[str, Any]:
+    """
+    price extraction time on whole-page trees of saved game pages, old
+    text regexes vs `PricechartingClient.extract_prices`. `differs`
+    lists the kinds on which the two disagree.
+    """
+    out: Dict[str, Any] = {}
+    for name, html in sorted(pages.items()):
+        soup = make_soup(html)
+        old = legacy_prices(soup)
+        new = PricechartingClient.extract_prices(soup)
+
+        legacy_ms = best_ms(legacy_prices, soup, rounds=rounds)
+        structural_ms = best_ms(PricechartingClient.extract_prices, soup, rounds=rounds)
+        out[name] = {
+            "legacy_ms": round(legacy_ms, 3),
+            "structural_ms": round(structural_ms, 3),
+            "speedup": round(legacy_ms / structural_ms, 1) if structural_ms else 0.0,
+            "differs": sorted(k for k in new if new[k] != old[k]),
+        }
+    return out
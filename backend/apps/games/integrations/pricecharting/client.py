@@ -10,6 +10,9 @@ import httpx
 from bs4 import BeautifulSoup
 from django.conf import settings
 
+from .http import HTTP
+from .parsing import ITEM_ONLY, RESULTS_TABLE_ID, SEARCH_ONLY, fragments, make_soup, text_snippet
+from .ratelimit import LIMITER
 from .schemas import SearchItem
 from .types import Region
 
@@ -29,6 +32,35 @@ HEADERS = {
     "Referer": BASE + "/",
 }
 
+PRICE_KINDS = ("loose", "cib", "new", "graded", "box_only", "manual_only")
+
+#: ids of the price table cells on game pages.
+PRICE_CELLS = {
+    "used_price": "loose",
+    "complete_price": "cib",
+    "new_price": "new",
+    "graded_price": "graded",
+    "box_only_price": "box_only",
+    "manual_only_price": "manual_only",
+}
+
+#: price labels of the page text, for pages without the cells.
+PRICE_LABELS = {
+    "loose": "loose",
+    "complete": "cib",
+    "cib": "cib",
+    "new": "new",
+    "graded": "graded",
+    "box only": "box_only",
+    "manual only": "manual_only",
+}
+
+_PRICE_LABEL_RE = re.compile(
+    r"\b(%s) Price\s*:?\s*\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{1,2})?)"
+    % "|".join(PRICE_LABELS),
+    re.I,
+)
+_GAME_HREF_RE = re.compile(r"/game/")
 _MONEY_RE = re.compile(r"\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{1,2})?)", re.I)
 
 
@@ -49,8 +81,27 @@ class PricechartingClient:
 
     @staticmethod
     def _client() -> httpx.Client:
-        """Return a configured httpx.Client instance for PriceCharting requests."""
-        return httpx.Client(headers=HEADERS, timeout=20, follow_redirects=True)
+        """
+        Return the shared pooled httpx.Client of this process.
+
+        It is not closed after a call, so later requests reuse its
+        keep-alive connections (see `SharedHttpClient`).
+        """
+        return HTTP.get()
+
+    @staticmethod
+    def _get(url: str, params: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        GET through the shared rate limiter, in the lane of the caller.
+
+        Raises `PricechartingBlocked` when the site pushes back and
+        `RateLimitExceeded` when no request slot frees up in time.
+        """
+        LIMITER.acquire()
+        r = PricechartingClient._client().get(url, params=params)
+        LIMITER.observe(r)
+        r.raise_for_status()
+        return r
 
     @staticmethod
     def _pick_results_table(soup: BeautifulSoup):
@@ -81,7 +132,7 @@ class PricechartingClient:
         - "mid" or "cib"
         - "high" or "new"
         """
-        headers = [th.get_text(" ", strip=True).lower() for th in table.select("tr th")]
+        headers = [th.get_text(" ", strip=True).lower() for th in table.find_all("th")]
 
         def col_idx(parts):
             for i, h in enumerate(headers):
@@ -117,7 +168,7 @@ class PricechartingClient:
 
         idx = PricechartingClient._col_indices(table)
         out: List[SearchItem] = []
-        rows = table.select("tr")
+        rows = table.find_all("tr")
 
         for tr in rows[1:]:
             tds = tr.find_all("td")
@@ -129,13 +180,13 @@ class PricechartingClient:
 
             if 0 <= idx["title"] < len(tds):
                 title_td = tds[idx["title"]]
-                img = title_td.select_one("img[src]")
+                img = title_td.find("img", src=True)
                 if img:
                     image = img.get("src", "").strip()
                     if image.startswith("//"):
                         image = "https:" + image
 
-                cands = title_td.select("a[href*='/game/']")
+                cands = title_td.find_all("a", href=_GAME_HREF_RE)
                 link = next(
                     (a for a in cands if a.get_text(strip=True)),
                     cands[0] if cands else None,
@@ -233,12 +284,11 @@ class PricechartingClient:
         return items
 
     @staticmethod
-    def search(q: str, region: Region = "all", limit: int = 10) -> List[SearchItem]:
+    def search_params(q: str, region: Region = "all") -> Dict[str, str]:
         """
-        Search games on PriceCharting and return a list of SearchItem.
+        Query parameters of the search-products page.
         """
-        q = (q or "").strip()
-        params = {
+        return {
             "type": "prices",
             "q": q,
             "sort": "popularity",
@@ -249,123 +299,168 @@ class PricechartingClient:
             "show-images": "true",
         }
 
-        with PricechartingClient._client() as client:
-            logger.info("Pricecharting.search -> %s/search-products params=%s", BASE, params)
-            r = client.get(f"{BASE}/search-products", params=params)
-            logger.info(
-                "Pricecharting.search <- %s [%s]",
-                str(r.request.url),
-                r.status_code,
-            )
-            r.raise_for_status()
+    @staticmethod
+    def search(q: str, region: Region = "all", limit: int = 10) -> List[SearchItem]:
+        """
+        Search games on PriceCharting and return a list of SearchItem.
+        """
+        q = (q or "").strip()
+        params = PricechartingClient.search_params(q, region)
+
+        logger.info("Pricecharting.search -> %s/search-products params=%s", BASE, params)
+        r = PricechartingClient._get(f"{BASE}/search-products", params)
+        logger.info(
+            "Pricecharting.search <- %s [%s]",
+            str(r.request.url),
+            r.status_code,
+        )
+        return PricechartingClient.parse_search(r.text, q, region, limit, str(r.request.url))
 
-            soup = BeautifulSoup(r.text, "html.parser")
-            title_text = soup.title.get_text(strip=True) if soup.title else ""
+    @staticmethod
+    def parse_search(
+        html: str, q: str, region: Region, limit: int, url: str = ""
+    ) -> List[SearchItem]:
+        """
+        Parse a search-products page into a list of SearchItem.
 
-            if "verify you are a human" in r.text.lower():
-                logger.warning(
-                    "Pricecharting.search anti-bot page detected for %s",
-                    str(r.request.url),
-                )
+        The results table is cut out of the page and parsed alone. If it
+        is not there, the tables of the page are searched for one, and
+        only then is the whole page parsed.
+        """
+        if "verify you are a human" in html.lower():
+            logger.warning("Pricecharting.search anti-bot page detected for %s", url)
 
-            items = PricechartingClient._extract_from_table(soup, region, limit)
+        table = fragments(html, RESULTS_TABLE_ID).get(RESULTS_TABLE_ID)
+        if table:
+            items = PricechartingClient._extract_from_table(make_soup(table), region, limit)
             if items:
                 logger.info("Pricecharting.search items_from_table=%d", len(items))
                 return items
 
-            logger.warning(
-                "Pricecharting.search empty table; title=%r url=%s",
-                title_text,
-                str(r.request.url),
-            )
-            alt = PricechartingClient._extract_games_anywhere(soup, region, limit)
-            if alt:
-                logger.info(
-                    "Pricecharting.search recovered via alt scan: %d items",
-                    len(alt),
-                )
-                return alt
-
-            snippet = BeautifulSoup(r.text[:2000], "html.parser").get_text(" ", strip=True)
-            logger.warning(
-                "Pricecharting.search empty_result q=%r region=%s; page_title=%r; first_html_snippet=%r",
-                q,
-                region,
-                title_text,
-                snippet,
+        soup = make_soup(html, SEARCH_ONLY)
+        title_text = soup.title.get_text(strip=True) if soup.title else ""
+        items = PricechartingClient._extract_from_table(soup, region, limit)
+        if items:
+            logger.info("Pricecharting.search items_from_table=%d", len(items))
+            return items
+
+        logger.warning("Pricecharting.search empty table; title=%r url=%s", title_text, url)
+        alt = PricechartingClient._extract_games_anywhere(make_soup(html), region, limit)
+        if alt:
+            logger.info(
+                "Pricecharting.search recovered via alt scan: %d items",
+                len(alt),
             )
-            return []
+            return alt
+
+        snippet = text_snippet(html)
+        logger.warning(
+            "Pricecharting.search empty_result q=%r region=%s; page_title=%r; first_html_snippet=%r",
+            q,
+            region,
+            title_text,
+            snippet,
+        )
+        return []
+
+    @staticmethod
+    def item_url(url_or_slug: str) -> str:
+        """
+        Absolute url of a game page given its url or slug.
+        """
+        if url_or_slug.startswith("http"):
+            return url_or_slug
+        return f"{BASE}/game/{url_or_slug.lstrip('/')}"
 
     @staticmethod
     def item_details(url_or_slug: str) -> Dict:
         """
         Fetch and parse a single game page.
         """
-        url = (
-            url_or_slug
-            if url_or_slug.startswith("http")
-            else f"{BASE}/game/{url_or_slug.lstrip('/')}"
+        url = PricechartingClient.item_url(url_or_slug)
+
+        logger.info("Pricecharting.item_details -> %s", url)
+        r = PricechartingClient._get(url)
+        logger.info(
+            "Pricecharting.item_details <- %s [%s]",
+            str(r.request.url),
+            r.status_code,
         )
+        return PricechartingClient.parse_item_details(url, r.text)
 
-        with PricechartingClient._client() as client:
-            logger.info("Pricecharting.item_details -> %s", url)
-            r = client.get(url)
-            logger.info(
-                "Pricecharting.item_details <- %s [%s]",
-                str(r.request.url),
-                r.status_code,
-            )
-            r.raise_for_status()
+    @staticmethod
+    def parse_item_details(url: str, html: str) -> Dict:
+        """
+        Parse a single game page fetched from `url`.
 
-            soup = BeautifulSoup(r.text, "html.parser")
-            h1 = soup.select_one("h1")
-            title = (h1.get_text(" ", strip=True) if h1 else "").strip()
+        Only the heading and price blocks are parsed when the page has
+        them, otherwise the whole page is searched.
+        """
+        parts = fragments(html, "product_name", "price_data", "full-prices")
+        if "product_name" in parts and len(parts) > 1:
+            soup = make_soup("".join(parts.values()))
+        else:
+            soup = make_soup(html, ITEM_ONLY)
+            if soup.h1 is None or soup.find(id=["price_data", "full-prices"]) is None:
+                soup = make_soup(html)
+        h1 = soup.select_one("h1")
+        title = (h1.get_text(" ", strip=True) if h1 else "").strip()
+
+        plat = soup.select_one(
+            "h1 a[href*='/jp-'], h1 a[href*='/pal-'], "
+            "h1 a[href*='/playstation'], h1 a[href*='/xbox'], "
+            "h1 a[href*='/sega'], h1 a"
+        )
+        platform = (plat.get_text(strip=True) if plat else "").strip()
+
+        slug = url.split("/game/", 1)[-1]
+        region: Region = "all"
+
+        low = slug.lower()
+        if low.startswith("jp-") or "jp " in platform.lower():
+            region = "japan"
+        elif low.startswith("pal-") or "pal " in platform.lower():
+            region = "pal"
+        elif low.startswith("ntsc") or "ntsc" in platform.lower() or "usa" in platform.lower():
+            region = "ntsc"
+
+        return {
+            "title": title,
+            "platform": platform,
+            "region": region,
+            "url": url,
+            "slug": slug,
+            "prices": PricechartingClient.extract_prices(soup),
+        }
 
-            plat = soup.select_one(
-                "h1 a[href*='/jp-'], h1 a[href*='/pal-'], "
-                "h1 a[href*='/playstation'], h1 a[href*='/xbox'], "
-                "h1 a[href*='/sega'], h1 a"
-            )
-            platform = (plat.get_text(strip=True) if plat else "").strip()
-
-            slug = url.split("/game/", 1)[-1]
-            region: Region = "all"
-
-            low = slug.lower()
-            if low.startswith("jp-") or "jp " in platform.lower():
-                region = "japan"
-            elif low.startswith("pal-") or "pal " in platform.lower():
-                region = "pal"
-            elif low.startswith("ntsc") or "ntsc" in platform.lower() or "usa" in platform.lower():
-                region = "ntsc"
-
-            text = soup.get_text(" ", strip=True)
-
-            def pick(name_regex: str) -> Optional[Decimal]:
-                m = re.search(
-                    name_regex + r".{0,80}?\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{1,2})?)",
-                    text,
-                    re.I | re.S,
-                )
-                return Decimal(m.group(1).replace(",", "")) if m else None
-
-            prices = {
-                "loose": pick(r"(?:Loose Price)"),
-                "cib": pick(r"(?:Complete Price|CIB Price)"),
-                "new": pick(r"(?:New Price)"),
-                "graded": pick(r"(?:Graded Price)"),
-                "box_only": pick(r"(?:Box Only Price)"),
-                "manual_only": pick(r"(?:Manual Only Price)"),
-            }
-
-            return {
-                "title": title,
-                "platform": platform,
-                "region": region,
-                "url": url,
-                "slug": slug,
-                "prices": prices,
-            }
+    @staticmethod
+    def extract_prices(soup: BeautifulSoup) -> Dict[str, Optional[Decimal]]:
+        """
+        Read prices from the price table cells in one walk of the tree.
+
+        Kinds whose cell is missing are looked up in the page text with
+        one combined "<Kind> Price $amount" regex, where the amount has to
+        follow its label directly.
+        """
+        prices: Dict[str, Optional[Decimal]] = dict.fromkeys(PRICE_KINDS)
+        seen = 0
+        for el in soup.descendants:
+            if getattr(el, "name", None) != "td" or el.get("id") not in PRICE_CELLS:
+                continue
+            kind = PRICE_CELLS[el["id"]]
+            if prices[kind] is None:
+                cell = el.find(class_="price") or el
+                prices[kind] = _parse_money(cell.get_text(" ", strip=True))
+            seen += 1
+            if seen == len(PRICE_CELLS):
+                break
+
+        if None in prices.values():
+            for m in _PRICE_LABEL_RE.finditer(soup.get_text(" ", strip=True)):
+                kind = PRICE_LABELS[m.group(1).lower()]
+                if prices[kind] is None:
+                    prices[kind] = Decimal(m.group(2).replace(",", ""))
+        return prices
 
 
 __all__ = ["PricechartingClient"]
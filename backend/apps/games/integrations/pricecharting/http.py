@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import os
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_CONNECT_EVENTS = frozenset(
+    ("connection.connect_tcp.started", "connection.connect_unix_socket.started")
+)
+_SEND_SUFFIX = ".send_request_headers.started"
+
+
+class SharedHttpClient:
+    """
+    process-wide pooled `httpx.Client` with keep-alive connections.
+
+    the client is created lazily and reused by every call (httpx clients
+    are thread-safe), so repeated scrapes skip dns, tcp and tls setup.
+    connections must not be shared across processes: after a fork the
+    child drops the inherited client without closing it (the sockets
+    still belong to the parent) and builds its own on first use.
+
+    `stats()` counts requests served over a kept-alive connection (hits)
+    and requests that had to open a new one (misses).
+    """
+
+    def __init__(self, factory: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+        self._factory = factory or client_options
+        self._client: Optional[httpx.Client] = None
+        self._pid: Optional[int] = None
+        self._lock = Lock()
+        self._stats = {"requests": 0, "hits": 0, "misses": 0, "clients": 0}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def get(self) -> httpx.Client:
+        """
+        return the client of this process, creating it on first use.
+        """
+        client = self._client
+        if client is not None and self._pid == os.getpid() and not client.is_closed:
+            return client
+        with self._lock:
+            if self._pid != os.getpid():
+                self._client = None
+            if self._client is None or self._client.is_closed:
+                self._client = self._build()
+                self._pid = os.getpid()
+            return self._client
+
+    def close(self) -> None:
+        """
+        close pooled connections (worker shutdown); the next `get` reopens.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+            if client is not None and self._pid == os.getpid():
+                client.close()
+
+    def reset(self) -> None:
+        """
+        forget the client without closing it, e.g. in a freshly forked worker.
+        """
+        with self._lock:
+            self._client = None
+            self._pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        pool counters of this process.
+        """
+        with self._lock:
+            data: Dict[str, Any] = dict(self._stats)
+        data["hit_ratio"] = round(data["hits"] / data["requests"], 3) if data["requests"] else 0.0
+        data["pid"] = os.getpid()
+        return data
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def _after_fork(self) -> None:
+        self._client = None
+        self._pid = None
+        self._lock = Lock()
+        self.reset_stats()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _build(self) -> httpx.Client:
+        options = self._factory()
+        hooks = options.setdefault("event_hooks", {})
+        hooks["request"] = [*hooks.get("request", []), self._trace_request]
+        self._stats["clients"] += 1
+        logger.info(
+            "pricecharting http client created pid=%s limits=%s http2=%s",
+            os.getpid(),
+            options.get("limits"),
+            options.get("http2", False),
+        )
+        return httpx.Client(**options)
+
+    def _trace_request(self, request: httpx.Request) -> None:
+        """
+        attach an httpcore trace callback that tells whether the request
+        went over a new connection or a pooled one.
+        """
+        opened = False
+        previous = request.extensions.get("trace")
+
+        def trace(name: str, info: Dict[str, Any]) -> None:
+            nonlocal opened
+            if name in _CONNECT_EVENTS:
+                opened = True
+            elif name.endswith(_SEND_SUFFIX):
+                self._count("requests")
+                self._count("misses" if opened else "hits")
+                opened = False
+            if previous is not None:
+                previous(name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+
+def client_options() -> Dict[str, Any]:
+    """
+    httpx.Client arguments from the PRICECHARTING_HTTP_* settings.
+    """
+    from .client import HEADERS
+
+    http2 = getattr(settings, "PRICECHARTING_HTTP2", False)
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("PRICECHARTING_HTTP2 is set but the h2 package is missing")
+        http2 = False
+
+    return {
+        "headers": HEADERS,
+        "timeout": httpx.Timeout(
+            getattr(settings, "PRICECHARTING_HTTP_TIMEOUT", 20),
+            connect=getattr(settings, "PRICECHARTING_HTTP_CONNECT_TIMEOUT", 5),
+        ),
+        "limits": httpx.Limits(
+            max_connections=getattr(settings, "PRICECHARTING_HTTP_MAX_CONNECTIONS", 10),
+            max_keepalive_connections=getattr(settings, "PRICECHARTING_HTTP_MAX_KEEPALIVE", 5),
+            keepalive_expiry=getattr(settings, "PRICECHARTING_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        ),
+        "http2": http2,
+        "follow_redirects": True,
+    }
+
+
+HTTP = SharedHttpClient()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import html as html_lib
+import importlib.util
+import logging
+import re
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+#: tree builders that honour `parse_only`, fastest first.
+PARSERS = ("lxml", "html.parser")
+
+#: search pages: only the page title and tables are built.
+SEARCH_ONLY = SoupStrainer(["title", "table"])
+
+#: game pages: only the heading and the price blocks are built.
+ITEM_ONLY = SoupStrainer(id=["product_name", "price_data", "full-prices"])
+
+#: id of the results table on search pages.
+RESULTS_TABLE_ID = "games_table"
+
+_ID_TAG = r"""<([a-zA-Z][a-zA-Z0-9]*)\b[^>]*?\bid=["']?%s["'\s/>]"""
+_TAG_RE = re.compile(r"<script.*?</script>|<style.*?</style>|<[^>]*>", re.I | re.S)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def html_parser() -> str:
+    """
+    beautifulsoup tree builder to use.
+
+    PRICECHARTING_HTML_PARSER picks one explicitly; by default lxml is
+    used when it is installed and the stdlib parser otherwise.
+    """
+    wanted = getattr(settings, "PRICECHARTING_HTML_PARSER", "") or ""
+    if wanted:
+        if wanted in PARSERS and _available(wanted):
+            return wanted
+        logger.warning("PRICECHARTING_HTML_PARSER=%r is not available, using defaults", wanted)
+    for name in PARSERS:
+        if _available(name):
+            return name
+    return "html.parser"
+
+
+def _available(name: str) -> bool:
+    return name == "html.parser" or importlib.util.find_spec(name) is not None
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    parse `html`, building only the elements matched by `parse_only`.
+    """
+    return BeautifulSoup(html, html_parser(), parse_only=parse_only)
+
+
+def fragments(html: str, *ids: str) -> Dict[str, str]:
+    """
+    raw markup of the elements with the given ids, located by plain text
+    search so the rest of the page is never tokenized. ids that are
+    missing or whose element is not closed are left out.
+    """
+    out: Dict[str, str] = {}
+    for id_ in ids:
+        m = re.search(_ID_TAG % re.escape(id_), html)
+        if not m:
+            continue
+        depth = 0
+        for t in re.compile(r"<(/?)%s\b" % m.group(1), re.I).finditer(html, m.start()):
+            depth += -1 if t.group(1) else 1
+            if depth == 0:
+                end = html.find(">", t.end())
+                if end != -1:
+                    out[id_] = html[m.start() : end + 1]
+                break
+    return out
+
+
+def text_snippet(html: str, size: int = 2000) -> str:
+    """
+    visible text of the first `size` characters of a page, for logs.
+    """
+    text = _TAG_RE.sub(" ", html[:size])
+    return _SPACE_RE.sub(" ", html_lib.unescape(text)).strip()
+
+
+__all__ = [
+    "ITEM_ONLY",
+    "RESULTS_TABLE_ID",
+    "SEARCH_ONLY",
+    "fragments",
+    "html_parser",
+    "make_soup",
+    "text_snippet",
+]
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, Literal, Optional
+
+import httpx
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+Lane = Literal["interactive", "background"]
+
+#: lane of blocking client calls made in this context.
+LANE: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "pricecharting_lane", default="interactive"
+)
+
+ANTI_BOT_MARKER = "verify you are a human"
+
+# token bucket shared through redis. one hash holds the bucket (tokens,
+# ts), the current adaptive rate, the end of a cooldown after the site
+# pushed back, and until when interactive callers are waiting. the
+# background lane only takes a token while no interactive caller waits
+# and `reserve` tokens stay in the bucket for them. returns the seconds
+# to wait before asking again, "0" when a token was taken.
+ACQUIRE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local st = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'rate', 'blocked_until', 'hi_until')
+local burst = tonumber(ARGV[2])
+local rate = math.min(tonumber(st[3]) or tonumber(ARGV[3]), tonumber(ARGV[3]))
+local tokens = tonumber(st[1]) or burst
+local ts = tonumber(st[2]) or now
+local blocked = tonumber(st[4]) or 0
+local hi = tonumber(st[5]) or 0
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if now < blocked then
+  wait = blocked - now
+else
+  local need = 1
+  if ARGV[1] == 'background' then
+    if now < hi then
+      wait = hi - now
+    end
+    need = 1 + tonumber(ARGV[4])
+  end
+  if wait == 0 then
+    if tokens >= need then
+      tokens = tokens - 1
+    else
+      wait = (need - tokens) / rate
+    end
+  end
+end
+if wait > 0 and ARGV[1] == 'interactive' then
+  hi = math.max(hi, now + wait + 1 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'rate', rate, 'hi_until', hi)
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+# aimd: every success adds ARGV[2] req/s up to the configured rate, a
+# block multiplies the rate by ARGV[3] (not below ARGV[4]), empties the
+# bucket and pauses everyone for ARGV[5] seconds.
+FEEDBACK = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local max_rate = tonumber(ARGV[6])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or max_rate
+if ARGV[1] == 'ok' then
+  if rate >= max_rate then
+    return tostring(rate)
+  end
+  rate = math.min(max_rate, rate + tonumber(ARGV[2]))
+else
+  rate = math.max(tonumber(ARGV[4]), rate * tonumber(ARGV[3]))
+  local blocked = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+  redis.call('HSET', KEYS[1], 'tokens', 0, 'ts', now,
+             'blocked_until', math.max(blocked, now + tonumber(ARGV[5])))
+end
+redis.call('HSET', KEYS[1], 'rate', rate)
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(rate)
+"""
+
+
+class PricechartingThrottled(Exception):
+    """
+    pricecharting cannot be asked right now; retry after `retry_after` seconds.
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PricechartingBlocked(PricechartingThrottled):
+    """
+    the site answered 429/503 or with its anti-bot page.
+    """
+
+
+class RateLimitExceeded(PricechartingThrottled):
+    """
+    no request slot became free within the lane's wait limit.
+    """
+
+
+class RateLimiter:
+    """
+    token bucket for outbound pricecharting requests, shared through redis
+    by every gunicorn and celery process.
+
+    the rate adapts aimd-style: each successful response raises it by
+    `increase` req/s up to PRICECHARTING_RATE, each 429/503 or anti-bot
+    page multiplies it by `decrease` and pauses all callers for the
+    Retry-After time (or PRICECHARTING_RATE_COOLDOWN).
+
+    callers are in one of two lanes. interactive calls (proxy search and
+    item views) may drain the bucket; background calls (bulk refresh)
+    leave PRICECHARTING_RATE_RESERVE tokens and step aside while an
+    interactive call is waiting.
+
+    with an empty PRICECHARTING_RATE_LIMIT_URL (the default) the limiter
+    is off. if redis is unreachable, each process paces itself at the
+    full rate and leaves redis alone for `retry_down` seconds.
+    """
+
+    increase = 0.05
+    decrease = 0.5
+    retry_down = 30.0
+
+    def __init__(self, client: Any = None, key: str = "pc:ratelimit") -> None:
+        self.key = key
+        self._client = client
+        self._fixed = client is not None
+        self._url: Optional[str] = None
+        self._scripts: Dict[str, Any] = {}
+        self._lock = Lock()
+        self._local_next = 0.0
+        self._down_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        return float(getattr(settings, "PRICECHARTING_RATE", 2.0))
+
+    @property
+    def burst(self) -> int:
+        return int(getattr(settings, "PRICECHARTING_RATE_BURST", 5))
+
+    @property
+    def min_rate(self) -> float:
+        return float(getattr(settings, "PRICECHARTING_RATE_MIN", 0.1))
+
+    @property
+    def reserve(self) -> int:
+        reserve = int(getattr(settings, "PRICECHARTING_RATE_RESERVE", 2))
+        if reserve >= self.burst:
+            raise ImproperlyConfigured(
+                "PRICECHARTING_RATE_RESERVE must be below PRICECHARTING_RATE_BURST, "
+                "else background requests never get a token"
+            )
+        return reserve
+
+    @property
+    def cooldown(self) -> float:
+        return float(getattr(settings, "PRICECHARTING_RATE_COOLDOWN", 30))
+
+    def max_wait(self, lane: str) -> float:
+        waits = getattr(settings, "PRICECHARTING_RATE_MAX_WAIT", {})
+        return float(waits.get(lane, 10 if lane == "interactive" else 300))
+
+    @property
+    def client(self) -> Any:
+        """
+        redis client of PRICECHARTING_RATE_LIMIT_URL, or the one passed in.
+        """
+        if self._fixed:
+            return self._client
+        url = getattr(settings, "PRICECHARTING_RATE_LIMIT_URL", "")
+        if url != self._url:
+            import redis
+
+            with self._lock:
+                self._client = (
+                    redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+                    if url
+                    else None
+                )
+                self._scripts = {}
+                self._url = url
+                self._down_until = 0.0
+        return self._client
+
+    def _script(self, name: str, source: str):
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = self.client.register_script(source)
+        return script
+
+    def try_acquire(self, lane: str = "interactive") -> float:
+        """
+        take a request slot; 0 when taken, else seconds to wait before retrying.
+        """
+        if self.client is None:
+            return 0.0
+        if self._is_down():
+            return self._local_wait()
+        args = [lane, self.burst, self.rate, self.reserve]
+        try:
+            wait = self._script("acquire", ACQUIRE)(keys=[self.key], args=args)
+            return float(wait)
+        except Exception as e:
+            self._mark_down(e)
+            return self._local_wait()
+
+    def _is_down(self) -> bool:
+        return time.monotonic() < self._down_until
+
+    def _mark_down(self, error: Exception) -> None:
+        logger.warning(
+            "pricecharting rate limiter unavailable, pacing locally for %.0fs: %s",
+            self.retry_down,
+            error,
+        )
+        self._down_until = time.monotonic() + self.retry_down
+
+    def _local_wait(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._local_next:
+                self._local_next = now + 1 / self.rate
+                return 0.0
+            return self._local_next - now
+
+    def acquire(self, lane: Optional[str] = None) -> None:
+        """
+        block until a request slot is free for `lane` (default: `LANE`).
+        """
+        lane = lane or LANE.get()
+        deadline = time.monotonic() + self.max_wait(lane)
+        while True:
+            wait = self.try_acquire(lane)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(f"no pricecharting slot for {lane} request", wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, lane: str = "background") -> None:
+        """
+        `acquire` for event loops; redis is asked from a worker thread.
+        """
+        deadline = time.monotonic() + self.max_wait(lane)
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, lane)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(f"no pricecharting slot for {lane} request", wait)
+            await asyncio.sleep(wait)
+
+    def feedback(self, ok: bool, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        report a response; returns the new shared rate (None when off).
+        """
+        if self.client is None or self._is_down():
+            return None
+        cooldown = retry_after if retry_after is not None else self.cooldown
+        try:
+            rate = self._script("feedback", FEEDBACK)(
+                keys=[self.key],
+                args=[
+                    "ok" if ok else "blocked",
+                    self.increase,
+                    self.decrease,
+                    self.min_rate,
+                    cooldown,
+                    self.rate,
+                ],
+            )
+            return float(rate)
+        except Exception as e:
+            self._mark_down(e)
+            return None
+
+    def observe(self, response: httpx.Response) -> None:
+        """
+        feed a response back into the limiter; raise `PricechartingBlocked`
+        when the site pushed back.
+        """
+        blocked = response.status_code in (429, 503) or (
+            response.status_code == 200 and ANTI_BOT_MARKER in response.text.lower()
+        )
+        if not blocked:
+            self.feedback(True)
+            return
+
+        retry_after = _retry_after(response.headers.get("Retry-After"))
+        rate = self.feedback(False, retry_after)
+        wait = retry_after if retry_after is not None else self.cooldown
+        logger.warning(
+            "pricecharting pushed back [%s] on %s; pausing %.0fs, rate now %s req/s",
+            response.status_code,
+            response.request.url,
+            wait,
+            rate,
+        )
+        raise PricechartingBlocked(f"pricecharting blocked {response.request.url}", wait)
+
+    def state(self) -> Dict[str, Any]:
+        """
+        current shared bucket, for diagnostics.
+        """
+        if self.client is None:
+            return {"enabled": False}
+        try:
+            raw = self.client.hgetall(self.key)
+        except Exception as e:
+            return {"enabled": True, "error": str(e)}
+        data = {k.decode(): float(v) for k, v in raw.items()}
+        now = time.time()
+        return {
+            "enabled": True,
+            "rate": data.get("rate", self.rate),
+            "tokens": round(data.get("tokens", self.burst), 2),
+            "blocked_for": round(max(0.0, data.get("blocked_until", 0) - now), 1),
+        }
+
+    def reset(self) -> None:
+        if self.client is not None:
+            self.client.delete(self.key)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+@contextmanager
+def lane(name: Lane) -> Iterator[None]:
+    """
+    run blocking client calls in this block in lane `name`.
+    """
+    token = LANE.set(name)
+    try:
+        yield
+    finally:
+        LANE.reset(token)
+
+
+LIMITER = RateLimiter()
+
+__all__ = [
+    "LIMITER",
+    "Lane",
+    "PricechartingBlocked",
+    "PricechartingThrottled",
+    "RateLimitExceeded",
+    "RateLimiter",
+    "lane",
+]
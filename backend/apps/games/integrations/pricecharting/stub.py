@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+ITEM_PAGE = """<!DOCTYPE html>
+<html><head><title>{title} Prices {console} | Compare Loose, CIB &amp; New Prices</title></head>
+<body>
+<div id="product_details">
+<h1 id="product_name" class="chart_title">{title}
+<a href="/console/{console_slug}">{console}</a></h1>
+</div>
+<table id="price_data" class="info_box">
+<tr><th>Loose Price</th><th>Complete Price</th><th>New Price</th><th>Graded Price</th>
+<th>Box Only Price</th><th>Manual Only Price</th></tr>
+<tr>
+<td id="used_price"><span class="price js-price">${loose}</span></td>
+<td id="complete_price"><span class="price js-price">${cib}</span></td>
+<td id="new_price"><span class="price js-price">${new}</span></td>
+<td id="graded_price"><span class="price js-price">${graded}</span></td>
+<td id="box_only_price"><span class="price js-price">${box_only}</span></td>
+<td id="manual_only_price"><span class="price js-price">${manual_only}</span></td>
+</tr>
+</table>
+{filler}
+</body></html>
+"""
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>Search Results | PriceCharting</title></head>
+<body>
+<table id="games_table">
+<tr><th>Title</th><th>Set</th><th>Loose</th><th>CIB</th><th>New</th></tr>
+{rows}
+</table>
+</body></html>
+"""
+
+BLOCKED_PAGE = """<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head>
+<body><h1>Please verify you are a human</h1></body></html>
+"""
+
+SEARCH_ROW = """<tr id="product-{n}">
+<td class="title"><a href="/game/{console_slug}/{slug}">{title}</a></td>
+<td class="console">{console}</td>
+<td class="price numeric used_price"><span class="js-price">${loose}</span></td>
+<td class="price numeric cib_price"><span class="js-price">${cib}</span></td>
+<td class="price numeric new_price"><span class="js-price">${new}</span></td>
+</tr>
+"""
+
+
+def _slug_prices(slug: str) -> Dict[str, str]:
+    base = sum(map(ord, slug)) % 9000 / 100 + 5
+    return {
+        "loose": f"{base:.2f}",
+        "cib": f"{base * 2:.2f}",
+        "new": f"{base * 4:,.2f}",
+        "graded": f"{base * 8:,.2f}",
+        "box_only": f"{base / 2:.2f}",
+        "manual_only": f"{base / 4:.2f}",
+    }
+
+
+def item_page(slug: str, filler: int = 0) -> str:
+    """
+    game page for `console/title-slug` with prices derived from the slug.
+    """
+    console_slug, _, title_slug = slug.partition("/")
+    return ITEM_PAGE.format(
+        title=title_slug.replace("-", " ").title(),
+        console=console_slug.replace("-", " ").title(),
+        console_slug=console_slug,
+        filler="<p>" + "lorem ipsum dolor sit amet " * filler + "</p>" if filler else "",
+        **_slug_prices(slug),
+    )
+
+
+def search_page(q: str, count: int = 10) -> str:
+    """
+    search results table with `count` rows for query `q`.
+    """
+    rows = []
+    for n in range(count):
+        slug = f"{q.replace(' ', '-').lower()}-{n}"
+        rows.append(
+            SEARCH_ROW.format(
+                n=n,
+                slug=slug,
+                title=f"{q.title()} {n}",
+                console="Super Nintendo",
+                console_slug="super-nintendo",
+                **_slug_prices(slug),
+            )
+        )
+    return SEARCH_PAGE.format(rows="".join(rows))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    server: "_Server"
+
+    def do_GET(self):
+        stub = self.server.stub
+        parts = urlsplit(self.path)
+        stub._enter(parts.path)
+        try:
+            self._respond(stub, parts)
+        finally:
+            stub._leave()
+
+    def _respond(self, stub: "StubServer", parts) -> None:
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        status = 200
+        if parts.path.startswith("/game/"):
+            slug = parts.path[len("/game/") :]
+            if slug in stub.fail:
+                status, body = 500, "error"
+            elif slug in stub.blocked:
+                body = BLOCKED_PAGE
+            else:
+                body = item_page(slug, stub.filler)
+        elif parts.path == "/search-products":
+            q = parse_qs(parts.query).get("q", [""])[0]
+            body = search_page(q)
+        else:
+            status, body = 404, "not found"
+
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    stub: "StubServer"
+
+
+class StubServer:
+    """
+    local stand-in for pricecharting.com serving generated game and search
+    pages, for tests and benchmarks. every response is delayed by
+    `latency` seconds to mimic a remote site; slugs in `fail` answer 500
+    and slugs in `blocked` answer with an anti-bot page.
+    `max_in_flight` is the largest number of requests served at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        filler: int = 0,
+        fail: Optional[List[str]] = None,
+        blocked: Optional[List[str]] = None,
+    ) -> None:
+        self.latency = latency
+        self.filler = filler
+        self.fail = set(fail or ())
+        self.blocked = set(blocked or ())
+        self.requests: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "stub server is not running"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pricecharting-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _enter(self, path: str) -> None:
+        with self._lock:
+            self.requests.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.games.services.benchmark import (
+    QUERY_MIXES,
+    compare_results,
+    environment,
+    generate_games,
+    measure_load,
+    run_benchmark,
+)
+from apps.games.services.db_search import DatabaseSearchBackend, import_games
+from apps.games.services.registry import GameRegistry, source_manifest
+from apps.games.services.search import GameSearchService
+from apps.games.services.snapshot import write_snapshot
+
+APP_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+class Command(BaseCommand):
+    """
+    benchmark games registry loading and search queries.
+    """
+
+    help = (
+        "Measure cold load time, peak RSS, query latency percentiles and throughput "
+        "of the games registry (and optionally the database search engine) on the "
+        "real gamesdb and/or synthetic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--src",
+            default=str(getattr(settings, "GAMES_DB_DIR", APP_DIR / "gamesdb")),
+            help="Directory with gamesdb json files.",
+        )
+        parser.add_argument(
+            "--no-gamesdb", action="store_true", help="Skip the real gamesdb dataset."
+        )
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            action="append",
+            default=[],
+            metavar="N",
+            help="Also benchmark N generated records (repeatable, e.g. 1000000).",
+        )
+        parser.add_argument(
+            "--snapshot",
+            action="store_true",
+            help="Also measure cold load from a compiled snapshot.",
+        )
+        parser.add_argument(
+            "--engine",
+            action="append",
+            choices=["registry", "database"],
+            help=(
+                "Search engine to benchmark (repeatable, default: registry). "
+                "database imports every dataset into the games table, replacing its rows."
+            ),
+        )
+        parser.add_argument("--queries", type=int, default=2000, help="Queries per mix.")
+        parser.add_argument(
+            "--mix",
+            action="append",
+            choices=sorted(QUERY_MIXES),
+            help="Query mix to run (repeatable, default: all).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--out", help="Write results as json to this file.")
+        parser.add_argument("--compare", help="Previous results json to compare with.")
+
+    def handle(self, *args, **options):
+        datasets = []
+        if not options["no_gamesdb"]:
+            src = Path(options["src"])
+            if not src.is_dir():
+                raise CommandError(f"{src} is not a directory")
+            datasets.append(("gamesdb", src))
+        if not datasets and not options["synthetic"]:
+            raise CommandError("nothing to benchmark")
+
+        baseline = None
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+
+        results = {"environment": environment(), "seed": options["seed"], "datasets": {}}
+        with tempfile.TemporaryDirectory(prefix="bench-games-") as tmp:
+            for count in options["synthetic"]:
+                d = Path(tmp) / f"synthetic-{count}"
+                self.stdout.write(f"generating {count} synthetic games ...")
+                generate_games(d, count, seed=options["seed"])
+                datasets.append((d.name, d))
+
+            for name, path in datasets:
+                results["datasets"][name] = self._bench(name, path, Path(tmp), options)
+
+        if options["out"]:
+            Path(options["out"]).write_text(json.dumps(results, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['out']}"))
+
+        if baseline is not None:
+            self._print_comparison(baseline, results)
+
+    def _bench(self, name: str, path: Path, tmp: Path, options) -> dict:
+        self.stdout.write(f"[{name}] cold load from json ...")
+        load = {"json": measure_load("json", path)}
+        self._print_load(name, "json", load["json"])
+
+        registry = GameRegistry()
+        registry.load_from_dir(path)
+
+        if options["snapshot"]:
+            snap = tmp / f"{name}.snap"
+            write_snapshot(registry, snap, sources=source_manifest(path))
+            load["snapshot"] = measure_load("snapshot", snap)
+            self._print_load(name, "snapshot", load["snapshot"])
+
+        result = {"games": len(registry.games), "load": load}
+        engines = options["engine"] or ["registry"]
+        if "registry" in engines:
+            result["queries"] = run_benchmark(
+                registry, queries=options["queries"], mixes=options["mix"], seed=options["seed"]
+            )
+            self._print_queries(name, "registry", result["queries"])
+
+        if "database" in engines:
+            started = time.perf_counter()
+            import_games(path)
+            import_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.stdout.write(f"[{name}] import {connection.vendor} import_ms={import_ms:.0f}")
+
+            service = GameSearchService(
+                registry=registry, cache_size=0, backend=DatabaseSearchBackend()
+            )
+            queries = run_benchmark(
+                registry,
+                service=service,
+                queries=options["queries"],
+                mixes=options["mix"],
+                exclude=("fuzzy",),
+                seed=options["seed"],
+            )
+            result["database"] = {
+                "vendor": connection.vendor,
+                "import_ms": import_ms,
+                "queries": queries,
+            }
+            self._print_queries(name, connection.vendor, queries)
+        return result
+
+    def _print_queries(self, name: str, engine: str, queries: dict) -> None:
+        for mix, stats in queries.items():
+            self.stdout.write(
+                f"[{name}] {engine} {mix:<10} p50={stats['p50_ms']:.2f}ms "
+                f"p90={stats['p90_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms "
+                f"max={stats['max_ms']:.2f}ms qps={stats['qps']:.0f} "
+                f"hits={stats['hit_ratio']:.0%}"
+            )
+
+    def _print_load(self, name: str, source: str, stats: dict) -> None:
+        self.stdout.write(
+            f"[{name}] load {source:<8} games={stats['games']} load_ms={stats['load_ms']:.0f} "
+            f"peak_rss_mb={stats['peak_rss_mb']:.0f}"
+        )
+
+    def _print_comparison(self, old: dict, new: dict) -> None:
+        self.stdout.write("metric  before  after  change")
+        for key, before, after, change in compare_results(old, new):
+            line = f"{key}  {before:g}  {after:g}  {change:+.1%}"
+            if key.endswith("_ms") or key.endswith("_mb"):
+                worse = change > 0.1
+            elif key.endswith("qps"):
+                worse = change < -0.1
+            else:
+                worse = False
+            self.stdout.write(self.style.WARNING(line) if worse else line)
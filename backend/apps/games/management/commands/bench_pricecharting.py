@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from apps.games.integrations.pricecharting.bench import measure_refresh
+from apps.games.integrations.pricecharting.stub import StubServer
+from apps.games.services.benchmark import environment
+
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32]
+
+
+class Command(BaseCommand):
+    """
+    benchmark bulk pricecharting page fetching against a local stub server.
+    """
+
+    help = (
+        "Fetch and parse generated pricecharting game pages from a local stub "
+        "server with simulated latency, and report throughput for the blocking "
+        "client and for the async client at several concurrency levels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=200, help="Pages per run.")
+        parser.add_argument(
+            "--latency", type=float, default=0.05, help="Stub response delay in seconds."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            action="append",
+            metavar="N",
+            help=f"Requests in flight (repeatable, default: {DEFAULT_CONCURRENCY}).",
+        )
+        parser.add_argument(
+            "--delay", type=float, default=0.0, help="Per-host delay between requests."
+        )
+        parser.add_argument(
+            "--no-blocking", action="store_true", help="Skip the blocking client baseline."
+        )
+        parser.add_argument(
+            "--rate-limit",
+            action="store_true",
+            help="Keep the shared PRICECHARTING_RATE limiter on (off by default).",
+        )
+        parser.add_argument("--out", help="Write results as json to this file.")
+
+    def handle(self, *args, **options):
+        levels = options["concurrency"] or DEFAULT_CONCURRENCY
+        if not options["no_blocking"]:
+            levels = [0, *levels]
+
+        results = {
+            "environment": environment(),
+            "pages": options["pages"],
+            "latency": options["latency"],
+            "delay": options["delay"],
+            "runs": {},
+        }
+        limiter = (
+            nullcontext()
+            if options["rate_limit"]
+            else override_settings(PRICECHARTING_RATE_LIMIT_URL="")
+        )
+        with limiter, StubServer(latency=options["latency"]) as stub:
+            tokens = [f"{stub.url}/game/super-nintendo/game-{n}" for n in range(options["pages"])]
+            for level in levels:
+                name = "blocking" if level == 0 else f"async-{level}"
+                stats = measure_refresh(tokens, concurrency=level, delay=options["delay"])
+                results["runs"][name] = stats
+                self.stdout.write(
+                    f"{name:<10} pages={stats['pages']} failed={stats['failed']} "
+                    f"elapsed_ms={stats['elapsed_ms']:.0f} pages_per_s={stats['pages_per_s']:.1f}"
+                )
+
+        if options["out"]:
+            Path(options["out"]).write_text(json.dumps(results, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['out']}"))
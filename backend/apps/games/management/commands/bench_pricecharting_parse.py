@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.integrations.pricecharting.bench import measure_parsing, measure_price_extraction
+from apps.games.services.benchmark import environment
+
+DEFAULT_PAGES = Path(__file__).resolve().parents[2] / "tests" / "pages"
+
+
+class Command(BaseCommand):
+    """
+    benchmark html parsing of saved pricecharting pages.
+    """
+
+    help = (
+        "Parse saved pricecharting search and game pages (*.html, search pages "
+        "named search_*) and compare the client's parse time with building a "
+        "full BeautifulSoup tree of the page, and structural price extraction "
+        "with the old text regexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages-dir", default=str(DEFAULT_PAGES), help="Directory of saved .html pages."
+        )
+        parser.add_argument("--rounds", type=int, default=20, help="Timed runs per page.")
+        parser.add_argument("--out", help="Write results as json to this file.")
+
+    def handle(self, *args, **options):
+        pages = {
+            p.stem: p.read_text(encoding="utf-8")
+            for p in sorted(Path(options["pages_dir"]).glob("*.html"))
+        }
+        if not pages:
+            raise CommandError(f"No .html pages in {options['pages_dir']}")
+
+        stats = measure_parsing(pages, rounds=options["rounds"])
+        self.stdout.write(f"parser={stats['parser']}")
+        for name, row in stats["pages"].items():
+            self.stdout.write(
+                f"{name:<28} kb={row['kb']:.0f} full_tree_ms={row['full_tree_ms']:.2f} "
+                f"parse_ms={row['parse_ms']:.2f} speedup={row['speedup']:.1f}x"
+            )
+
+        items = {name: html for name, html in pages.items() if not name.startswith("search")}
+        prices = measure_price_extraction(items, rounds=options["rounds"])
+        for name, row in prices.items():
+            self.stdout.write(
+                f"{name:<28} prices legacy_ms={row['legacy_ms']:.3f} "
+                f"structural_ms={row['structural_ms']:.3f} speedup={row['speedup']:.1f}x "
+                f"differs={','.join(row['differs']) or '-'}"
+            )
+
+        if options["out"]:
+            results = {"environment": environment(), **stats, "prices": prices}
+            Path(options["out"]).write_text(json.dumps(results, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['out']}"))
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.services.registry import GameRegistry, source_manifest
+from apps.games.services.snapshot import write_snapshot
+
+APP_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+class Command(BaseCommand):
+    """
+    compile the json games database into a binary registry snapshot.
+    """
+
+    help = "Compile gamesdb/*.json into a memory-mappable registry snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--src",
+            default=str(getattr(settings, "GAMES_DB_DIR", APP_DIR / "gamesdb")),
+            help="Directory with gamesdb json files.",
+        )
+        parser.add_argument(
+            "--out",
+            default=str(getattr(settings, "GAMES_DB_SNAPSHOT", APP_DIR / "gamesdb.snap")),
+            help="Snapshot file to write.",
+        )
+
+    def handle(self, *args, **options):
+        src = Path(options["src"])
+        out = Path(options["out"])
+        if not src.is_dir():
+            raise CommandError(f"{src} is not a directory")
+
+        started = time.perf_counter()
+        registry = GameRegistry()
+        count, _ = registry.load_from_dir(src)
+        size = write_snapshot(registry, out, sources=source_manifest(src))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {out} ({count} games, {size / 1024 / 1024:.1f} MiB) "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        )
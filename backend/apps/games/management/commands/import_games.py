@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.games.services.db_search import import_games
+
+APP_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+class Command(BaseCommand):
+    """
+    import the json games database into the `games` table.
+    """
+
+    help = (
+        "Replace the games table with gamesdb/*.json and refresh its title search index "
+        "(SQLite FTS5 trigram or PostgreSQL pg_trgm)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--src",
+            default=str(getattr(settings, "GAMES_DB_DIR", APP_DIR / "gamesdb")),
+            help="Directory with gamesdb json files.",
+        )
+
+    def handle(self, *args, **options):
+        src = Path(options["src"])
+        if not src.is_dir():
+            raise CommandError(f"{src} is not a directory")
+
+        started = time.perf_counter()
+        count = import_games(src)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {count} games into {connection.vendor} "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        )
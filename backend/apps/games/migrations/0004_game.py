@@ -0,0 +1,76 @@
+# Generated by Django 4.2.25 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE games_fts USING fts5("
+    "title_lower, content='games', content_rowid='id', tokenize='trigram')",
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS games_fts"]
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX games_title_lower_trgm ON games USING gin (title_lower gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS games_title_lower_trgm"]
+
+
+def _run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0003_alter_pricechartingconnect_current_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Game",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("position", models.PositiveIntegerField(unique=True)),
+                ("title", models.CharField(max_length=500)),
+                ("title_lower", models.CharField(max_length=500)),
+                ("platform", models.CharField(blank=True, max_length=200)),
+                ("platform_lower", models.CharField(blank=True, db_index=True, max_length=200)),
+                (
+                    "platform_name",
+                    models.CharField(
+                        blank=True, help_text="Normalized platform name for facets.", max_length=200
+                    ),
+                ),
+                ("year", models.SmallIntegerField(blank=True, null=True)),
+                ("data", models.JSONField(default=dict, help_text="Original gamesdb record.")),
+            ],
+            options={
+                "db_table": "games",
+                "ordering": ["position"],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.25 on 2026-10-17 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0004_game"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="dev_lower",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=300),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="publisher_lower",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=300),
+        ),
+        migrations.AlterField(
+            model_name="game",
+            name="year",
+            field=models.SmallIntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
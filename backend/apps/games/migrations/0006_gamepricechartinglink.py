@@ -0,0 +1,59 @@
+# Generated by Django 4.2.25 on 2026-10-17 07:06
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0005_game_dev_publisher"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GamePriceChartingLink",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+                ("is_active", models.BooleanField(db_index=True, default=True)),
+                ("game_id", models.CharField(max_length=16, unique=True)),
+                ("title", models.CharField(blank=True, max_length=500)),
+                ("platform", models.CharField(blank=True, max_length=200)),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("bind", "Bound by a user"),
+                            ("match", "Matched by title and platform"),
+                        ],
+                        default="match",
+                        max_length=16,
+                    ),
+                ),
+                ("confidence", models.FloatField(default=1.0)),
+                (
+                    "connect",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="game_links",
+                        to="games.pricechartingconnect",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Game PriceCharting link",
+                "verbose_name_plural": "Game PriceCharting links",
+                "ordering": ["-created_at"],
+                "abstract": False,
+            },
+        ),
+    ]
@@ -77,3 +77,69 @@ class PriceChartingConnect(BaseModel):
         Shortcut for current
         """
         return (self.current or {}).get("prices") or {}
+
+
+class GamePriceChartingLink(BaseModel):
+    """
+    cross-reference from a local gamesdb game to its pricecharting entry.
+
+    rows are keyed by the stable registry game id (see `game_id`) and are
+    written when an item is bound with a known game and by the background
+    matcher, so search results can carry cached prices without scraping.
+    """
+
+    SOURCE_BIND = "bind"
+    SOURCE_MATCH = "match"
+    SOURCE_CHOICES = (
+        (SOURCE_BIND, "Bound by a user"),
+        (SOURCE_MATCH, "Matched by title and platform"),
+    )
+
+    game_id = models.CharField(max_length=16, unique=True)
+    title = models.CharField(max_length=500, blank=True)
+    platform = models.CharField(max_length=200, blank=True)
+    connect = models.ForeignKey(
+        PriceChartingConnect,
+        on_delete=models.CASCADE,
+        related_name="game_links",
+    )
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES, default=SOURCE_MATCH)
+    confidence = models.FloatField(default=1.0)
+
+    class Meta(BaseModel.Meta):
+        verbose_name = "Game PriceCharting link"
+        verbose_name_plural = "Game PriceCharting links"
+
+    def __str__(self) -> str:
+        return f"{self.title} ({self.platform}) -> {self.connect_id}"
+
+
+class Game(models.Model):
+    """
+    one gamesdb record, imported by `manage.py import_games`.
+
+    rows keep registry order in `position`. the title search index
+    (sqlite fts5 trigram table or postgres pg_trgm gin index) is created
+    by the migration and refreshed by the import command, which is the
+    only writer of this table.
+    """
+
+    position = models.PositiveIntegerField(unique=True)
+    title = models.CharField(max_length=500)
+    title_lower = models.CharField(max_length=500)
+    platform = models.CharField(max_length=200, blank=True)
+    platform_lower = models.CharField(max_length=200, blank=True, db_index=True)
+    platform_name = models.CharField(
+        max_length=200, blank=True, help_text="Normalized platform name for facets."
+    )
+    dev_lower = models.CharField(max_length=300, blank=True, default="", db_index=True)
+    publisher_lower = models.CharField(max_length=300, blank=True, default="", db_index=True)
+    year = models.SmallIntegerField(null=True, blank=True, db_index=True)
+    data = models.JSONField(default=dict, help_text="Original gamesdb record.")
+
+    class Meta:
+        db_table = "games"
+        ordering = ["position"]
+
+    def __str__(self) -> str:
+        return self.title
@@ -1,4 +1,11 @@
-from .games import GameItemSerializer
+from .games import (
+    GameCompletionSerializer,
+    GameItemSerializer,
+    GameMatchQuerySerializer,
+    GameMatchSerializer,
+    GamePlatformSerializer,
+    GamePriceLinkSerializer,
+)
 from .pricecharting import (
     BindSerializer,
     ItemQuerySerializer,
@@ -9,6 +16,11 @@ from .pricecharting import (
 
 __all__ = [
     "GameItemSerializer",
+    "GamePlatformSerializer",
+    "GameCompletionSerializer",
+    "GameMatchQuerySerializer",
+    "GameMatchSerializer",
+    "GamePriceLinkSerializer",
     "SearchQuerySerializer",
     "ItemQuerySerializer",
     "PriceChartingConnectSerializer",
@@ -3,11 +3,27 @@ from __future__ import annotations
 from rest_framework import serializers
 
 
+class GamePriceLinkSerializer(serializers.Serializer):
+    """
+    Serializer for the PriceCharting entry linked to a local game.
+    """
+
+    id = serializers.UUIDField()
+    url = serializers.URLField()
+    title = serializers.CharField(allow_blank=True)
+    platform = serializers.CharField(allow_blank=True)
+    prices = serializers.DictField()
+    last_synced_at = serializers.DateTimeField(allow_null=True)
+    source = serializers.ChoiceField(choices=["bind", "match"])
+    confidence = serializers.FloatField()
+
+
 class GameItemSerializer(serializers.Serializer):
     """
     Serializer for a single game entry from the local GamesDB.
     """
 
+    Id = serializers.CharField(required=False, help_text="Stable content-derived game id.")
     Game = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     GameLink = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     Year = serializers.IntegerField(required=False, allow_null=True)
@@ -17,3 +33,59 @@ class GameItemSerializer(serializers.Serializer):
     PublisherLink = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     Platform = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     PlatformLink = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    pricecharting = GamePriceLinkSerializer(
+        required=False,
+        allow_null=True,
+        help_text="Linked PriceCharting entry, only with ?pricecharting=1.",
+    )
+
+
+class GamePlatformSerializer(serializers.Serializer):
+    """
+    Serializer for a platform of the local GamesDB with its game count.
+    """
+
+    platform = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class GameCompletionSerializer(serializers.Serializer):
+    """
+    Serializer for a typeahead completion of a game title.
+    """
+
+    id = serializers.CharField()
+    title = serializers.CharField()
+    platform = serializers.CharField(allow_blank=True)
+    year = serializers.IntegerField(allow_null=True)
+
+
+class GameMatchRowSerializer(serializers.Serializer):
+    """
+    Serializer for one {title, platform} row of a batch match request.
+    """
+
+    title = serializers.CharField(max_length=300, allow_blank=True)
+    platform = serializers.CharField(
+        max_length=100, required=False, allow_blank=True, allow_null=True
+    )
+
+
+class GameMatchQuerySerializer(serializers.Serializer):
+    """
+    Body of a batch match request.
+    """
+
+    MAX_ROWS = 1000
+
+    items = GameMatchRowSerializer(many=True, allow_empty=False, max_length=MAX_ROWS)
+
+
+class GameMatchSerializer(serializers.Serializer):
+    """
+    Serializer for the best registry match of one batch row.
+    """
+
+    id = serializers.CharField(allow_null=True)
+    match = GameItemSerializer(allow_null=True)
+    confidence = serializers.FloatField()
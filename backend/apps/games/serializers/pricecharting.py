@@ -5,6 +5,7 @@ from rest_framework import serializers
 
 from apps.collection.models import Item
 from apps.games.models import PriceChartingConnect
+from apps.games.services.game_links import GameLinkService
 from apps.games.services.pricecharting import PricechartingService
 
 
@@ -69,10 +70,14 @@ class BindSerializer(serializers.Serializer):
     required:
         item_id — UUID of collection Item
         url     — PriceCharting link
+
+    optional:
+        game_id — id of the local gamesdb game the item is a copy of
     """
 
     item_id = serializers.UUIDField()
     url = serializers.URLField()
+    game_id = serializers.RegexField(r"^[0-9a-f]{16}$", required=False)
 
     def validate(self, attrs):
         request = self.context["request"]
@@ -85,6 +90,12 @@ class BindSerializer(serializers.Serializer):
         if item.collection.owner != request.user:
             raise serializers.ValidationError("You are not the owner of this item.")
 
+        game_id = attrs.get("game_id")
+        if game_id:
+            GameLinkService.ensure_registry()
+            if GameLinkService.search.get(game_id) is None:
+                raise serializers.ValidationError({"game_id": "Unknown game."})
+
         attrs["item"] = item
         return attrs
 
@@ -92,6 +103,7 @@ class BindSerializer(serializers.Serializer):
         return PricechartingService.bind_item(
             item=validated_data["item"],
             url=validated_data["url"],
+            game_id=validated_data.get("game_id"),
         )
 
 
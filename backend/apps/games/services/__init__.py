@@ -8,4 +8,5 @@ __all__ = [
     "REGISTRY",
     "GameSearchService",
     "PricechartingService",
+    "GameLinkService",
 ]
@@ -0,0 +1,326 @@
+# apps/games/services/benchmark.py
+from __future__ import annotations
+
+import json
+import platform as _platform
+import random
+import resource
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .fuzzy import tokenize
+from .registry import GameRegistry, game_id, normalize_platform
+from .search import GameSearchService
+
+#: relative weight of every query kind in a named query mix.
+QUERY_MIXES: Dict[str, Dict[str, float]] = {
+    "mixed": {"short": 2, "long": 3, "platform": 2, "miss": 1, "ranked": 1, "fuzzy": 1},
+    "short": {"short": 1},
+    "long": {"long": 1},
+    "platform": {"platform": 1},
+    "miss_heavy": {"miss": 7, "long": 3},
+}
+
+PERCENTILES = (50, 90, 99)
+
+_WORDS = (
+    "super mario world kart party legend zelda sonic hedgehog final fantasy dragon quest "
+    "street fighter mega man castle vania metal gear solid star wars racing soccer football "
+    "baseball tennis golf pro evolution battle war tactics adventure island city night dark "
+    "souls kingdom hearts tales of the and in a ninja turtles pac dig dug space invaders "
+    "galaxy force rally champion world cup deluxe edition collection special gold silver "
+    "red blue black white pocket monsters puzzle bobble tetris bomber quest hunter monster "
+    "resident evil silent hill ghost spirit shadow knight sword magic academy hero"
+).split()
+
+_PLATFORMS = (
+    ("the NES", 8),
+    ("the SNES", 6),
+    ("the PlayStation", 9),
+    ("the PlayStation 2", 10),
+    ("the Wii", 5),
+    ("Game Boy", 4),
+    ("Game Boy Advance", 5),
+    ("Windows", 12),
+    ("Arcade (CPS1)  (2 players)", 2),
+    ("the Sega Genesis", 4),
+    ("Nintendo DS", 6),
+    ("the Xbox 360", 5),
+    ("ZX Spectrum", 3),
+    ("MSX", 2),
+    ("Virtual Boy", 1),
+)
+
+_STUDIOS = [f"{w.title()} {s}" for w in _WORDS[:40] for s in ("Soft", "Studios", "Games")]
+
+
+def _pseudo_word(rnd: random.Random) -> str:
+    syllables = rnd.randint(1, 4)
+    return "".join(rnd.choice("bdfgklmnprstvz") + rnd.choice("aeiou") for _ in range(syllables))
+
+
+def generate_games(
+    dirpath: Path, count: int, *, seed: int = 0, per_file: int = 50_000
+) -> List[Path]:
+    """
+    write `count` synthetic gamesdb records as json arrays under `dirpath`.
+
+    titles mix common game words and invented ones with a zipf-like skew,
+    so n-gram postings, word postings and platform sizes are as uneven as
+    in the real data. records are distinct by `game_id`, so the registry
+    keeps all of them. returns the written files.
+    """
+    rnd = random.Random(seed)
+    dirpath.mkdir(parents=True, exist_ok=True)
+
+    vocab = _WORDS + [_pseudo_word(rnd) for _ in range(20_000)]
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(vocab))))
+    platforms = [name for name, _w in _PLATFORMS]
+    platform_weights = list(accumulate(w for _name, w in _PLATFORMS))
+
+    seen = set()
+
+    def record() -> Dict[str, Any]:
+        while True:
+            rec = draw()
+            key = game_id(rec)
+            if key not in seen:
+                seen.add(key)
+                return rec
+
+    def draw() -> Dict[str, Any]:
+        words = rnd.choices(vocab, cum_weights=cum_weights, k=rnd.randint(1, 5))
+        title = " ".join(words).title()
+        if rnd.random() < 0.2:
+            title += f" {rnd.randint(2, 5)}"
+        if rnd.random() < 0.1:
+            title += ": " + " ".join(rnd.choices(vocab, cum_weights=cum_weights, k=2)).title()
+        year: Any = rnd.randint(1975, 2024)
+        if rnd.random() < 0.1:
+            year = rnd.choice([None, "TBA", f"{year}-06-01T00:00:00.000Z"])
+        studio = rnd.choice(_STUDIOS)
+        return {
+            "Game": title,
+            "GameLink": None,
+            "Year": year,
+            "Dev": studio,
+            "DevLink": None,
+            "Publisher": rnd.choice(_STUDIOS) if rnd.random() < 0.7 else studio,
+            "PublisherLink": None,
+            "Platform": rnd.choices(platforms, cum_weights=platform_weights)[0],
+            "PlatformLink": None,
+        }
+
+    paths = []
+    for n, start in enumerate(range(0, count, per_file)):
+        p = dirpath / f"Synthetic{n:03d}Games.json"
+        with p.open("w", encoding="utf-8") as f:
+            json.dump([record() for _ in range(min(per_file, count - start))], f)
+        paths.append(p)
+    return paths
+
+
+def _typo(rnd: random.Random, word: str) -> str:
+    i = rnd.randrange(len(word))
+    return word[:i] + rnd.choice(string.ascii_lowercase) + word[i + 1 :]
+
+
+def build_queries(
+    registry: GameRegistry, count: int, mix: Mapping[str, float], *, seed: int = 0
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    return `count` (kind, search_by_name kwargs) pairs drawn from real titles.
+
+    kinds: "short" 1-2 characters, "long" a run of 2-4 title words,
+    "platform" one title word plus the record's platform filter, "miss"
+    random letters that match (almost) nothing, "ranked" a title word with
+    rank=1 and "fuzzy" a title word with one typo and fuzzy=1.
+    """
+    rnd = random.Random(seed)
+    games = registry.games
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+
+    out = []
+    while len(out) < count:
+        kind = rnd.choices(kinds, weights)[0]
+        i = rnd.randrange(len(games))
+        words = tokenize(registry.titles[i]) or ["a"]
+        word = rnd.choice(words)
+        params: Dict[str, Any] = {"q": word}
+        if kind == "short":
+            params["q"] = word[: rnd.randint(1, 2)]
+        elif kind == "long":
+            n = rnd.randint(2, 4)
+            start = rnd.randrange(max(1, len(words) - n + 1))
+            params["q"] = " ".join(words[start : start + n])
+        elif kind == "platform":
+            params["platform"] = normalize_platform(str(games[i].get("Platform") or ""))
+        elif kind == "miss":
+            params["q"] = "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 10)))
+        elif kind == "ranked":
+            params["ranked"] = True
+        elif kind == "fuzzy":
+            params["q"] = _typo(rnd, word) if len(word) > 4 else word
+            params["fuzzy"] = True
+        out.append((kind, params))
+    return out
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    nearest-rank percentile of an ascending list.
+    """
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def measure_queries(
+    service: GameSearchService,
+    queries: List[Tuple[str, Dict[str, Any]]],
+    *,
+    warmup: int = 100,
+) -> Dict[str, Any]:
+    """
+    run queries one by one and return latency percentiles and throughput.
+
+    queries are run like the search endpoint does by default (one page of
+    50, no total). keep the service result cache off to measure the search
+    itself rather than cache hits.
+    """
+    for _kind, params in queries[:warmup]:
+        service.search_by_name(limit=50, count="none", **params)
+
+    latencies: List[float] = []
+    hits = 0
+    started = time.perf_counter()
+    for _kind, params in queries:
+        t = time.perf_counter()
+        data = service.search_by_name(limit=50, count="none", **params)
+        latencies.append(time.perf_counter() - t)
+        hits += bool(data["items"])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    stats: Dict[str, Any] = {
+        "queries": len(queries),
+        "hit_ratio": round(hits / len(queries), 3) if queries else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "qps": round(len(queries) / elapsed, 1) if elapsed else 0.0,
+    }
+    for pct in PERCENTILES:
+        stats[f"p{pct}_ms"] = round(percentile(latencies, pct) * 1000, 3)
+    return stats
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM starts over on exec, ru_maxrss keeps the peak of the forking parent
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, IndexError, ValueError):
+        pass
+    # ru_maxrss is in KiB on linux and in bytes on macos
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _cold_load(source: str, path: str) -> Dict[str, Any]:
+    baseline = _peak_rss_mb()
+    registry = GameRegistry()
+    started = time.perf_counter()
+    if source == "snapshot":
+        count, _ = registry.load_snapshot(Path(path))
+    else:
+        count, _ = registry.load_from_dir(Path(path))
+    return {
+        "games": count,
+        "load_ms": round((time.perf_counter() - started) * 1000, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "baseline_rss_mb": round(baseline, 1),
+    }
+
+
+def measure_load(source: str, path: Path) -> Dict[str, Any]:
+    """
+    load a registry from a json directory or snapshot in a fresh process.
+
+    a spawned interpreter makes the load really cold and its peak rss not
+    polluted by whatever the calling process has allocated before.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_cold_load, source, str(path)).result()
+
+
+def run_benchmark(
+    registry: GameRegistry,
+    *,
+    service: Optional[GameSearchService] = None,
+    queries: int = 2000,
+    mixes: Optional[List[str]] = None,
+    exclude: Tuple[str, ...] = (),
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    run every query mix against a loaded registry, results keyed by mix.
+
+    queries are always drawn from `registry`; pass a `service` with a
+    search backend to run them elsewhere. query kinds in `exclude` are
+    dropped from every mix (mixes left empty are skipped).
+    """
+    service = service or GameSearchService(registry=registry, cache_size=0)
+    results = {}
+    for name in mixes or list(QUERY_MIXES):
+        mix = {kind: w for kind, w in QUERY_MIXES[name].items() if kind not in exclude}
+        if mix:
+            qs = build_queries(registry, queries, mix, seed=seed)
+            results[name] = measure_queries(service, qs)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """
+    describe the machine and interpreter a benchmark ran on.
+    """
+    return {
+        "python": _platform.python_version(),
+        "implementation": _platform.python_implementation(),
+        "machine": _platform.machine(),
+        "system": _platform.system(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def _flatten(data: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(data, Mapping):
+        for key, value in data.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def compare_results(
+    old: Mapping[str, Any], new: Mapping[str, Any]
+) -> List[Tuple[str, float, float, float]]:
+    """
+    return (metric, old, new, relative change) for numeric metrics in both runs.
+    """
+    before = dict(_flatten(old.get("datasets", {})))
+    out = []
+    for key, value in _flatten(new.get("datasets", {})):
+        if key in before:
+            base = before[key]
+            change = (value - base) / base if base else 0.0
+            out.append((key, base, value, change))
+    return out
@@ -0,0 +1,208 @@
+# apps/games/services/db_search.py
+from __future__ import annotations
+
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Count, IntegerField, Max, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Length
+
+from apps.games.models import Game
+
+from .registry import GameRegistry, normalize_platform, parse_year
+from .search import (
+    PLATFORM_BOOST,
+    SCORE_EXACT,
+    SCORE_PREFIX,
+    SCORE_SUBSTRING,
+    SCORE_WORD,
+    FieldFilters,
+)
+
+#: shortest query the trigram indexes can serve, shorter ones scan the table.
+MIN_INDEXED_QUERY = 3
+
+IMPORT_BATCH = 5000
+
+
+def _fts_phrase(q: str) -> str:
+    return '"' + q.replace('"', '""') + '"'
+
+
+class DatabaseSearchBackend:
+    """
+    game search over the `games` table instead of the in-process registry.
+
+    titles are matched by substring like the registry does. on sqlite the
+    matches come from the fts5 trigram table `games_fts`, on postgres
+    `LIKE` is served by the pg_trgm gin index; other databases (and
+    queries shorter than a trigram) scan the table.
+
+    fuzzy search is not supported here, `GameSearchService` keeps serving
+    it from the registry.
+    """
+
+    def version(self) -> int:
+        """
+        data version for result caching; every import allocates new ids.
+        """
+        return Game.objects.aggregate(v=Max("id"))["v"] or 0
+
+    def fingerprint(self) -> str:
+        return f"db{self.version()}"
+
+    def title_condition(self, q: str) -> Q:
+        """
+        condition for rows whose lowercased title contains `q`.
+        """
+        if connection.vendor == "sqlite" and len(q) >= MIN_INDEXED_QUERY:
+            return Q(
+                id__in=RawSQL(
+                    "SELECT rowid FROM games_fts WHERE games_fts MATCH %s", [_fts_phrase(q)]
+                )
+            )
+        return Q(title_lower__contains=q)
+
+    def matches(self, q: str, filters: FieldFilters) -> QuerySet:
+        """
+        rows matching query `q` (may be empty) and all field filters.
+        """
+        cond = Q()
+        if q:
+            cond = self.title_condition(q)
+            if filters.any_field:
+                cond |= Q(dev_lower__contains=q) | Q(publisher_lower__contains=q)
+        if filters.dev:
+            cond &= Q(dev_lower__contains=filters.dev)
+        if filters.publisher:
+            cond &= Q(publisher_lower__contains=filters.publisher)
+        if filters.year_from is not None:
+            cond &= Q(year__gte=filters.year_from)
+        if filters.year_to is not None:
+            cond &= Q(year__lte=filters.year_to)
+        return Game.objects.filter(cond)
+
+    def search(
+        self,
+        q: str,
+        limit: int,
+        offset: int,
+        platform: str,
+        ranked: bool,
+        boost_platform: str,
+        count: str,
+        facets: bool,
+        filters: FieldFilters,
+    ) -> Dict[str, object]:
+        """
+        same contract as `GameSearchService._search` (without fuzzy mode).
+
+        ranked order approximates `score_title`: exact > prefix > match
+        after a space > substring, then platform boost, shorter title and
+        registry order. "estimate" totals are exact, counting is done by
+        the database.
+        """
+        matches = self.matches(q, filters)
+        qs = matches.filter(platform_lower__contains=platform) if platform else matches
+
+        if ranked:
+            score = Case(
+                When(title_lower=q, then=Value(SCORE_EXACT)),
+                When(title_lower__startswith=q, then=Value(SCORE_PREFIX)),
+                When(title_lower__contains=" " + q, then=Value(SCORE_WORD)),
+                default=Value(SCORE_SUBSTRING),
+                output_field=IntegerField(),
+            )
+            if boost_platform:
+                score = score + Case(
+                    When(platform_lower__contains=boost_platform, then=Value(PLATFORM_BOOST)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            qs = qs.annotate(score=score, title_len=Length("title_lower")).order_by(
+                "-score", "title_len", "position"
+            )
+
+        rows = list(qs.values_list("data", flat=True)[offset : offset + limit + 1])
+        more = len(rows) > limit
+        items = rows[:limit]
+
+        total: Optional[int]
+        if more:
+            total = qs.count() if count != "none" else None
+        elif items or not offset:
+            total = offset + len(items)
+        else:
+            total = qs.count()
+
+        data: Dict[str, object] = {
+            "total": total,
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "estimated": False,
+        }
+        if facets:
+            counts = (
+                matches.order_by()
+                .values("platform_name")
+                .annotate(n=Count("id"))
+                .values_list("platform_name", "n")
+            )
+            data["facets"] = sorted(counts, key=lambda kv: (-kv[1], kv[0]))
+        return data
+
+
+def _rows(games: Iterable[Dict[str, Any]]) -> Iterable[Game]:
+    for position, rec in enumerate(games):
+        title = str(rec.get("Game") or "")
+        platform = str(rec.get("Platform") or "")
+        yield Game(
+            position=position,
+            title=title,
+            title_lower=title.lower(),
+            platform=platform,
+            platform_lower=platform.lower(),
+            platform_name=normalize_platform(platform),
+            dev_lower=str(rec.get("Dev") or "").lower(),
+            publisher_lower=str(rec.get("Publisher") or "").lower(),
+            year=parse_year(rec.get("Year")),
+            data=dict(rec),
+        )
+
+
+def import_games(src: Path, batch_size: int = IMPORT_BATCH) -> int:
+    """
+    replace the contents of the `games` table with the gamesdb files in
+    `src`, in registry order, and refresh the title search index.
+    """
+    registry = GameRegistry()
+    registry.load_from_dir(src)
+    rows = _rows(registry.games)
+
+    with transaction.atomic():
+        Game.objects.all().delete()
+        total = 0
+        while batch := list(islice(rows, batch_size)):
+            Game.objects.bulk_create(batch, batch_size=batch_size)
+            total += len(batch)
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("INSERT INTO games_fts(games_fts) VALUES ('rebuild')")
+            elif connection.vendor == "postgresql":
+                cursor.execute("ANALYZE games")
+    return total
+
+
+def search_backend() -> Optional[DatabaseSearchBackend]:
+    """
+    backend configured by `GAMES_SEARCH_BACKEND`; None means the registry.
+    """
+    if getattr(settings, "GAMES_SEARCH_BACKEND", "registry") == "database":
+        return DatabaseSearchBackend()
+    return None
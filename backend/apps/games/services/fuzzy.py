@@ -0,0 +1,144 @@
+# apps/games/services/fuzzy.py
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Set
+from zlib import crc32
+
+MAX_DISTANCE = 2
+
+#: only the first PREFIX_LEN characters of a token generate deletes
+#: (symspell prefix trick), the full token is still verified.
+PREFIX_LEN = 7
+
+_TOKEN_RE = re.compile(r"\w+")
+_MASK = (1 << 32) - 1
+
+
+def tokenize(s: str) -> List[str]:
+    """
+    split a lowercased string into word tokens.
+    """
+    return _TOKEN_RE.findall(s)
+
+
+def allowed_distance(token: str) -> int:
+    """
+    maximum edit distance tolerated for a query token of this length.
+    """
+    if len(token) <= 2:
+        return 0
+    if len(token) <= 4:
+        return 1
+    return MAX_DISTANCE
+
+
+def deletes(word: str, depth: int) -> Set[str]:
+    """
+    return `word` and every string obtained by deleting up to `depth` chars.
+    """
+    out = {word}
+    frontier = {word}
+    for _ in range(depth):
+        nxt = set()
+        for w in frontier:
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1 :])
+        nxt -= out
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def _key(s: str) -> int:
+    return crc32(s.encode("utf-8")) << 32
+
+
+def build_delete_index(vocab: Iterable[str]) -> array:
+    """
+    build sorted array of (crc32(delete) << 32 | token id) over a vocabulary.
+
+    token ids are positions in `vocab`. hash collisions only add candidates,
+    every candidate is verified with the real edit distance.
+    """
+    keys = [
+        crc32(d.encode("utf-8")) << 32 | tid
+        for tid, token in enumerate(vocab)
+        for d in deletes(token[:PREFIX_LEN], MAX_DISTANCE)
+    ]
+    keys.sort()
+    return array("Q", keys)
+
+
+def osa_distance_to(word: str) -> Callable[[str], int]:
+    """
+    return a function computing optimal string alignment distance to `word`.
+
+    bit-parallel (hyyro 2003): the match masks of `word` are built once and
+    each comparison costs a handful of integer ops per character.
+    """
+    m = len(word)
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(word):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << m) - 1
+    top = 1 << (m - 1) if m else 0
+
+    def distance(text: str) -> int:
+        if not m:
+            return len(text)
+        pv, mv, score = mask, 0, m
+        d0 = pm_prev = 0
+        for c in text:
+            pm = peq.get(c, 0)
+            tr = (((~d0) & pm) << 1) & pm_prev
+            d0 = ((((pm & pv) + pv) ^ pv) | pm | mv | tr) & mask
+            hp = (mv | ~(d0 | pv)) & mask
+            hm = d0 & pv
+            if hp & top:
+                score += 1
+            elif hm & top:
+                score -= 1
+            hp = ((hp << 1) | 1) & mask
+            hm = (hm << 1) & mask
+            pv = (hm | ~(d0 | hp)) & mask
+            mv = d0 & hp
+            pm_prev = pm
+        return score
+
+    return distance
+
+
+def lookup(
+    index: Sequence[int],
+    token_at: Callable[[int], str],
+    word: str,
+    max_distance: int,
+) -> Dict[int, int]:
+    """
+    find vocabulary tokens within `max_distance` of `word`.
+
+    returns {token id: distance}. only the delete index is probed, the
+    vocabulary is never scanned pairwise.
+    """
+    out: Dict[int, int] = {}
+    checked: Set[int] = set()
+    distance = osa_distance_to(word)
+    for d in deletes(word[:PREFIX_LEN], max_distance):
+        k = _key(d)
+        j = bisect_left(index, k)
+        while j < len(index) and index[j] >> 32 == k >> 32:
+            tid = index[j] & _MASK
+            j += 1
+            if tid in checked:
+                continue
+            checked.add(tid)
+            token = token_at(tid)
+            if abs(len(token) - len(word)) > max_distance:
+                continue
+            dist = distance(token)
+            if dist <= max_distance:
+                out[tid] = dist
+    return out
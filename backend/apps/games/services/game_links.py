@@ -0,0 +1,253 @@
+# apps/games/services/game_links.py
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from apps.games.models import GamePriceChartingLink, PriceChartingConnect
+
+from .search import GameSearchService
+
+#: lowest match confidence the matcher stores a link for.
+MATCH_THRESHOLD = 0.9
+
+MATCH_BATCH = 500
+
+#: pricecharting console names that the gamesdb spells differently.
+PLATFORM_ALIASES = {
+    "super nintendo": "snes",
+    "super famicom": "snes",
+    "famicom": "nes",
+    "nintendo switch": "switch",
+    "nintendo 3ds": "3ds",
+    "wii u": "wiiu",
+    "sega master system": "mastersystem",
+    "sega dreamcast": "dreamcast",
+    "sega game gear": "game gear",
+    "sega mega drive": "sega genesis",
+    "neo geo": "neo-geo",
+    "pc games": "windows",
+}
+
+_REGION_PREFIX_RE = re.compile(r"^(?:pal|jp|ntsc)\s+", re.I)
+_VARIANT_RE = re.compile(r"\s*[\[(][^\])]*[\])]\s*$")
+
+
+def connect_platform(platform: str) -> str:
+    """
+    gamesdb platform filter for a pricecharting console name:
+    "PAL Super Nintendo" -> "snes", "Playstation 2" -> "playstation 2".
+    """
+    name = _REGION_PREFIX_RE.sub("", " ".join((platform or "").lower().split()))
+    return PLATFORM_ALIASES.get(name, name)
+
+
+def connect_title(title: str, platform: str = "") -> str:
+    """
+    plain game title of a pricecharting entry: the page heading ends with
+    the console name and variants carry a bracketed suffix.
+    """
+    title = " ".join((title or "").split())
+    platform = " ".join((platform or "").split())
+    if platform and title.lower().endswith(" " + platform.lower()):
+        title = title[: -len(platform) - 1]
+    return _VARIANT_RE.sub("", title).strip()
+
+
+class GameLinkService:
+    """
+    local cross-reference between gamesdb games and pricecharting connects.
+
+    everything here works on the registry and the database only; no
+    request goes out to pricecharting.
+    """
+
+    search = GameSearchService(cache_size=0)
+
+    @classmethod
+    def ensure_registry(cls) -> None:
+        """
+        load the registry the way app startup does when it is still empty,
+        e.g. in workers running with GAMES_DB_AUTOLOAD=0.
+        """
+        if not cls.search.registry.loaded:
+            from apps.games.apps import load_registry
+
+            load_registry(cls.search.registry)
+
+    @classmethod
+    def link(
+        cls,
+        *,
+        game: Dict,
+        connect: PriceChartingConnect,
+        source: str,
+        confidence: float = 1.0,
+    ) -> GamePriceChartingLink:
+        """
+        store `connect` as the pricecharting entry of registry record `game`.
+
+        links made by users win, and the matcher never replaces an existing
+        link of a game: when several connects match one game (e.g. its ntsc
+        and pal listings) the first one linked keeps it. returns the link
+        the game has afterwards.
+        """
+        defaults = {
+            "title": str(game.get("Game") or "")[:500],
+            "platform": str(game.get("Platform") or "")[:200],
+            "connect": connect,
+            "source": source,
+            "confidence": confidence,
+        }
+        with transaction.atomic():
+            obj = (
+                GamePriceChartingLink.all_objects.select_for_update()
+                .filter(game_id=game["Id"])
+                .first()
+            )
+            if obj is None:
+                return GamePriceChartingLink.all_objects.create(game_id=game["Id"], **defaults)
+            if source == GamePriceChartingLink.SOURCE_MATCH and (
+                obj.source == GamePriceChartingLink.SOURCE_BIND or obj.connect_id != connect.id
+            ):
+                return obj
+            for name, value in defaults.items():
+                setattr(obj, name, value)
+            obj.is_active = True
+            obj.save()
+            return obj
+
+    @classmethod
+    def match_rows(cls, connects: Sequence[PriceChartingConnect]) -> List[Dict]:
+        """
+        resolve connects to registry games by their cached title and console.
+        """
+        cls.ensure_registry()
+        rows = [
+            {
+                "title": connect_title(c.title, c.platform),
+                "platform": connect_platform(c.platform),
+            }
+            for c in connects
+        ]
+        return cls.search.match_many(rows)
+
+    @classmethod
+    def link_connect(
+        cls, connect: PriceChartingConnect, *, game_id: Optional[str] = None
+    ) -> Optional[GamePriceChartingLink]:
+        """
+        link a connect to the game a user picked, or else to its best
+        registry match if that is confident enough.
+        """
+        if game_id:
+            cls.ensure_registry()
+            game = cls.search.get(game_id)
+            if game is None:
+                return None
+            return cls.link(game=game, connect=connect, source=GamePriceChartingLink.SOURCE_BIND)
+
+        match = cls.match_rows([connect])[0]
+        if match["match"] is None or match["confidence"] < MATCH_THRESHOLD:
+            return None
+        return cls.link(
+            game=match["match"],
+            connect=connect,
+            source=GamePriceChartingLink.SOURCE_MATCH,
+            confidence=match["confidence"],
+        )
+
+    @classmethod
+    def match_unlinked(cls, *, batch_size: int = MATCH_BATCH) -> Dict[str, int]:
+        """
+        link every connect without a game to its best registry match.
+
+        connects are matched in batches with one registry pass each
+        (`GameSearchService.match_many`); returns how many were seen and
+        how many got a link. a connect whose game is already linked to
+        another connect stays unlinked, so running this again changes
+        nothing.
+        """
+        qs = (
+            PriceChartingConnect.objects.filter(game_links__isnull=True)
+            .exclude(current={})
+            .only("id", "current")
+            .order_by("id")
+        )
+        total = linked = 0
+        last = None
+        while True:
+            page = qs.filter(id__gt=last) if last is not None else qs
+            batch = list(page[:batch_size])
+            if not batch:
+                break
+            last = batch[-1].id
+            total += len(batch)
+            for connect, match in zip(batch, cls.match_rows(batch)):
+                if match["match"] is not None and match["confidence"] >= MATCH_THRESHOLD:
+                    obj = cls.link(
+                        game=match["match"],
+                        connect=connect,
+                        source=GamePriceChartingLink.SOURCE_MATCH,
+                        confidence=match["confidence"],
+                    )
+                    linked += obj.connect_id == connect.id
+        return {"total": total, "linked": linked}
+
+    @staticmethod
+    def connects_for(game_ids: Iterable[str]) -> Dict[str, GamePriceChartingLink]:
+        """
+        links (with their connect) of the given games, keyed by game id.
+        """
+        ids = {gid for gid in game_ids if gid}
+        if not ids:
+            return {}
+        qs = GamePriceChartingLink.objects.filter(
+            game_id__in=ids, connect__is_active=True
+        ).select_related("connect")
+        return {link.game_id: link for link in qs}
+
+    @staticmethod
+    def version() -> str:
+        """
+        changes whenever a link or a linked connect (its prices) changes.
+        """
+        agg = GamePriceChartingLink.all_objects.aggregate(
+            n=Count("id"), links=Max("updated_at"), prices=Max("connect__updated_at")
+        )
+        raw = f"{agg['n']}|{agg['links']}|{agg['prices']}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+    @classmethod
+    def annotate(cls, items: Sequence[Dict]) -> List[Dict]:
+        """
+        copies of registry records with a "pricecharting" entry: the linked
+        connect and its cached prices, or None.
+        """
+        links = cls.connects_for(item.get("Id") for item in items)
+        out = []
+        for item in items:
+            link = links.get(item.get("Id"))
+            out.append(dict(item, pricecharting=link_payload(link) if link else None))
+        return out
+
+
+def link_payload(link: GamePriceChartingLink) -> Dict:
+    """
+    the linked connect as attached to a search result.
+    """
+    connect = link.connect
+    return {
+        "id": str(connect.id),
+        "url": connect.url,
+        "title": connect.title,
+        "platform": connect.platform,
+        "prices": connect.prices,
+        "last_synced_at": (connect.last_synced_at.isoformat() if connect.last_synced_at else None),
+        "source": link.source,
+        "confidence": link.confidence,
+    }
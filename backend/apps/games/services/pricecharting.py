@@ -1,16 +1,61 @@
 # apps/games/services/pricecharting.py
 from __future__ import annotations
 
+import asyncio
+import queue
 from dataclasses import asdict
-from typing import List, Optional
+from threading import Thread
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import httpx
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Count
 from django.utils import timezone
 
-from apps.games.integrations.pricecharting import PricechartingClient, Region, SearchItem
+from apps.games.integrations.pricecharting import (
+    AsyncPricechartingClient,
+    PricechartingClient,
+    Region,
+    SearchItem,
+)
 from apps.games.models import PriceChartingConnect, normalize_url
 
+from .game_links import GameLinkService
+from .response_cache import RESPONSE_CACHE
+
+#: fields written when a connect is refreshed from pricecharting.
+REFRESH_FIELDS = ["current", "history", "last_synced_at", "updated_at"]
+
+_DONE = object()
+
+
+def _fetch_pages(
+    tokens: List[str],
+    results: "queue.Queue",
+    concurrency: int,
+    delay: float,
+    client: Optional[httpx.AsyncClient],
+) -> None:
+    """
+    thread target of `refresh_many`: put (token, details or exception)
+    for every page on `results`, then `_DONE`.
+    """
+
+    async def run() -> None:
+        async with AsyncPricechartingClient(
+            concurrency=concurrency, delay=delay, client=client
+        ) as api:
+            async for token, result in api.item_details_many(tokens):
+                results.put((token, result))
+
+    try:
+        asyncio.run(run())
+    except BaseException as e:
+        results.put((None, e))
+    finally:
+        results.put(_DONE)
+
 
 class PricechartingService:
     """
@@ -27,13 +72,20 @@ class PricechartingService:
     ) -> List[dict]:
         """
         search items on pricecharting and return list of plain dicts.
+
+        results are cached per normalized query (see `ResponseCache`).
         """
-        items: List[SearchItem] = PricechartingClient.search(
-            q=q,
-            region=region,
-            limit=limit,
-        )
-        return [asdict(i) for i in items]
+
+        def fetch() -> List[dict]:
+            items: List[SearchItem] = PricechartingClient.search(
+                q=q,
+                region=region,
+                limit=limit,
+            )
+            return [asdict(i) for i in items]
+
+        key = (" ".join((q or "").lower().split()), region, limit)
+        return RESPONSE_CACHE.get_or_fetch("search", key, fetch)
 
     @classmethod
     def get_item_details(
@@ -44,20 +96,26 @@ class PricechartingService:
     ) -> dict:
         """
         fetch detailed info for a single pricecharting item.
+
+        details are cached per page, whether asked for by url or slug.
         """
         token = url or slug or ""
         if not token:
             return {}
 
-        data = PricechartingClient.item_details(token)
-        return {
-            "title": data.get("title", ""),
-            "platform": data.get("platform", ""),
-            "region": data.get("region", "all"),
-            "url": data.get("url", ""),
-            "slug": data.get("slug", ""),
-            "prices": data.get("prices") or {},
-        }
+        def fetch() -> dict:
+            data = PricechartingClient.item_details(token)
+            return {
+                "title": data.get("title", ""),
+                "platform": data.get("platform", ""),
+                "region": data.get("region", "all"),
+                "url": data.get("url", ""),
+                "slug": data.get("slug", ""),
+                "prices": data.get("prices") or {},
+            }
+
+        page = PricechartingClient.item_url(token)
+        return RESPONSE_CACHE.get_or_fetch("item", (normalize_url(page) or page,), fetch)
 
     @classmethod
     @transaction.atomic
@@ -79,9 +137,15 @@ class PricechartingService:
 
     @classmethod
     @transaction.atomic
-    def bind_item(cls, *, item, url: str) -> Optional[PriceChartingConnect]:
+    def bind_item(
+        cls, *, item, url: str, game_id: Optional[str] = None
+    ) -> Optional[PriceChartingConnect]:
         """
         bind a collection Item instance to a pricechartingconnect.
+
+        the connect is also recorded as the pricecharting entry of the
+        local game: the one picked by the user (`game_id`), else its best
+        confident registry match.
         """
         obj = cls.upsert_connect(url=url)
         if not obj:
@@ -90,6 +154,7 @@ class PricechartingService:
         if item.pricecharting_id != obj.id:
             item.pricecharting = obj
             item.save(update_fields=["pricecharting"])
+        GameLinkService.link_connect(obj, game_id=game_id)
         return obj
 
     @staticmethod
@@ -122,14 +187,183 @@ class PricechartingService:
         """
         fetch current prices for a connect and append them to history.
         """
-        token = token or connect.url or (connect.current or {}).get("slug") or ""
+        token = token or cls.refresh_token(connect)
         if not token:
             return {}
 
         data = PricechartingClient.item_details(token)
+        snapshot = cls.apply_snapshot(connect, data)
+        connect.save(update_fields=REFRESH_FIELDS)
+        return snapshot
+
+    @staticmethod
+    def refresh_token(connect: PriceChartingConnect) -> str:
+        """
+        url or slug the prices of a connect are fetched from.
+        """
+        return connect.url or (connect.current or {}).get("slug") or ""
+
+    @classmethod
+    def refresh_many(
+        cls,
+        connects: Iterable[PriceChartingConnect],
+        *,
+        concurrency: Optional[int] = None,
+        delay: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> dict:
+        """
+        refresh prices of many connects with concurrent page fetches.
+
+        pages are fetched by `AsyncPricechartingClient` on an event loop in
+        a helper thread, at most `concurrency` at once and `delay` seconds
+        apart per host. parsed results come back to this thread, which
+        writes them with one `bulk_update` per `batch_size` connects while
+        later pages are still downloading. failed pages are recorded in
+        history like `update_all_pricecharting` always did.
+        """
+        concurrency = concurrency or getattr(settings, "PRICECHARTING_REFRESH_CONCURRENCY", 8)
+        delay = getattr(settings, "PRICECHARTING_REFRESH_DELAY", 0.0) if delay is None else delay
+        batch_size = batch_size or getattr(settings, "PRICECHARTING_REFRESH_BATCH", 100)
+
+        by_token: Dict[str, PriceChartingConnect] = {}
+        skipped = []
+        for connect in connects:
+            token = cls.refresh_token(connect)
+            if token:
+                by_token[token] = connect
+            else:
+                skipped.append(str(connect.id))
+
+        results: "queue.Queue" = queue.Queue()
+        fetcher = Thread(
+            target=_fetch_pages,
+            args=(list(by_token), results, concurrency, delay, client),
+            name="pricecharting-refresh",
+            daemon=True,
+        )
+        fetcher.start()
+
+        ok = failed = 0
+        failed_ids: List[str] = []
+        pending: List[PriceChartingConnect] = []
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                token, result = item
+                if token is None:
+                    error = result
+                    continue
+                connect = by_token[token]
+                now = timezone.now()
+                if isinstance(result, Exception):
+                    cls.apply_error(connect, result, now)
+                    failed += 1
+                    failed_ids.append(str(connect.id))
+                else:
+                    cls.apply_snapshot(connect, result, now)
+                    ok += 1
+                connect.updated_at = now
+                pending.append(connect)
+                if len(pending) >= batch_size:
+                    cls._write_refreshed(pending)
+                    pending = []
+        finally:
+            cls._write_refreshed(pending)
+            fetcher.join()
+        if error is not None:
+            raise error
+
+        return {
+            "total": len(by_token) + len(skipped),
+            "ok": ok,
+            "failed": failed,
+            "failed_ids": failed_ids,
+            "skipped": len(skipped),
+        }
+
+    @staticmethod
+    def refresh_chunks(
+        chunk_size: Optional[int] = None,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        split connects into (from_id, to_id) ranges of about `chunk_size`.
+
+        the first range has no lower and the last no upper bound, so
+        connects created after the split still fall into some range.
+        """
+        chunk_size = chunk_size or getattr(settings, "PRICECHARTING_REFRESH_CHUNK", 500)
+        ids = PriceChartingConnect.objects.order_by("id").values_list("id", flat=True)
+        bounds: List[Optional[str]] = [
+            str(pk) for n, pk in enumerate(ids.iterator()) if n and n % chunk_size == 0
+        ]
+        return list(zip([None, *bounds], [*bounds, None]))
+
+    @classmethod
+    def refresh_range(cls, from_id: Optional[str] = None, to_id: Optional[str] = None) -> dict:
+        """
+        refresh the connects with from_id <= id < to_id (open ends allowed).
+        """
+        qs = PriceChartingConnect.objects.all().only(
+            "id", "url", "current", "history", "last_synced_at", "updated_at"
+        )
+        if from_id:
+            qs = qs.filter(id__gte=from_id)
+        if to_id:
+            qs = qs.filter(id__lt=to_id)
+        return cls.refresh_many(qs.order_by("id").iterator())
+
+    @staticmethod
+    def summarize_refresh(results: Iterable[dict]) -> dict:
+        """
+        add up the summaries of refresh chunks into one run summary.
+
+        "http" lists the latest pool counters of every worker process
+        that ran a chunk.
+        """
+        summary: dict = {
+            "chunks": 0,
+            "total": 0,
+            "ok": 0,
+            "failed": 0,
+            "skipped": 0,
+            "failed_ids": [],
+            "errors": [],
+        }
+        http: Dict[int, dict] = {}
+        for result in results:
+            summary["chunks"] += 1
+            for key in ("total", "ok", "failed", "skipped"):
+                summary[key] += result.get(key, 0)
+            summary["failed_ids"].extend(result.get("failed_ids", []))
+            if result.get("error"):
+                summary["errors"].append(
+                    {"from_id": result.get("from_id"), "error": result["error"]}
+                )
+            if result.get("http"):
+                http[result["http"]["pid"]] = result["http"]
+        summary["http"] = list(http.values())
+        return summary
+
+    @staticmethod
+    def _write_refreshed(connects: List[PriceChartingConnect]) -> None:
+        if connects:
+            with transaction.atomic():
+                PriceChartingConnect.all_objects.bulk_update(connects, REFRESH_FIELDS)
+
+    @staticmethod
+    def apply_snapshot(connect: PriceChartingConnect, data: dict, now=None) -> dict:
+        """
+        set parsed item details as the current data of a connect and add
+        its prices to history, without saving.
+        """
         prices = data.get("prices") or {}
 
-        now = timezone.now()
+        now = now or timezone.now()
         date_key = now.date().isoformat()
 
         connect.current = {
@@ -157,6 +391,16 @@ class PricechartingService:
 
         hist[date_key] = prices
         connect.history = hist
-        connect.save(update_fields=["current", "history", "last_synced_at", "updated_at"])
-
         return {"date": date_key, "prices": prices}
+
+    @staticmethod
+    def apply_error(connect: PriceChartingConnect, error: Exception, now=None) -> None:
+        """
+        record a failed refresh in the history of a connect, without saving.
+        """
+        now = now or timezone.now()
+        hist = connect.history or {}
+        if isinstance(hist, dict):
+            hist[now.date().isoformat()] = {"_error": str(error)[:500]}
+            connect.history = hist
+        connect.last_synced_at = now
@@ -0,0 +1,170 @@
+# apps/games/services/records.py
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+class PlainColumn(Sequence):
+    """
+    column of arbitrary json values, one python reference per row.
+    """
+
+    def __init__(self, n: int = 0) -> None:
+        self._values: List[Any] = [None] * n
+
+    def append(self, value: Any) -> None:
+        self._values.append(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, i):
+        return self._values[i]
+
+
+class CodedColumn(Sequence):
+    """
+    dictionary-encoded column: distinct values plus a u32 code per row.
+
+    code 0 is reserved for rows that do not have the field and reads as None.
+    """
+
+    def __init__(
+        self, n: int = 0, values: Sequence[Any] = (None,), codes: Optional[array] = None
+    ) -> None:
+        self.values: List[Any] = list(values)
+        self.codes = codes if codes is not None else array("I", bytes(4 * n))
+        self._lookup: Dict[Any, int] = {}
+
+    def append(self, value: Any) -> None:
+        # non-strings are keyed with their type so 1, 1.0 and True stay apart
+        key = value if type(value) is str else (type(value), value)
+        try:
+            code = self._lookup.get(key)
+        except TypeError:
+            key, code = None, None
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            if key is not None:
+                self._lookup[key] = code
+        self.codes.append(code)
+
+    def append_missing(self) -> None:
+        self.codes.append(0)
+
+    def map(self, fn: Callable[[Any], Any], missing: Any = None) -> "CodedColumn":
+        """
+        return a column sharing these codes with `fn` applied to every distinct value.
+        """
+        values = [missing] + [fn(v) for v in self.values[1:]]
+        return CodedColumn(values=values, codes=self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.values[c] for c in self.codes[i]]
+        return self.values[self.codes[i]]
+
+
+Column = Union[PlainColumn, CodedColumn]
+
+
+class RecordStore(Sequence):
+    """
+    column-wise storage of raw game records.
+
+    every field lives in its own column and the key order of each record is
+    kept in a small shared table of record shapes, so rows cost a few array
+    slots instead of a dict each. fields listed in `coded` are dictionary
+    encoded. full dicts are only rebuilt for rows that are accessed.
+    """
+
+    def __init__(self, coded: Iterable[str] = ()) -> None:
+        self._coded = frozenset(coded)
+        self._columns: Dict[str, Column] = {}
+        self._shapes: List[Tuple[str, ...]] = []
+        self._shape_ids: Dict[Tuple[str, ...], int] = {}
+        self._row_shape = array("I")
+
+    def _new_column(self, name: str) -> Column:
+        n = len(self._row_shape)
+        return CodedColumn(n) if name in self._coded else PlainColumn(n)
+
+    def append(self, rec: Dict[str, Any]) -> None:
+        """
+        add a record as the last row.
+        """
+        keys = tuple(rec)
+        sid = self._shape_ids.get(keys)
+        if sid is None:
+            sid = self._shape_ids[keys] = len(self._shapes)
+            self._shapes.append(keys)
+            for k in keys:
+                if k not in self._columns:
+                    self._columns[k] = self._new_column(k)
+
+        for name, col in self._columns.items():
+            if name in rec:
+                col.append(rec[name])
+            elif isinstance(col, CodedColumn):
+                col.append_missing()
+            else:
+                col.append(None)
+        self._row_shape.append(sid)
+
+    def column(self, name: str) -> Column:
+        """
+        return column `name`; rows without the field read as None.
+        """
+        col = self._columns.get(name)
+        if col is None:
+            col = self._new_column(name)
+        return col
+
+    def __len__(self) -> int:
+        return len(self._row_shape)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        cols = self._columns
+        return {k: cols[k][i] for k in self._shapes[self._row_shape[i]]}
+
+
+class ChainedRows(Sequence):
+    """
+    read-only concatenation of several sequences (e.g. per-file segments).
+    """
+
+    def __init__(self, parts: Iterable[Sequence]) -> None:
+        self._parts = list(parts)
+        self._starts = [0]
+        for part in self._parts:
+            self._starts.append(self._starts[-1] + len(part))
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._parts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        k = bisect_right(self._starts, i) - 1
+        return self._parts[k][i - self._starts[k]]
@@ -1,10 +1,241 @@
 # apps/games/services/registry.py
 from __future__ import annotations
 
+import hashlib
 import json
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from copy import copy
+from dataclasses import dataclass, replace
+from heapq import merge, nsmallest
 from pathlib import Path
-from threading import RLock
-from typing import Any, Dict, Iterable, List, Tuple
+from sys import intern
+from threading import Lock, RLock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+from .fuzzy import allowed_distance, build_delete_index, lookup, tokenize
+from .records import ChainedRows, RecordStore
+from .snapshot import LOWER_FIELDS, JsonRows, KeyIndex, LowerRows, Snapshot, StringTable
+
+NGRAM_SIZE = 3
+READ_CHUNK = 1 << 16
+
+#: short queries estimated to match more than 1/DENSE_MATCHES of all titles
+#: are answered by testing every title instead of scanning the title buffer.
+DENSE_MATCHES = 10
+
+#: lowercased fields with a value -> records index, usable as filters.
+FILTER_FIELDS = ("dev", "publisher")
+
+#: record key holding the content-derived id (see `game_id`).
+ID_FIELD = "Id"
+
+#: record fields with few distinct values, interned while loading and
+#: dictionary encoded in the record store.
+INTERN_FIELDS = frozenset(
+    ("Platform", "PlatformLink", "Dev", "DevLink", "Publisher", "PublisherLink", "Genre")
+)
+_SPACE_RE = re.compile(r"\s*")
+
+_ARTICLE_RE = re.compile(r"^(?:the|la)\s+", re.I)
+_PLAYERS_RE = re.compile(r"\s*\([^()]*players\)", re.I)
+_YEAR_RE = re.compile(r"(?<!\d)(\d{4})(?!\d)")
+
+
+def ngrams(s: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """
+    return set of distinct character n-grams of a string.
+    """
+    return {s[i : i + n] for i in range(len(s) - n + 1)}
+
+
+def normalize_platform(raw: str) -> str:
+    """
+    display name of a platform: "the Wii" -> "Wii",
+    "Arcade (CPS1)  (2 players)" -> "Arcade (CPS1)".
+    """
+    name = _PLAYERS_RE.sub("", _ARTICLE_RE.sub("", raw or ""))
+    return " ".join(name.split())
+
+
+def parse_year(raw: Any) -> Optional[int]:
+    """
+    release year of a record: 1991 -> 1991, "1987/1994" -> 1987,
+    "1995-12-30T23:00:00.000Z" -> 1995, "TBA" -> None.
+    """
+    if isinstance(raw, int) and not isinstance(raw, bool):
+        return raw
+    m = _YEAR_RE.search(str(raw or ""))
+    return int(m.group(1)) if m else None
+
+
+def game_link(rec: Mapping[str, Any]) -> str:
+    """
+    wikipedia article of a record, "" when it has none or only a redlink
+    (a link to a page that does not exist yet, shared by unrelated games).
+    """
+    link = str(rec.get("GameLink") or "")
+    return "" if "redlink=1" in link else link
+
+
+def game_id(rec: Mapping[str, Any]) -> str:
+    """
+    stable id of a record derived from its content: a hash of the
+    lowercased title, normalized platform, release year and wikipedia
+    article. the same game gets the same id in every process, after
+    reloads and file reorders, while same-named games with their own
+    articles stay apart.
+    """
+    title = " ".join(str(rec.get("Game") or "").lower().split())
+    platform = normalize_platform(str(rec.get("Platform") or "")).lower()
+    year = parse_year(rec.get("Year"))
+    key = f"{title}\x1f{platform}\x1f{'' if year is None else year}\x1f{game_link(rec)}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _interned_object(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """
+    json object hook: intern keys and the values of low-cardinality fields.
+    """
+    return {
+        intern(k): intern(v) if k in INTERN_FIELDS and isinstance(v, str) else v for k, v in pairs
+    }
+
+
+_DECODER = json.JSONDecoder(object_pairs_hook=_interned_object)
+
+
+def _iter_json_array(f: TextIO, buf: str = "") -> Iterator[Any]:
+    """
+    incrementally decode elements of a top-level json array from `f`.
+
+    `buf` holds text already read from `f`; at most one element plus one
+    read chunk is buffered at a time. raises json.JSONDecodeError on
+    malformed input, like json.loads on the whole array would.
+    """
+    skip = _SPACE_RE.match
+    pos = buf.index("[") + 1
+    # "first": before the first element, "value": after a comma,
+    # "delimiter": after an element
+    expect = "first"
+    while True:
+        pos = skip(buf, pos).end()
+        if pos == len(buf):
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                raise json.JSONDecodeError("unterminated array", buf, pos)
+            buf, pos = chunk, 0
+            continue
+
+        c = buf[pos]
+        if expect == "delimiter":
+            if c == "]":
+                return
+            if c != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            expect = "value"
+            continue
+        if c == "]" and expect == "first":
+            return
+        if c in ",]":
+            raise json.JSONDecodeError("Expecting value", buf, pos)
+
+        try:
+            obj, end = _DECODER.raw_decode(buf, pos)
+            more = f.read(READ_CHUNK) if end == len(buf) else ""
+        except json.JSONDecodeError:
+            more = f.read(READ_CHUNK)
+            if not more:
+                raise
+        if more:
+            # the element may continue in the next chunk, decode it again
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        yield obj
+        expect = "delimiter"
+        pos = end
+        if pos > READ_CHUNK:
+            buf, pos = buf[pos:], 0
+
+
+def file_digest(p: Path) -> str:
+    """
+    return sha256 hex digest of a file's content.
+    """
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class Segment:
+    """
+    records parsed from a single source file.
+    """
+
+    stat: List[int]
+    digest: str
+    records: RecordStore
+    titles: List[str]
+
+
+T = TypeVar("T")
+
+
+class Deferred(Generic[T]):
+    """
+    index built on first use instead of at load time.
+
+    the holder is part of the registry state, so every `pinned` view of
+    that state shares it and the index is built once.
+    """
+
+    __slots__ = ("_build", "_value", "_lock")
+
+    def __init__(self, build: Optional[Callable[[], T]] = None, value: Optional[T] = None) -> None:
+        self._build = build
+        self._value = value
+        self._lock = Lock()
+
+    def get(self) -> T:
+        """
+        return the index, building it if this is the first use.
+        """
+        if self._build is not None:
+            with self._lock:
+                if self._build is not None:
+                    self._value = self._build()
+                    self._build = None
+        return self._value
+
+
+def _contains(postings: Sequence[int], i: int) -> bool:
+    """
+    check membership in a sorted posting list.
+    """
+    j = bisect_left(postings, i)
+    return j < len(postings) and postings[j] == i
 
 
 class GameRegistry:
@@ -13,76 +244,390 @@ class GameRegistry:
     """
 
     def __init__(self) -> None:
-        self._games: List[Dict[str, Any]] = []
-        self._lowers: List[Dict[str, Any]] = []
+        self._games: Sequence[Dict[str, Any]] = []
+        self._lowers: Sequence[Mapping[str, Any]] = []
+        self._ngram_index: Mapping[str, Sequence[int]] = {}
+        self._titles: Sequence[str] = []
+        self._title_table: StringTable = StringTable.from_strings([])
+        self._title_order: Sequence[int] = array("I")
+        self._title_rank: Sequence[int] = array("I")
+        self._vocab: Sequence[str] = []
+        self._token_postings: Sequence[Sequence[int]] = []
+        self._fuzzy_index: Deferred[Sequence[int]] = Deferred(value=array("Q"))
+        self._platform_names: Sequence[str] = []
+        self._platform_postings: Sequence[Sequence[int]] = []
+        self._platform_col: Sequence[int] = array("I")
+        self._ids: Sequence[str] = []
+        self._id_index: Mapping[str, int] = {}
+        self._field_index: Deferred[Tuple[Dict, Dict]] = Deferred(
+            value=({f: [] for f in FILTER_FIELDS}, {f: [] for f in FILTER_FIELDS})
+        )
+        self._year_index: Deferred[Tuple[Sequence[int], Sequence[int]]] = Deferred(
+            value=(array("I"), array("I"))
+        )
+        self._snapshot: Optional[Snapshot] = None
+        self._source: Optional[Path] = None
+        self._segments: Dict[str, Segment] = {}
+        self._version = 0
+        self._fingerprint = ""
         self._loaded = False
         self._lock = RLock()
+        self._reloading = Lock()
 
     def _iter_file(self, p: Path) -> Iterable[Dict[str, Any]]:
         """
-        iterate valid dict records from a json file
+        iterate valid dict records from a json file.
+
+        arrays are decoded element by element from a bounded read buffer,
+        so the whole file text and parsed list never sit in memory at once.
         """
         with p.open("r", encoding="utf-8") as f:
-            data = f.read().strip()
-            if not data:
-                return
-
-            if data.lstrip().startswith("["):
-                arr = json.loads(data)
-                for o in arr:
+            head = f.read(READ_CHUNK)
+            if head.lstrip().startswith("["):
+                for o in _iter_json_array(f, head):
                     if isinstance(o, dict):
                         yield o
+                return
 
-            else:
-                for line in data.splitlines():
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        o = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-                    if isinstance(o, dict):
-                        yield o
+            f.seek(0)
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    o = _DECODER.decode(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(o, dict):
+                    yield o
+
+    def _lower_rows(self, store: RecordStore, titles: Sequence[str]) -> LowerRows:
+        """
+        build lowercased projections used for search over a record store.
+
+        platform/dev/publisher/year are derived once per distinct value.
+        """
+
+        def lowered(v: Any) -> str:
+            return intern(str(v).lower()) if v is not None else ""
+
+        return LowerRows(
+            {
+                "game": titles,
+                "platform": store.column("Platform").map(lowered, ""),
+                "dev": store.column("Dev").map(lowered, ""),
+                "publisher": store.column("Publisher").map(lowered, ""),
+                "year": store.column("Year").map(str, ""),
+            }
+        )
 
-    def _lower_proj(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_ngram_index(self, titles: Sequence[str]) -> Dict[str, array]:
         """
-        build lowercased projection of a record used for search.
+        build n-gram -> sorted record indices posting lists over game titles.
         """
-        game = str(rec.get("Game", "")).lower()
-        platform = str(rec.get("Platform", "")).lower()
-        dev = str(rec.get("Dev", "")).lower()
-        publisher = str(rec.get("Publisher", "")).lower()
-        blob = " | ".join([game, platform, dev, publisher, str(rec.get("Year", ""))])
+        lists: Dict[str, List[int]] = {}
+        for i, title in enumerate(titles):
+            for g in ngrams(title):
+                lists.setdefault(g, []).append(i)
+        return {g: array("I", ids) for g, ids in lists.items()}
+
+    def _build_token_index(self, titles: Sequence[str]) -> Tuple[List[str], List[array]]:
+        """
+        build sorted title-token vocabulary and per-token record postings.
+        """
+        lists: Dict[str, List[int]] = {}
+        for i, title in enumerate(titles):
+            for t in dict.fromkeys(tokenize(title)):
+                lists.setdefault(t, []).append(i)
+        vocab = sorted(lists)
+        return vocab, [array("I", lists[t]) for t in vocab]
+
+    def _build_title_rank(self, titles: Sequence[str]) -> array:
+        """
+        rank every record by (title length, index), used to order completions.
+        """
+        rank = array("I", bytes(4 * len(titles)))
+        for r, i in enumerate(sorted(range(len(titles)), key=lambda i: len(titles[i]))):
+            rank[i] = r
+        return rank
+
+    def _build_platform_index(
+        self, raw_platforms: Sequence[Any]
+    ) -> Tuple[List[str], List[array], array]:
+        """
+        intern raw platform names and build platform -> records postings
+        plus a per-record platform id column.
+        """
+        lists: Dict[str, List[int]] = {}
+        for i, raw in enumerate(raw_platforms):
+            lists.setdefault(str(raw or ""), []).append(i)
+        names = sorted(lists)
+        col = array("I", bytes(4 * len(raw_platforms)))
+        for pid, name in enumerate(names):
+            for i in lists[name]:
+                col[i] = pid
+        return names, [array("I", lists[n]) for n in names], col
+
+    def _build_field_index(self, values: Sequence[str]) -> Tuple[List[str], List[array]]:
+        """
+        build sorted distinct non-empty values -> record postings of a
+        lowercased field.
+        """
+        lists: Dict[str, List[int]] = {}
+        for i, v in enumerate(values):
+            if v:
+                lists.setdefault(v, []).append(i)
+        names = sorted(lists)
+        return names, [array("I", lists[n]) for n in names]
+
+    def _build_year_index(self, raw_years: Sequence[Any]) -> Tuple[array, array]:
+        """
+        build record indices ordered by release year plus the parallel
+        sorted years; records without a parseable year are left out.
+        """
+        parsed: Dict[Any, Optional[int]] = {}
+        pairs = []
+        for i, raw in enumerate(raw_years):
+            key = raw if isinstance(raw, (str, int)) else str(raw)
+            year = parsed.get(key, -1)
+            if year == -1:
+                year = parsed[key] = parse_year(raw)
+            if year is not None:
+                pairs.append((year, i))
+        pairs.sort()
+        return array("I", [i for _y, i in pairs]), array("I", [y for y, _i in pairs])
+
+    def _read_segment(self, p: Path, stat: List[int]) -> Segment:
+        """
+        parse one source file into a segment.
+
+        every record gets its `game_id` under ID_FIELD; later records with
+        an id already seen in the file are dropped as duplicates.
+        """
+        records = RecordStore(coded=INTERN_FIELDS | {"Year"})
+        titles: List[str] = []
+        seen: Set[str] = set()
+        for obj in self._iter_file(p):
+            gid = game_id(obj)
+            if gid in seen:
+                continue
+            seen.add(gid)
+            obj[ID_FIELD] = gid
+            records.append(obj)
+            titles.append(str(obj.get("Game", "")).lower())
+        return Segment(stat=stat, digest=file_digest(p), records=records, titles=titles)
+
+    def _scan(self, dirpath: Path, segments: Dict[str, Segment]) -> Tuple[Dict[str, Segment], bool]:
+        """
+        match json files under `dirpath` against already parsed `segments`.
+
+        files whose size and mtime are unchanged are reused as is, the others
+        are hashed and only re-parsed when their content differs. returns
+        the new segments and whether anything changed.
+        """
+        out: Dict[str, Segment] = {}
+        changed = False
+        for rel, stat in source_manifest(dirpath).items():
+            seg = segments.get(rel)
+            if seg is not None and seg.stat == stat:
+                out[rel] = seg
+                continue
+            p = dirpath / rel
+            if seg is not None and seg.digest == file_digest(p):
+                out[rel] = replace(seg, stat=stat)
+                continue
+            out[rel] = self._read_segment(p, stat)
+            changed = True
+        return out, changed or out.keys() != segments.keys()
+
+    def _unique_parts(self, segments: Dict[str, Segment]) -> List[Segment]:
+        """
+        return segments in order, without records whose id already
+        appeared in an earlier segment.
+
+        stored segments are left untouched, so a duplicate comes back when
+        the file holding the first copy changes.
+        """
+        seen: Set[str] = set()
+        parts = []
+        for seg in segments.values():
+            ids = seg.records.column(ID_FIELD)
+            drop = {k for k, gid in enumerate(ids) if gid in seen}
+            seen.update(ids)
+            if drop:
+                records = RecordStore(coded=INTERN_FIELDS | {"Year"})
+                for k, rec in enumerate(seg.records):
+                    if k not in drop:
+                        records.append(rec)
+                titles = [t for k, t in enumerate(seg.titles) if k not in drop]
+                seg = replace(seg, records=records, titles=titles)
+            parts.append(seg)
+        return parts
+
+    def _build_field_indexes(self, lowers: Sequence[LowerRows]) -> Tuple[Dict, Dict]:
+        """
+        build the value and postings index of every filter field.
+        """
+        field_names, field_postings = {}, {}
+        for f in FILTER_FIELDS:
+            column = ChainedRows(low.column(f) for low in lowers)
+            field_names[f], field_postings[f] = self._build_field_index(column)
+        return field_names, field_postings
+
+    def _segments_state(self, dirpath: Path, segments: Dict[str, Segment]) -> Dict[str, Any]:
+        """
+        build registry state (records and all indexes) over parsed segments.
+
+        the fuzzy delete index and the filter field and year indexes are
+        only needed by typo-tolerant and filtered searches; they are
+        `Deferred` and built by the first query that uses them.
+        """
+        parts = self._unique_parts(segments)
+        ids = ChainedRows(seg.records.column(ID_FIELD) for seg in parts)
+        titles = [t for seg in parts for t in seg.titles]
+        vocab, token_postings = self._build_token_index(titles)
+        if vocab == self._vocab:
+            fuzzy_index = self._fuzzy_index
+        else:
+            fuzzy_index = Deferred(lambda: build_delete_index(vocab))
+        platform_names, platform_postings, platform_col = self._build_platform_index(
+            ChainedRows(seg.records.column("Platform") for seg in parts)
+        )
+        lowers = [self._lower_rows(seg.records, seg.titles) for seg in parts]
+        years = ChainedRows(seg.records.column("Year") for seg in parts)
+        return {
+            "_games": ChainedRows(seg.records for seg in parts),
+            "_titles": titles,
+            "_title_table": StringTable.from_strings(titles),
+            "_title_order": array("I", sorted(range(len(titles)), key=titles.__getitem__)),
+            "_title_rank": self._build_title_rank(titles),
+            "_lowers": ChainedRows(lowers),
+            "_ngram_index": self._build_ngram_index(titles),
+            "_vocab": vocab,
+            "_token_postings": token_postings,
+            "_fuzzy_index": fuzzy_index,
+            "_platform_names": platform_names,
+            "_platform_postings": platform_postings,
+            "_platform_col": platform_col,
+            "_ids": ids,
+            "_id_index": {gid: i for i, gid in enumerate(ids)},
+            "_field_index": Deferred(lambda: self._build_field_indexes(lowers)),
+            "_year_index": Deferred(lambda: self._build_year_index(years)),
+            "_snapshot": None,
+            "_source": dirpath,
+            "_segments": segments,
+            "_fingerprint": hashlib.sha256(
+                "\n".join(f"{rel}:{seg.digest}" for rel, seg in segments.items()).encode()
+            ).hexdigest(),
+        }
+
+    def _snapshot_state(self, snap: Snapshot) -> Dict[str, Any]:
+        """
+        build registry state backed by a mapped snapshot.
+        """
+        titles = snap.strings("lower.game")
         return {
-            "game": game,
-            "platform": platform,
-            "dev": dev,
-            "publisher": publisher,
-            "blob": blob,
+            "_games": JsonRows(snap.strings("records")),
+            "_titles": titles,
+            "_title_table": titles,
+            "_title_order": snap.u32("titles.order"),
+            "_title_rank": snap.u32("titles.rank"),
+            "_lowers": LowerRows({f: snap.strings(f"lower.{f}") for f in LOWER_FIELDS}),
+            "_ngram_index": snap.postings("ngram"),
+            "_vocab": snap.strings("tokens.keys"),
+            "_token_postings": snap.posting_lists("tokens"),
+            "_fuzzy_index": Deferred(value=snap.u64("fuzzy.deletes")),
+            "_platform_names": snap.strings("platforms.keys"),
+            "_platform_postings": snap.posting_lists("platforms"),
+            "_platform_col": snap.u32("platforms.col"),
+            "_ids": snap.strings("ids"),
+            "_id_index": KeyIndex(snap.strings("ids.keys"), snap.u32("ids.index")),
+            "_field_index": Deferred(
+                value=(
+                    {f: snap.strings(f"{f}.keys") for f in FILTER_FIELDS},
+                    {f: snap.posting_lists(f) for f in FILTER_FIELDS},
+                )
+            ),
+            "_year_index": Deferred(value=(snap.u32("years.order"), snap.u32("years.values"))),
+            "_snapshot": snap,
+            "_source": None,
+            "_segments": {},
+            "_fingerprint": snap.header.get("fingerprint")
+            or hashlib.sha256(json.dumps(snap.header, sort_keys=True).encode()).hexdigest(),
         }
 
+    def _swap(self, state: Dict[str, Any]) -> None:
+        """
+        publish a fully built state in one step under the registry lock.
+        """
+        with self._lock:
+            self.__dict__.update(state)
+            self._version += 1
+            self._loaded = True
+
     def load_from_dir(self, dirpath: Path) -> Tuple[int, int]:
         """
         load all *.json files from directory into memory.
+
+        every file becomes a segment whose records are kept column-wise
+        (see `RecordStore`), full dicts are rebuilt only for rows that are
+        accessed.
         """
         with self._lock:
             if self._loaded:
                 return (len(self._games), len(self._games))
 
-            records: List[Dict[str, Any]] = []
-            lowers: List[Dict[str, Any]] = []
+            segments, _changed = self._scan(dirpath, {})
+            self._swap(self._segments_state(dirpath, segments))
+            return (len(self._games), len(self._games))
 
-            if dirpath.exists():
-                for p in dirpath.rglob("*.json"):
-                    for obj in self._iter_file(p):
-                        records.append(obj)
-                        lowers.append(self._lower_proj(obj))
+    def load_snapshot(self, path: Path) -> Tuple[int, int]:
+        """
+        map a prebuilt binary snapshot (see `build_games_snapshot`) read-only.
 
-            self._games = records
-            self._lowers = lowers
-            self._loaded = True
-            return (len(records), len(records))
+        records and the n-gram index are read straight from the mapping,
+        raw dicts are only decoded for rows that are actually accessed.
+        """
+        with self._lock:
+            if self._loaded:
+                return (len(self._games), len(self._games))
+
+            snap = Snapshot(path)
+            self._swap(self._snapshot_state(snap))
+            return (snap.count, snap.count)
+
+    def reload(self) -> bool:
+        """
+        pick up changed source files and swap in the rebuilt registry.
+
+        only changed json files are re-parsed (a replaced snapshot is simply
+        re-mapped), but the indexes are not merged: any json change rebuilds
+        all of them over every record, which costs about as much as a cold
+        json load (~2-3 s for the bundled gamesdb). the new state is built
+        without holding the lock and published atomically under it, so
+        searches on a `pinned` view see either the old or the new data
+        meanwhile. returns True if anything changed.
+        """
+        if not self._reloading.acquire(blocking=False):
+            return False
+        try:
+            snap, source = self._snapshot, self._source
+            if snap is not None:
+                if not snap.is_stale():
+                    return False
+                self._swap(self._snapshot_state(Snapshot(snap.path)))
+                return True
+
+            if source is None:
+                return False
+            segments, changed = self._scan(source, self._segments)
+            if not changed:
+                self._segments = segments
+                return False
+            self._swap(self._segments_state(source, segments))
+            return True
+        finally:
+            self._reloading.release()
 
     def ensure_loaded(self, default_dir: Path) -> None:
         """
@@ -91,15 +636,433 @@ class GameRegistry:
         if not self._loaded:
             self.load_from_dir(default_dir)
 
+    def candidates(self, q: str) -> Optional[List[int]]:
+        """
+        return sorted record indices whose title may contain `q`.
+
+        candidates are the intersection of the posting lists of all n-grams
+        of `q`, so they still have to be verified with a substring test.
+        returns None when `q` is shorter than the n-gram size and the index
+        cannot narrow the search.
+        """
+        grams = ngrams(q)
+        if not grams:
+            return None
+
+        postings = []
+        for g in grams:
+            p = self._ngram_index.get(g)
+            if p is None:
+                return []
+            postings.append(p)
+
+        postings.sort(key=len)
+        out = list(postings[0])
+        for p in postings[1:]:
+            if not out:
+                break
+            out = [i for i in out if _contains(p, i)]
+        return out
+
+    def iter_title_matches(
+        self,
+        q: str,
+        platforms: Optional[Set[int]] = None,
+        allowed: Optional[Set[int]] = None,
+    ) -> Iterator[int]:
+        """
+        lazily yield increasing indices of records whose title contains `q`.
+
+        `platforms` restricts results to those platform ids (see
+        `platform_ids`); it is checked against the platform id column before
+        any title is touched, and short queries only walk its postings.
+        `allowed` restricts results to a set of records (see `filter_ids`);
+        titles are then only tested for the smaller of it and the n-gram
+        candidates.
+        """
+        titles = self._titles
+        col = self._platform_col
+        cand = self.candidates(q)
+        if allowed is not None:
+            ids = cand if cand is not None and len(cand) < len(allowed) else sorted(allowed)
+            return (
+                i
+                for i in ids
+                if i in allowed and (platforms is None or col[i] in platforms) and q in titles[i]
+            )
+        if cand is not None:
+            if platforms is not None:
+                cand = [i for i in cand if col[i] in platforms]
+            return (i for i in cand if q in titles[i])
+        if platforms is not None:
+            ids = merge(*(self._platform_postings[p] for p in sorted(platforms)))
+            return (i for i in ids if q in titles[i])
+
+        # too short for the n-gram index: scan the single title buffer, unless
+        # so many titles match that a plain per-title test is cheaper
+        table = self._title_table
+        if table is titles or table.estimate_matches(q) * DENSE_MATCHES < len(titles):
+            return table.iter_find(q)
+        return (i for i, title in enumerate(titles) if q in title)
+
+    def iter_any_matches(
+        self,
+        q: str,
+        platforms: Optional[Set[int]] = None,
+        allowed: Optional[Set[int]] = None,
+    ) -> Iterator[int]:
+        """
+        yield increasing indices of records whose title, developer or
+        publisher contains `q`, restricted like `iter_title_matches`.
+        """
+        ids = set(self.iter_title_matches(q, platforms, allowed))
+        col = self._platform_col
+        for f in FILTER_FIELDS:
+            for i in self.field_ids(f, q):
+                if (allowed is None or i in allowed) and (platforms is None or col[i] in platforms):
+                    ids.add(i)
+        return iter(sorted(ids))
+
+    def field_ids(self, field: str, q: str) -> Set[int]:
+        """
+        return indices of records whose lowercased `field` (one of
+        FILTER_FIELDS) contains `q`, from the postings of matching values.
+        """
+        q = q.strip().lower()
+        names, postings = self.field_names[field], self.field_postings[field]
+        out: Set[int] = set()
+        for vid, name in enumerate(names):
+            if q in name:
+                out.update(postings[vid])
+        return out
+
+    def year_ids(
+        self, year_from: Optional[int] = None, year_to: Optional[int] = None
+    ) -> Sequence[int]:
+        """
+        return indices of records released in [year_from, year_to] (both
+        optional), by binary search over the sorted year array.
+        """
+        order, years = self._year_index.get()
+        lo = 0 if year_from is None else bisect_left(years, year_from)
+        hi = len(years) if year_to is None else bisect_right(years, year_to)
+        return order[lo:hi]
+
+    def filter_ids(
+        self,
+        *,
+        dev: str = "",
+        publisher: str = "",
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ) -> Optional[Set[int]]:
+        """
+        return records passing all given field filters, intersecting the
+        smallest sets first; None when no filter is given.
+        """
+        sets: List[Set[int]] = []
+        if dev:
+            sets.append(self.field_ids("dev", dev))
+        if publisher:
+            sets.append(self.field_ids("publisher", publisher))
+        if year_from is not None or year_to is not None:
+            sets.append(set(self.year_ids(year_from, year_to)))
+        if not sets:
+            return None
+
+        sets.sort(key=len)
+        out = sets[0]
+        for other in sets[1:]:
+            out = out & other
+        return out
+
+    def match_title(self, q: str) -> List[int]:
+        """
+        return sorted indices of records whose lowercased title contains `q`.
+        """
+        return list(self.iter_title_matches(q))
+
+    def complete(self, q: str, limit: int = 10) -> List[int]:
+        """
+        return up to `limit` record indices completing a typeahead query.
+
+        titles starting with `q` come first, in title order: they form one
+        range of the sorted title array. the rest is filled with titles in
+        which every query word but the last is a title word and the last
+        one prefixes a title word (a range of the sorted vocabulary),
+        shortest title first (see `title_rank`).
+        """
+        q = " ".join(q.lower().split())
+        if not q or limit <= 0:
+            return []
+
+        with self._lock:
+            titles, order, rank = self._titles, self._title_order, self._title_rank
+            vocab, postings = self._vocab, self._token_postings
+
+        out: List[int] = []
+        j = bisect_left(order, q, key=titles.__getitem__)
+        while j < len(order) and len(out) < limit and titles[order[j]].startswith(q):
+            out.append(order[j])
+            j += 1
+
+        words = tokenize(q)
+        if len(out) >= limit or not words:
+            return out
+
+        *whole, last = words
+        lo = bisect_left(vocab, last)
+        hi = bisect_left(vocab, last + "\U0010ffff", lo)
+        if lo == hi:
+            return out
+
+        lists = []
+        for w in whole:
+            t = bisect_left(vocab, w)
+            if t == len(vocab) or vocab[t] != w:
+                return out
+            lists.append(postings[t])
+
+        shortest = min(lists, key=len) if lists else None
+        wide = False
+        if shortest is not None:
+            budget = 64 * len(shortest)
+            for t in range(lo, hi):
+                budget -= len(postings[t])
+                if budget < 0:
+                    wide = True
+                    break
+
+        if wide:
+            # the prefix matches far more records than the rarest full word
+
+            def matches(i: int) -> bool:
+                tokens = set(tokenize(titles[i]))
+                return all(w in tokens for w in whole) and any(t.startswith(last) for t in tokens)
+
+            cand = {i for i in shortest if matches(i)}
+        else:
+            cand = {i for t in range(lo, hi) for i in postings[t]}
+            if shortest is not None:
+                cand = {i for i in shortest if i in cand and all(_contains(p, i) for p in lists)}
+
+        cand.difference_update(out)
+        return out + nsmallest(limit - len(out), cand, key=rank.__getitem__)
+
+    def fuzzy_matches(self, q: str) -> List[Tuple[int, int]]:
+        """
+        return (record index, edit distance) pairs for a typo-tolerant query.
+
+        every query token must match some title token within its allowed
+        edit distance; the distances of all tokens are summed. results are
+        ordered by distance, then registry order.
+        """
+        vocab = self._vocab
+        postings = self._token_postings
+        index = self._fuzzy_index.get()
+
+        hits: List[Dict[int, int]] = []
+        for tok in dict.fromkeys(tokenize(q)):
+            h = lookup(index, vocab.__getitem__, tok, allowed_distance(tok))
+            if not h:
+                return []
+            hits.append(h)
+        if not hits:
+            return []
+
+        hits.sort(key=lambda h: sum(len(postings[tid]) for tid in h))
+
+        best: Dict[int, int] = {}
+        for tid, dist in hits[0].items():
+            for i in postings[tid]:
+                if dist < best.get(i, dist + 1):
+                    best[i] = dist
+
+        for h in hits[1:]:
+            nxt: Dict[int, int] = {}
+            for tid, dist in h.items():
+                for i in postings[tid]:
+                    d = best.get(i)
+                    if d is not None and d + dist < nxt.get(i, d + dist + 1):
+                        nxt[i] = d + dist
+            best = nxt
+            if not best:
+                return []
+
+        return sorted(best.items(), key=lambda kv: (kv[1], kv[0]))
+
+    def game_index(self, game_id: str) -> Optional[int]:
+        """
+        return registry index of the record with id `game_id`, or None.
+        """
+        return self._id_index.get(game_id)
+
+    def platform_ids(self, platform: str) -> Set[int]:
+        """
+        return ids of platforms whose lowercased raw name contains `platform`.
+        """
+        platform = platform.strip().lower()
+        return {pid for pid, name in enumerate(self._platform_names) if platform in name.lower()}
+
+    def facet_counts(self, indices: Iterable[int]) -> List[Tuple[str, int]]:
+        """
+        count records per normalized platform name, most frequent first.
+        """
+        col = self._platform_col
+        by_pid = Counter(col[i] for i in indices)
+        out: Counter = Counter()
+        for pid, n in by_pid.items():
+            out[normalize_platform(self._platform_names[pid])] += n
+        return sorted(out.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def platforms(self) -> List[Tuple[str, int]]:
+        """
+        return all normalized platform names with their sizes.
+        """
+        out: Counter = Counter()
+        with self._lock:
+            names, postings = self._platform_names, self._platform_postings
+        for pid, name in enumerate(names):
+            out[normalize_platform(name)] += len(postings[pid])
+        return sorted(out.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def pinned(self) -> GameRegistry:
+        """
+        return a view of the data loaded right now.
+
+        the view shares all indexes with the registry but keeps them when a
+        reload swaps in new ones, so a query can read several of them
+        without holding `lock` and never mixes two data versions.
+        """
+        with self._lock:
+            return copy(self)
+
     @property
-    def games(self) -> List[Dict[str, Any]]:
+    def lock(self) -> RLock:
+        """Return lock to hold while reading several attributes together."""
+        return self._lock
+
+    @property
+    def loaded(self) -> bool:
+        """Return whether any data has been swapped in yet."""
+        return self._loaded
+
+    @property
+    def version(self) -> int:
+        """Return counter bumped every time new data is swapped in."""
+        return self._version
+
+    @property
+    def fingerprint(self) -> str:
+        """Return content hash of the loaded data, stable across processes."""
+        return self._fingerprint
+
+    @property
+    def games(self) -> Sequence[Dict[str, Any]]:
         """Return list of raw game records."""
         return self._games
 
     @property
-    def lowers(self) -> List[Dict[str, Any]]:
+    def lowers(self) -> Sequence[Mapping[str, Any]]:
         """Return list of lowercased projections for search."""
         return self._lowers
 
+    @property
+    def titles(self) -> Sequence[str]:
+        """Return lowercased game titles (same as `lowers[i]["game"]`)."""
+        return self._titles
+
+    @property
+    def title_table(self) -> StringTable:
+        """Return all lowercased titles as one contiguous utf-8 buffer."""
+        return self._title_table
+
+    @property
+    def title_order(self) -> Sequence[int]:
+        """Return record indices sorted by lowercased title."""
+        return self._title_order
+
+    @property
+    def title_rank(self) -> Sequence[int]:
+        """Return completion rank of every record (shorter titles first)."""
+        return self._title_rank
+
+    @property
+    def ngram_index(self) -> Mapping[str, Sequence[int]]:
+        """Return n-gram -> sorted record indices posting lists."""
+        return self._ngram_index
+
+    @property
+    def vocab(self) -> Sequence[str]:
+        """Return sorted title-token vocabulary."""
+        return self._vocab
+
+    @property
+    def token_postings(self) -> Sequence[Sequence[int]]:
+        """Return record postings aligned with `vocab`."""
+        return self._token_postings
+
+    @property
+    def fuzzy_index(self) -> Sequence[int]:
+        """Return sorted delete-hash index over `vocab` (see fuzzy.py)."""
+        return self._fuzzy_index.get()
+
+    @property
+    def platform_names(self) -> Sequence[str]:
+        """Return sorted distinct raw platform names (index = platform id)."""
+        return self._platform_names
+
+    @property
+    def platform_postings(self) -> Sequence[Sequence[int]]:
+        """Return record postings aligned with `platform_names`."""
+        return self._platform_postings
+
+    @property
+    def platform_col(self) -> Sequence[int]:
+        """Return platform id of every record."""
+        return self._platform_col
+
+    @property
+    def ids(self) -> Sequence[str]:
+        """Return content-derived id of every record."""
+        return self._ids
+
+    @property
+    def field_names(self) -> Mapping[str, Sequence[str]]:
+        """Return sorted distinct lowercased values of every filter field."""
+        return self._field_index.get()[0]
+
+    @property
+    def field_postings(self) -> Mapping[str, Sequence[Sequence[int]]]:
+        """Return record postings aligned with `field_names`."""
+        return self._field_index.get()[1]
+
+    @property
+    def year_order(self) -> Sequence[int]:
+        """Return indices of records with a known year, ordered by year."""
+        return self._year_index.get()[0]
+
+    @property
+    def year_values(self) -> Sequence[int]:
+        """Return sorted years aligned with `year_order`."""
+        return self._year_index.get()[1]
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """Return mapped snapshot if registry was loaded from one."""
+        return self._snapshot
+
+
+def source_manifest(dirpath: Path) -> Dict[str, List[int]]:
+    """
+    describe json files under `dirpath` as {relative path: [size, mtime_ns]}.
+    """
+    out: Dict[str, List[int]] = {}
+    if dirpath.exists():
+        for p in sorted(dirpath.rglob("*.json")):
+            st = p.stat()
+            out[p.relative_to(dirpath).as_posix()] = [st.st_size, st.st_mtime_ns]
+    return out
+
 
 REGISTRY = GameRegistry()
@@ -0,0 +1,80 @@
+# apps/games/services/reloader.py
+from __future__ import annotations
+
+import logging
+import os
+import time
+from threading import Event, Thread
+from typing import Optional
+
+from .registry import GameRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryReloader:
+    """
+    daemon thread that periodically calls `GameRegistry.reload`.
+
+    threads do not survive fork, so the poller is restarted in every child
+    process (gunicorn workers of a preloaded app, celery prefork workers).
+    """
+
+    def __init__(self, registry: GameRegistry, interval: float) -> None:
+        self.registry = registry
+        self.interval = interval
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._fork_hook = False
+
+    def start(self) -> "RegistryReloader":
+        """
+        start polling in the background; a no-op if already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="games-registry-reloader", daemon=True)
+        self._thread.start()
+        if not self._fork_hook and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+            self._fork_hook = True
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        stop polling and wait for the thread to exit.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _after_fork(self) -> None:
+        if self._thread is not None and not self._stop.is_set():
+            self._thread = None
+            self.start()
+
+    def _run(self) -> None:
+        stop = self._stop
+        while not stop.wait(self.interval):
+            self.poll()
+
+    def poll(self) -> bool:
+        """
+        reload registry once, logging instead of raising on failure.
+        """
+        started = time.perf_counter()
+        try:
+            changed = self.registry.reload()
+        except Exception:
+            logger.exception("games registry reload failed, keeping current data")
+            return False
+        if changed:
+            logger.info(
+                "games registry reloaded: games=%d version=%d reload_ms=%.1f",
+                len(self.registry.games),
+                self.registry.version,
+                (time.perf_counter() - started) * 1000,
+            )
+        return changed
@@ -0,0 +1,217 @@
+# apps/games/services/response_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from apps.games.integrations.pricecharting.ratelimit import lane
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("hit", "stale", "miss", "error")
+
+DEFAULT_TTL = {"search": 600, "item": 3600}
+DEFAULT_STALE = {"search": 86400, "item": 86400}
+
+#: empty results (often an anti-bot page) are kept only this long.
+EMPTY_TTL = 60
+
+#: a key is revalidated by one worker at a time for at most this long.
+LOCK_TTL = 60
+
+#: after a connection error the cache is skipped for this many seconds.
+OUTAGE_PAUSE = 30
+
+OUTAGE_ERRORS = (OSError, RedisConnectionError, RedisTimeoutError)
+
+
+class ResponseCache:
+    """
+    stale-while-revalidate cache of pricecharting responses.
+
+    entries live in the django cache `alias` (redis in deployments). an
+    entry is fresh for the ttl of its kind; after that it is still served
+    for the stale period while one worker refetches it in a background
+    thread, in the background lane of the rate limiter. only a miss waits
+    for pricecharting. cache errors are logged and treated as misses;
+    after a connection error the cache is left alone for OUTAGE_PAUSE
+    seconds so requests do not wait out the socket timeout each time.
+
+    hit/stale/miss/error counters are kept in the same cache, so `stats()`
+    covers every worker sharing it.
+    """
+
+    def __init__(self, alias: str = "pricecharting", prefix: str = "pc:v1") -> None:
+        self.alias = alias
+        self.prefix = prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._pending: List[Future] = []
+        self._lock = Lock()
+        self._down_until = 0.0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, kind: str, *parts: Any) -> str:
+        raw = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        return f"{self.prefix}:{kind}:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+    def ttl(self, kind: str) -> int:
+        return getattr(settings, "PRICECHARTING_CACHE_TTL", DEFAULT_TTL).get(
+            kind, DEFAULT_TTL.get(kind, 600)
+        )
+
+    def stale_ttl(self, kind: str) -> int:
+        return getattr(settings, "PRICECHARTING_CACHE_STALE", DEFAULT_STALE).get(
+            kind, DEFAULT_STALE.get(kind, 0)
+        )
+
+    def get_or_fetch(self, kind: str, parts: tuple, fetch: Callable[[], Any]) -> Any:
+        """
+        return the cached response for (`kind`, `parts`) or call `fetch`.
+        """
+        if self.is_down():
+            return fetch()
+        key = self.key(kind, *parts)
+        try:
+            entry = self.cache.get(key)
+        except Exception as e:
+            self._failed("get", e)
+            self._count(kind, "error")
+            return fetch()
+
+        if entry is not None:
+            if time.time() < entry["fresh_until"]:
+                self._count(kind, "hit")
+            else:
+                self._count(kind, "stale")
+                self._revalidate(kind, key, fetch)
+            return entry["value"]
+
+        self._count(kind, "miss")
+        value = fetch()
+        self._store(kind, key, value)
+        return value
+
+    def is_down(self) -> bool:
+        return time.monotonic() < self._down_until
+
+    def _failed(self, action: str, error: Exception) -> None:
+        if isinstance(error, OUTAGE_ERRORS):
+            self._down_until = time.monotonic() + OUTAGE_PAUSE
+            logger.warning(
+                "pricecharting cache %s failed, skipping the cache for %ss: %s",
+                action,
+                OUTAGE_PAUSE,
+                error,
+            )
+        else:
+            logger.warning("pricecharting cache %s failed: %s", action, error)
+
+    def _store(self, kind: str, key: str, value: Any) -> None:
+        if self.is_down():
+            return
+        ttl = self.ttl(kind) if value else min(EMPTY_TTL, self.ttl(kind))
+        entry = {"value": value, "fresh_until": time.time() + ttl}
+        try:
+            self.cache.set(key, entry, timeout=ttl + (self.stale_ttl(kind) if value else 0))
+        except Exception as e:
+            self._failed("set", e)
+
+    def _revalidate(self, kind: str, key: str, fetch: Callable[[], Any]) -> None:
+        lock_key = f"{key}:lock"
+        try:
+            if not self.cache.add(lock_key, os.getpid(), timeout=LOCK_TTL):
+                return
+        except Exception as e:
+            self._failed("lock", e)
+            return
+
+        def run() -> None:
+            try:
+                with lane("background"):
+                    self._store(kind, key, fetch())
+            except Exception as e:
+                logger.warning("pricecharting revalidation of %s failed: %s", kind, e)
+            finally:
+                try:
+                    self.cache.delete(lock_key)
+                except Exception:
+                    pass
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # threads do not survive fork, every process needs its own pool
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="pricecharting-revalidate"
+                )
+                self._pid = os.getpid()
+                self._pending = []
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(self._executor.submit(run))
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        block until background revalidations started by this process finish.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending, timeout=timeout)
+
+    def _stats_key(self, kind: str, outcome: str) -> str:
+        return f"{self.prefix}:stats:{kind}:{outcome}"
+
+    def _count(self, kind: str, outcome: str) -> None:
+        if self.is_down():
+            return
+        key = self._stats_key(kind, outcome)
+        try:
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                if not self.cache.add(key, 1, timeout=None):
+                    self.cache.incr(key)
+        except Exception as e:
+            self._failed("count", e)
+
+    def stats(self, kinds=tuple(DEFAULT_TTL)) -> Dict[str, Dict[str, Any]]:
+        """
+        counters and hit ratio (fresh or stale answers from cache) per kind.
+        """
+        keys = {(k, o): self._stats_key(k, o) for k in kinds for o in OUTCOMES}
+        try:
+            values = self.cache.get_many(list(keys.values()))
+        except Exception as e:
+            self._failed("stats", e)
+            values = {}
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for kind in kinds:
+            data: Dict[str, Any] = {o: int(values.get(keys[kind, o]) or 0) for o in OUTCOMES}
+            served = data["hit"] + data["stale"]
+            total = served + data["miss"]
+            data["hit_ratio"] = round(served / total, 3) if total else 0.0
+            out[kind] = data
+        return out
+
+    def reset_stats(self) -> None:
+        try:
+            self.cache.delete_many([self._stats_key(k, o) for k in DEFAULT_TTL for o in OUTCOMES])
+        except Exception as e:
+            logger.warning("pricecharting cache stats reset failed: %s", e)
+
+
+RESPONSE_CACHE = ResponseCache()
@@ -0,0 +1,62 @@
+# apps/games/services/result_cache.py
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+
+class ResultCache:
+    """
+    bounded, thread-safe lru cache of query results for one data version.
+
+    entries are only valid for the registry version they were computed
+    for; the first access with another version drops all of them.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = Lock()
+
+    def _check_version(self, version: int) -> None:
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """
+        return cached value for `key` at `version`, or None.
+        """
+        with self._lock:
+            self._check_version(version)
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        store `value` for `key`, evicting least recently used entries.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
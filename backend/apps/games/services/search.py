@@ -1,19 +1,158 @@
 # apps/games/services/search.py
 from __future__ import annotations
 
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from heapq import heappush, heapreplace
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from .registry import REGISTRY, GameRegistry
+from .fuzzy import tokenize
+from .registry import REGISTRY, GameRegistry, normalize_platform, parse_year
+from .result_cache import ResultCache
+
+#: how `total` is computed: "exact" walks every match, "estimate"
+#: extrapolates from the matches seen before stopping, "none" skips it.
+CountMode = Literal["exact", "estimate", "none"]
+
+SCORE_EXACT = 100
+SCORE_PREFIX = 75
+SCORE_WORD = 50
+SCORE_SUBSTRING = 25
+WHOLE_WORD_BONUS = 5
+PLATFORM_BOOST = 10
+
+#: confidence multiplier for a best match on another platform than asked.
+PLATFORM_MISMATCH = 0.75
+
+
+def _ends_word(title: str, end: int) -> bool:
+    return end == len(title) or not title[end].isalnum()
+
+
+def match_confidence(title: str, q: str) -> float:
+    """
+    similarity of a lowercased title and query in [0, 1], ignoring
+    punctuation and repeated whitespace.
+    """
+    a, b = " ".join(tokenize(title)), " ".join(tokenize(q))
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def score_title(title: str, q: str) -> int:
+    """
+    score how well a lowercased title matches a lowercased query.
+
+    matches that also end on a word boundary get a small bonus, so "mario"
+    ranks "mario bros." above "marion".
+    """
+    if title == q:
+        return SCORE_EXACT
+    if title.startswith(q):
+        return SCORE_PREFIX + (WHOLE_WORD_BONUS if _ends_word(title, len(q)) else 0)
+
+    score = SCORE_SUBSTRING
+    pos = title.find(q)
+    while pos > 0:
+        if not title[pos - 1].isalnum():
+            if _ends_word(title, pos + len(q)):
+                return SCORE_WORD + WHOLE_WORD_BONUS
+            score = SCORE_WORD
+        pos = title.find(q, pos + 1)
+    return score
+
+
+@dataclass(frozen=True)
+class FieldFilters:
+    """
+    record filters besides the title query and platform.
+
+    with `any_field` the query also matches developer and publisher.
+    """
+
+    dev: str = ""
+    publisher: str = ""
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    any_field: bool = False
+
+    def narrows(self) -> bool:
+        """
+        whether any filter restricts the set of records.
+        """
+        return bool(
+            self.dev or self.publisher or self.year_from is not None or self.year_to is not None
+        )
+
+
+NO_FILTERS = FieldFilters()
+
+
+class SearchBackend(Protocol):
+    """
+    alternative store for non-fuzzy searches (see `db_search`).
+    """
+
+    def version(self) -> int: ...
+
+    def fingerprint(self) -> str: ...
+
+    def search(
+        self,
+        q: str,
+        limit: int,
+        offset: int,
+        platform: str,
+        ranked: bool,
+        boost_platform: str,
+        count: CountMode,
+        facets: bool,
+        filters: FieldFilters,
+    ) -> Dict[str, object]: ...
 
 
 class GameSearchService:
     """
-    simple substring-based search service over gameregistry
+    substring-based search service over gameregistry.
+
+    queries long enough for the registry n-gram index only verify the
+    candidate records returned by it, shorter ones fall back to a full scan.
     """
 
-    def __init__(self, registry: GameRegistry = REGISTRY) -> None:
+    def __init__(
+        self,
+        registry: GameRegistry = REGISTRY,
+        cache_size: int = 1024,
+        backend: Optional[SearchBackend] = None,
+    ) -> None:
         self.registry = registry
+        self.backend = backend
+        self.cache = ResultCache(cache_size)
+
+    def fingerprint(self, autoload_dir: Optional[Path] = None) -> str:
+        """
+        content fingerprint of the data `search_by_name` runs on.
+        """
+        if self.backend is not None:
+            return self.backend.fingerprint()
+        if autoload_dir is not None:
+            self.registry.ensure_loaded(autoload_dir)
+        return self.registry.fingerprint
 
     def search_by_name(
         self,
@@ -23,32 +162,371 @@ class GameSearchService:
         offset: int = 0,
         platform: Optional[str] = None,
         autoload_dir: Optional[Path] = None,
+        ranked: bool = False,
+        boost_platform: Optional[str] = None,
+        count: CountMode = "exact",
+        fuzzy: bool = False,
+        facets: bool = False,
+        dev: Optional[str] = None,
+        publisher: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        field: Literal["title", "any"] = "title",
     ) -> Dict[str, object]:
         """
         search games by name and optional platform filter.
+
+        `dev` and `publisher` keep records whose developer / publisher
+        contains the given text, `year_from`/`year_to` bound the release
+        year (inclusive). these filters are resolved to record sets by the
+        registry field indexes and intersected before any title is tested;
+        with any of them `q` may be empty. with field="any" `q` also
+        matches developer and publisher.
+
+        unranked results keep registry order, ranked ones are ordered by
+        exact > prefix > word-boundary > substring title match (plus an
+        optional platform boost). unless `count` is "exact" the scan stops
+        as soon as the requested page is known; `total` is then estimated
+        or None and `estimated` tells whether it is exact.
+
+        in `fuzzy` mode title words may be misspelled (see
+        `GameRegistry.fuzzy_matches`); results are ordered by edit distance.
+
+        with `facets` the result also carries per-platform counts of all
+        title matches, regardless of the platform filter.
+
+        the search runs on a `pinned` view of the registry, so a concurrent
+        reload is never observed half way and is not held up by it. results
+        are cached per registry data version (see `ResultCache`); callers
+        must not mutate them.
+
+        with a `backend` non-fuzzy searches run there instead of on the
+        registry, which is then only loaded for fuzzy ones.
         """
+        q = (q or "").strip().lower()
+        platform = (platform or "").strip().lower()
+        boost_platform = (boost_platform or "").strip().lower()
+        filters = FieldFilters(
+            dev=(dev or "").strip().lower(),
+            publisher=(publisher or "").strip().lower(),
+            year_from=year_from,
+            year_to=year_to,
+            any_field=field == "any" and bool(q),
+        )
+
+        if not q and not filters.narrows():
+            return {"total": 0, "items": [], "limit": limit, "offset": offset, "estimated": False}
+        fuzzy = fuzzy and bool(q)
+
+        key = (q, limit, offset, platform, ranked, boost_platform, count, fuzzy, facets, filters)
+        backend = self.backend
+        if backend is not None and not fuzzy:
+            version = backend.version()
+            data = self.cache.get(key, version)
+            if data is None:
+                data = backend.search(
+                    q, limit, offset, platform, ranked, boost_platform, count, facets, filters
+                )
+                self.cache.put(key, version, data)
+            return dict(data)
+
         if autoload_dir is not None:
             self.registry.ensure_loaded(autoload_dir)
 
-        q = (q or "").strip().lower()
-        platform = (platform or "").strip().lower()
+        registry = self.registry.pinned()
+        version = registry.version
+        data = self.cache.get(key, version)
+        if data is None:
+            data = self._search(
+                registry,
+                q,
+                limit,
+                offset,
+                platform,
+                ranked,
+                boost_platform,
+                count,
+                fuzzy,
+                facets,
+                filters,
+            )
+            self.cache.put(key, version, data)
+        return dict(data)
+
+    def _search(
+        self,
+        registry: GameRegistry,
+        q: str,
+        limit: int,
+        offset: int,
+        platform: str,
+        ranked: bool,
+        boost_platform: str,
+        count: CountMode,
+        fuzzy: bool,
+        facets: bool,
+        filters: FieldFilters = NO_FILTERS,
+    ) -> Dict[str, object]:
+        games = registry.games
+        pids = registry.platform_ids(platform) if platform else None
+        allowed = registry.filter_ids(
+            dev=filters.dev,
+            publisher=filters.publisher,
+            year_from=filters.year_from,
+            year_to=filters.year_to,
+        )
+
+        if fuzzy:
+            return self._fuzzy(registry, q, limit, offset, pids, ranked, facets, allowed)
+
+        iter_matches = (
+            registry.iter_any_matches if filters.any_field else registry.iter_title_matches
+        )
+        matches: Iterator[int] = iter_matches(q, pids, allowed)
+
+        if ranked:
+            boost_ids = registry.platform_ids(boost_platform) if boost_platform else set()
+            idx, seen, last, stopped = self._top_k(
+                registry, matches, q, offset + limit, boost_ids, count
+            )
+        else:
+            idx, seen, last, stopped = self._first_k(matches, offset + limit, count)
+
+        total: Optional[int] = seen
+        if stopped:
+            total = None
+            if count == "estimate":
+                total = max(seen, round(seen * len(games) / (last + 1)))
+
+        items = [games[i] for i in idx[offset:]]
+        data = {
+            "total": total,
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "estimated": stopped and total is not None,
+        }
+        if facets:
+            data["facets"] = registry.facet_counts(iter_matches(q, None, allowed))
+        return data
+
+    def complete(
+        self, *, q: str, limit: int = 10, autoload_dir: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        typeahead completions for a partially typed title.
+
+        returns compact {id, title, platform, year} rows (see
+        `GameRegistry.complete` for the order), id is the stable game id.
+        """
+        if autoload_dir is not None:
+            self.registry.ensure_loaded(autoload_dir)
+
+        registry = self.registry.pinned()
+        games = registry.games
+        ids = registry.ids
+        out = []
+        for i in registry.complete(q or "", limit):
+            rec = games[i]
+            out.append(
+                {
+                    "id": ids[i],
+                    "title": rec.get("Game") or "",
+                    "platform": normalize_platform(str(rec.get("Platform") or "")),
+                    "year": parse_year(rec.get("Year")),
+                }
+            )
+        return out
+
+    def get(self, game_id: str, *, autoload_dir: Optional[Path] = None) -> Optional[Dict]:
+        """
+        return the record with stable id `game_id`, or None.
+        """
+        return self.get_many([game_id], autoload_dir=autoload_dir)[0]
+
+    def get_many(
+        self, ids: Sequence[str], *, autoload_dir: Optional[Path] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        return records for stable ids in the given order, None for unknown
+        ones; each is a single hash lookup in the registry id index.
+        """
+        if autoload_dir is not None:
+            self.registry.ensure_loaded(autoload_dir)
+
+        registry = self.registry.pinned()
+        games = registry.games
+        out: List[Optional[Dict[str, Any]]] = []
+        for gid in ids:
+            i = registry.game_index(gid)
+            out.append(None if i is None else games[i])
+        return out
+
+    def match_many(
+        self, rows: Sequence[Mapping[str, Any]], *, autoload_dir: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        resolve many {title, platform} rows to their best registry match.
+
+        rows are matched like a ranked single search with the platform as
+        a boost; titles without any substring match fall back to fuzzy
+        word matching. every row gets {id, match, confidence}, where
+        confidence is the title similarity, lowered when the best match is
+        on another platform. identical rows are resolved once and the
+        whole batch runs on one `pinned` view of the registry.
+        """
+        if autoload_dir is not None:
+            self.registry.ensure_loaded(autoload_dir)
+
+        registry = self.registry.pinned()
+        games = registry.games
+        titles = registry.titles
+        platforms: Dict[str, Set[int]] = {}
+        resolved: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        out = []
+        for row in rows:
+            q = (row.get("title") or "").strip().lower()
+            platform = (row.get("platform") or "").strip().lower()
+            key = (q, platform)
+            if key not in resolved:
+                pids = platforms.get(platform)
+                if pids is None and platform:
+                    pids = platforms[platform] = registry.platform_ids(platform)
+                i = self._best_match(registry, q, pids or set()) if q else None
+                if i is None:
+                    resolved[key] = {"id": None, "match": None, "confidence": 0.0}
+                else:
+                    confidence = match_confidence(titles[i], q)
+                    if pids is not None and registry.platform_col[i] not in pids:
+                        confidence *= PLATFORM_MISMATCH
+                    resolved[key] = {
+                        "id": registry.ids[i],
+                        "match": games[i],
+                        "confidence": round(confidence, 3),
+                    }
+            out.append(dict(resolved[key]))
+        return out
+
+    def _best_match(self, registry: GameRegistry, q: str, pids: Set[int]) -> Optional[int]:
+        idx, _seen, _last, _stopped = self._top_k(
+            registry, registry.iter_title_matches(q), q, 1, pids, "none"
+        )
+        if idx:
+            return idx[0]
+
+        pairs = registry.fuzzy_matches(q)
+        if not pairs:
+            return None
+        titles = registry.titles
+        col = registry.platform_col
+        return min(pairs, key=lambda p: (p[1], col[p[0]] not in pids, len(titles[p[0]]), p[0]))[0]
+
+    def _fuzzy(
+        self,
+        registry: GameRegistry,
+        q: str,
+        limit: int,
+        offset: int,
+        pids: Optional[Set[int]],
+        ranked: bool,
+        facets: bool,
+        allowed: Optional[Set[int]] = None,
+    ) -> Dict[str, object]:
+        """
+        typo-tolerant search, ordered by edit distance (then title length
+        when ranked) and registry order.
+        """
+        titles = registry.titles
+        all_pairs = registry.fuzzy_matches(q)
+        if allowed is not None:
+            all_pairs = [(i, d) for i, d in all_pairs if i in allowed]
+        pairs = all_pairs
+        if pids is not None:
+            col = registry.platform_col
+            pairs = [(i, d) for i, d in pairs if col[i] in pids]
+        if ranked:
+            pairs.sort(key=lambda p: (p[1], len(titles[p[0]]), p[0]))
+
+        games = registry.games
+        data = {
+            "total": len(pairs),
+            "items": [games[i] for i, _d in pairs[offset : offset + limit]],
+            "limit": limit,
+            "offset": offset,
+            "estimated": False,
+        }
+        if facets:
+            data["facets"] = registry.facet_counts(i for i, _d in all_pairs)
+        return data
+
+    @staticmethod
+    def _first_k(
+        matches: Iterator[int], k: int, count: CountMode
+    ) -> Tuple[List[int], int, int, bool]:
+        """
+        take first `k` matches, consuming the rest only to count them.
+
+        returns (indices, matches seen, last index seen, stopped early).
+        """
+        head = list(islice(matches, k))
+        seen = len(head)
+        last = head[-1] if head else 0
+
+        if count != "exact":
+            nxt = next(matches, None)
+            if nxt is None:
+                return head, seen, last, False
+            return head, seen + 1, nxt, True
+
+        for last in matches:
+            seen += 1
+        return head, seen, last, False
+
+    def _top_k(
+        self,
+        registry: GameRegistry,
+        matches: Iterator[int],
+        q: str,
+        k: int,
+        boost_ids: Set[int],
+        count: CountMode,
+    ) -> Tuple[List[int], int, int, bool]:
+        """
+        keep the best `k` matches in a bounded min-heap.
+
+        ties are broken by shorter title, then registry order. once the heap
+        is full of matches with the best attainable score nothing later can
+        displace them, so the scan stops there unless `count` is "exact".
+        """
+        titles = registry.titles
+        col = registry.platform_col
+        best = SCORE_EXACT + (PLATFORM_BOOST if boost_ids else 0)
 
-        if not q:
-            return {"total": 0, "items": [], "limit": limit, "offset": offset}
+        heap: List[Tuple[int, int, int]] = []
+        seen = 0
+        last = 0
+        for i in matches:
+            seen += 1
+            last = i
+            title = titles[i]
+            score = score_title(title, q)
+            if col[i] in boost_ids:
+                score += PLATFORM_BOOST
 
-        games = self.registry.games
-        lowers = self.registry.lowers
+            key = (score, -len(title), -i)
+            if len(heap) < k:
+                heappush(heap, key)
+            elif key > heap[0]:
+                heapreplace(heap, key)
 
-        matched_idx: List[int] = []
-        for i, lo in enumerate(lowers):
-            if q not in lo["game"]:
-                continue
-            if platform and platform not in lo["platform"]:
-                continue
-            matched_idx.append(i)
+            if count != "exact" and len(heap) == k and heap[0][0] >= best:
+                nxt = next(matches, None)
+                if nxt is None:
+                    break
+                return self._ordered(heap), seen + 1, nxt, True
 
-        total = len(matched_idx)
-        slice_idx = matched_idx[offset : offset + limit]
-        items = [games[i] for i in slice_idx]
+        return self._ordered(heap), seen, last, False
 
-        return {"total": total, "items": items, "limit": limit, "offset": offset}
+    @staticmethod
+    def _ordered(heap: List[Tuple[int, int, int]]) -> List[int]:
+        return [-i for _score, _len, i in sorted(heap, reverse=True)]
@@ -0,0 +1,475 @@
+# apps/games/services/snapshot.py
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .registry import GameRegistry
+
+MAGIC = b"GDBSNAP\x00"
+VERSION = 7
+
+#: lowercased projection fields stored as separate string columns.
+LOWER_FIELDS = ("game", "platform", "dev", "publisher", "year")
+_PROJ_KEYS = LOWER_FIELDS[:-1]
+
+_ALIGN = 8
+_U32 = struct.Struct("<I")
+
+
+class SnapshotError(Exception):
+    """
+    raised when a snapshot file is missing, truncated or incompatible.
+    """
+
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+
+def _u32(values: Iterable[int]) -> bytes:
+    return array("I", values).tobytes()
+
+
+def _strings(values: Iterable[str]) -> bytes:
+    """
+    encode strings as [count][offsets...][utf-8 data].
+    """
+    blobs = [v.encode("utf-8") for v in values]
+    offsets = [0]
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+    return _U32.pack(len(blobs)) + _u32(offsets) + b"".join(blobs)
+
+
+class StringTable(Sequence):
+    """
+    read-only view over a strings section of a snapshot.
+
+    `mm` is the buffer the section lives in (the snapshot mapping, or the
+    bytes of an in-memory table); it is searched directly by `iter_find`.
+    """
+
+    def __init__(
+        self, buf: memoryview, mm: Optional[Union[mmap.mmap, bytes]] = None, start: int = 0
+    ) -> None:
+        (n,) = _U32.unpack_from(buf, 0)
+        self._n = n
+        self._offsets = buf[4 : 4 + 4 * (n + 1)].cast("I")
+        self._data = buf[4 + 4 * (n + 1) :]
+        self._mm = mm
+        self._data_start = start + 4 + 4 * (n + 1)
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "StringTable":
+        """Build an in-memory table: all strings in one contiguous utf-8 buffer."""
+        data = _strings(values)
+        return cls(memoryview(data), data, 0)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def raw(self, i: int) -> bytes:
+        """Return utf-8 bytes of the i-th string."""
+        return bytes(self._data[self._offsets[i] : self._offsets[i + 1]])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self.raw(i).decode("utf-8")
+
+    def estimate_matches(self, needle: str, sample: int = 1 << 16) -> int:
+        """
+        estimate how many strings contain `needle` from its frequency in the
+        first `sample` bytes of the buffer.
+        """
+        if self._mm is None or not self._n:
+            return self._n
+        nb = needle.encode("utf-8")
+        size = self._offsets[self._n]
+        hits = self._mm.count(nb, self._data_start, self._data_start + min(sample, size))
+        return min(self._n, hits * size // max(1, min(sample, size)))
+
+    def iter_find(self, needle: str) -> Iterator[int]:
+        """
+        yield increasing indices of strings containing `needle`.
+
+        searches the contiguous data buffer with `find` instead of decoding
+        every string. a hit is mapped to its string by stepping to the next
+        string or, after a longer jump, by binary search over the offsets.
+        """
+        if self._mm is None:
+            yield from (i for i, v in enumerate(self) if needle in v)
+            return
+
+        nb = needle.encode("utf-8")
+        m = len(nb)
+        find = self._mm.find
+        base = self._data_start
+        offsets = self._offsets
+        end = base + offsets[self._n]
+
+        i = 0
+        pos = find(nb, base, end)
+        while pos != -1:
+            rel = pos - base
+            stop = offsets[i + 1]
+            if rel >= stop:
+                i = bisect_right(offsets, rel, i + 1) - 1
+                stop = offsets[i + 1]
+            if rel + m <= stop:
+                yield i
+                i += 1
+                pos = find(nb, base + stop, end)
+            else:
+                pos = find(nb, pos + 1, end)
+
+
+class PostingLists(Sequence):
+    """
+    positional view over posting lists stored as offsets + ids sections.
+    """
+
+    def __init__(self, offsets: memoryview, ids: memoryview) -> None:
+        self._offsets = offsets
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._ids[self._offsets[i] : self._offsets[i + 1]]
+
+
+def _find_key(keys: StringTable, key: str) -> int:
+    """
+    binary search `key` in a table sorted by utf-8 bytes, -1 if missing.
+    """
+    k = key.encode("utf-8")
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keys.raw(mid) < k:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(keys) and keys.raw(lo) == k:
+        return lo
+    return -1
+
+
+class PostingMap(Mapping):
+    """
+    read-only key -> sorted record ids mapping stored in a snapshot.
+
+    keys are sorted by their utf-8 bytes and looked up with binary search,
+    so opening a snapshot does not build any python dict.
+    """
+
+    def __init__(self, keys: StringTable, lists: PostingLists) -> None:
+        self._keys = keys
+        self._lists = lists
+
+    def _find(self, key: str) -> int:
+        return _find_key(self._keys, key)
+
+    def __getitem__(self, key: str) -> memoryview:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._lists[i]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class KeyIndex(Mapping):
+    """
+    read-only unique key -> record index mapping stored in a snapshot.
+    """
+
+    def __init__(self, keys: StringTable, values: Sequence[int]) -> None:
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> int:
+        i = _find_key(self._keys, key) if isinstance(key, str) else -1
+        if i < 0:
+            raise KeyError(key)
+        return self._values[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class JsonRows(Sequence):
+    """
+    sequence of raw game records decoded from json on access.
+    """
+
+    def __init__(self, table: StringTable) -> None:
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return json.loads(self._table[i])
+
+
+class LowerRow(Mapping):
+    """
+    lazy lowercased projection of a single record.
+    """
+
+    __slots__ = ("_cols", "_i")
+
+    def __init__(self, cols: Dict[str, Sequence], i: int) -> None:
+        self._cols = cols
+        self._i = i
+
+    def __getitem__(self, key: str) -> str:
+        if key == "blob":
+            return " | ".join(self._cols[f][self._i] for f in LOWER_FIELDS)
+        if key not in _PROJ_KEYS:
+            raise KeyError(key)
+        return self._cols[key][self._i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_PROJ_KEYS + ("blob",))
+
+    def __len__(self) -> int:
+        return len(_PROJ_KEYS) + 1
+
+
+class LowerRows(Sequence):
+    """
+    sequence of lazy lowercased projections backed by string columns.
+    """
+
+    def __init__(self, cols: Dict[str, Sequence]) -> None:
+        self._cols = cols
+        self._n = len(cols["game"])
+
+    def __len__(self) -> int:
+        return self._n
+
+    def column(self, name: str) -> Sequence:
+        """
+        return all values of lowercased field `name`.
+        """
+        return self._cols[name]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return LowerRow(self._cols, i)
+
+
+def _postings(
+    name: str, keys: Sequence[str], lists: Iterable[Sequence[int]]
+) -> List[Tuple[str, bytes]]:
+    """
+    encode sorted keys and their posting lists as three sections.
+    """
+    offsets = [0]
+    ids = array("I")
+    for p in lists:
+        ids.extend(p)
+        offsets.append(len(ids))
+    return [
+        (f"{name}.keys", _strings(keys)),
+        (f"{name}.offsets", _u32(offsets)),
+        (f"{name}.ids", ids.tobytes()),
+    ]
+
+
+def write_snapshot(registry: "GameRegistry", path: Path, *, sources: Dict[str, Any]) -> int:
+    """
+    serialize a loaded registry into a snapshot file and return its size.
+
+    the file is written next to `path` and atomically renamed over it, so
+    processes that still map the previous snapshot keep a valid view.
+    """
+    games = registry.games
+    lowers = registry.lowers
+
+    sections: List[Tuple[str, bytes]] = [
+        (
+            "records",
+            _strings(json.dumps(g, ensure_ascii=False, separators=(",", ":")) for g in games),
+        ),
+    ]
+    for f in LOWER_FIELDS:
+        if f == "year":
+            col = (str(g.get("Year", "")) for g in games)
+        else:
+            col = (lo[f] for lo in lowers)
+        sections.append((f"lower.{f}", _strings(col)))
+
+    sections.append(("titles.order", _u32(registry.title_order)))
+    sections.append(("titles.rank", _u32(registry.title_rank)))
+
+    index = registry.ngram_index
+    keys = sorted(index)
+    sections += _postings("ngram", keys, (index[k] for k in keys))
+    sections += _postings("tokens", registry.vocab, registry.token_postings)
+    sections.append(("fuzzy.deletes", registry.fuzzy_index.tobytes()))
+    sections += _postings("platforms", registry.platform_names, registry.platform_postings)
+    sections.append(("platforms.col", registry.platform_col.tobytes()))
+    ids = registry.ids
+    by_id = sorted(range(len(ids)), key=lambda i: ids[i].encode("utf-8"))
+    sections.append(("ids", _strings(ids)))
+    sections.append(("ids.keys", _strings(ids[i] for i in by_id)))
+    sections.append(("ids.index", _u32(by_id)))
+    for f, names in registry.field_names.items():
+        sections += _postings(f, names, registry.field_postings[f])
+    sections.append(("years.order", _u32(registry.year_order)))
+    sections.append(("years.values", _u32(registry.year_values)))
+
+    toc: Dict[str, List[int]] = {}
+    pos = 0
+    for name, payload in sections:
+        toc[name] = [pos, len(payload)]
+        pos += len(payload) + _pad(len(payload))
+
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "byteorder": sys.byteorder,
+            "count": len(games),
+            "fingerprint": registry.fingerprint,
+            "sources": sources,
+            "sections": toc,
+        }
+    ).encode("utf-8")
+    prefix = MAGIC + _U32.pack(len(header)) + header
+    prefix += b"\0" * _pad(len(prefix))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(prefix)
+        for _name, payload in sections:
+            f.write(payload)
+            f.write(b"\0" * _pad(len(payload)))
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+def _identity(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class Snapshot:
+    """
+    read-only memory-mapped snapshot of the games registry.
+
+    the file is mapped with MAP_SHARED semantics, so every process that
+    opens the same snapshot shares its pages through the os page cache.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        try:
+            with self.path.open("rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._stat = _identity(os.fstat(f.fileno()))
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"cannot map snapshot {self.path}: {e}") from e
+
+        buf = memoryview(self._mm)
+        if bytes(buf[: len(MAGIC)]) != MAGIC:
+            raise SnapshotError(f"{self.path} is not a games snapshot")
+
+        (hlen,) = _U32.unpack_from(buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header: Dict[str, Any] = json.loads(bytes(buf[start : start + hlen]))
+        if self.header.get("version") != VERSION:
+            raise SnapshotError(f"unsupported snapshot version {self.header.get('version')}")
+        if self.header.get("byteorder") != sys.byteorder:
+            raise SnapshotError("snapshot was built on a platform with another byte order")
+
+        base = start + hlen
+        base += _pad(base)
+        self._buf = buf
+        self._base = base
+
+    def _section(self, name: str) -> memoryview:
+        try:
+            off, length = self.header["sections"][name]
+        except KeyError as e:
+            raise SnapshotError(f"snapshot has no section {name!r}") from e
+        return self._buf[self._base + off : self._base + off + length]
+
+    def strings(self, name: str) -> StringTable:
+        """Return strings section `name` as a sequence."""
+        off = self.header["sections"].get(name, [0])[0]
+        return StringTable(self._section(name), self._mm, self._base + off)
+
+    def u32(self, name: str) -> memoryview:
+        """Return u32 section `name` as an integer memoryview."""
+        return self._section(name).cast("I")
+
+    def u64(self, name: str) -> memoryview:
+        """Return u64 section `name` as an integer memoryview."""
+        return self._section(name).cast("Q")
+
+    def posting_lists(self, name: str) -> PostingLists:
+        """Return posting lists stored under prefix `name` by position."""
+        return PostingLists(self.u32(f"{name}.offsets"), self.u32(f"{name}.ids"))
+
+    def postings(self, name: str) -> PostingMap:
+        """Return posting lists stored under prefix `name` by key."""
+        return PostingMap(self.strings(f"{name}.keys"), self.posting_lists(name))
+
+    def is_stale(self) -> bool:
+        """
+        check whether the file at `path` was replaced since it was mapped.
+        """
+        try:
+            return _identity(os.stat(self.path)) != self._stat
+        except OSError:
+            return False
+
+    @property
+    def count(self) -> int:
+        """Return number of records in snapshot."""
+        return int(self.header.get("count", 0))
+
+    @property
+    def size(self) -> int:
+        """Return snapshot size in bytes."""
+        return len(self._mm)
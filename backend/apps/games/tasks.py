@@ -1,49 +1,108 @@
 from __future__ import annotations
 
-from celery import shared_task
-from django.db import transaction
-from django.utils import timezone
+import logging
+from typing import List, Optional, Tuple
 
-from apps.games.models import PriceChartingConnect
+from celery import chord, shared_task
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from apps.games.integrations.pricecharting import HTTP
+from apps.games.services.game_links import GameLinkService
 from apps.games.services.pricecharting import PricechartingService
 
+logger = logging.getLogger(__name__)
+
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+@shared_task
 def update_all_pricecharting() -> dict:
     """
     celery task for update all games in pricecharting
+
+    connects are split into id ranges of PRICECHARTING_REFRESH_CHUNK, each
+    refreshed by its own `refresh_pricecharting_chunk` so the work spreads
+    over all workers; `summarize_pricecharting_refresh` adds up the
+    chunk results once every chunk is done and then queues
+    `match_pricecharting_games` for the freshly scraped connects.
+    """
+    chunks = PricechartingService.refresh_chunks()
+    result = refresh_chord(chunks).apply_async()
+    return {"chunks": len(chunks), "summary_task_id": result.id}
+
+
+def refresh_chord(chunks: List[Tuple[Optional[str], Optional[str]]]) -> chord:
     """
+    chord refreshing every (from_id, to_id) range, then summarizing.
+    """
+    return chord(
+        [refresh_pricecharting_chunk.s(from_id, to_id) for from_id, to_id in chunks],
+        summarize_pricecharting_refresh.s(),
+    )
+
 
-    total = 0
-    ok = 0
-    failed = 0
-    failed_ids = []
+@shared_task(bind=True, acks_late=True, max_retries=3, default_retry_delay=30)
+def refresh_pricecharting_chunk(
+    self, from_id: Optional[str] = None, to_id: Optional[str] = None
+) -> dict:
+    """
+    celery task refreshing the connects of one id range
+
+    pages are fetched concurrently (PRICECHARTING_REFRESH_CONCURRENCY at
+    once, PRICECHARTING_REFRESH_DELAY seconds apart) and saved with one
+    bulk_update per PRICECHARTING_REFRESH_BATCH connects, so a crash keeps
+    the batches already written. a chunk that keeps failing reports its
+    error instead of breaking the summary. the result carries the
+    `HTTP` pool counters of the worker process that ran it.
+    """
+    try:
+        result = PricechartingService.refresh_range(from_id, to_id)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        logger.exception("pricecharting refresh chunk from_id=%s failed", from_id)
+        result = {"error": str(e)}
+    return {**result, "from_id": from_id, "to_id": to_id, "http": HTTP.stats()}
 
-    today = timezone.now().date().isoformat()
 
-    qs = PriceChartingConnect.objects.all().only(
-        "id", "url", "current", "history", "last_synced_at"
+@shared_task
+def summarize_pricecharting_refresh(results: List[dict]) -> dict:
+    """
+    celery task adding up the results of all refresh chunks, then
+    queueing the matching of connects that are still unlinked
+    """
+    summary = PricechartingService.summarize_refresh(results)
+    logger.info(
+        "pricecharting refresh done chunks=%d total=%d ok=%d failed=%d skipped=%d errors=%d",
+        summary["chunks"],
+        summary["total"],
+        summary["ok"],
+        summary["failed"],
+        summary["skipped"],
+        len(summary["errors"]),
     )
+    match_pricecharting_games.delay()
+    return summary
+
+
+@shared_task
+def match_pricecharting_games() -> dict:
+    """
+    celery task linking pricecharting connects to local gamesdb games
+
+    runs after every scheduled `update_all_pricecharting`, once the
+    connects carry a scraped title and console to match on; it can also
+    be started by hand (e.g. from the periodic tasks admin).
+    """
+    return GameLinkService.match_unlinked()
+
+
+@worker_process_init.connect
+def _reset_http_pool(**kwargs) -> None:
+    """
+    prefork children start with their own pricecharting connection pool.
+    """
+    HTTP.reset()
+
 
-    for connect in qs.iterator():
-        total += 1
-        try:
-            PricechartingService.snapshot_prices(connect=connect)
-            ok += 1
-        except Exception as e:
-            failed += 1
-            failed_ids.append(connect.id)
-
-            try:
-                with transaction.atomic():
-                    connect.refresh_from_db(fields=["history"])
-                    hist = connect.history or {}
-                    hist[today] = {"_error": str(e)[:500]}
-                    connect.history = hist
-                    connect.last_synced_at = timezone.now()
-                    connect.save(update_fields=["history", "last_synced_at", "updated_at"])
-            except Exception:
-
-                pass
-
-    return {"total": total, "ok": ok, "failed": failed, "failed_ids": failed_ids}
+@worker_process_shutdown.connect
+def _close_http_pool(**kwargs) -> None:
+    HTTP.close()
@@ -0,0 +1,113 @@
+import os
+import random
+import time
+
+import pytest
+from django.urls import reverse
+
+from apps.games.services.registry import GameRegistry, parse_year
+from apps.games.services.search import GameSearchService
+from apps.games.views.games import GameAutocompleteView
+
+GAMES = [
+    {"Game": "Super Mario Kart", "Platform": "the SNES", "Year": 1992},
+    {"Game": "Mario Kart 64", "Platform": "the N64", "Year": "1996-12-14T00:00:00.000Z"},
+    {"Game": "Mario Paint", "Platform": "the SNES", "Year": 1992},
+    {"Game": "Dr. Mario", "Platform": "NES", "Year": "TBA"},
+    {"Game": "Mario Kart: Double Dash!!", "Platform": "GameCube"},
+    {"Game": "Kart Fighter", "Platform": "NES", "Year": 1993},
+]
+
+
+@pytest.fixture
+def registry(games_registry) -> GameRegistry:
+    return games_registry(GAMES)
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (1991, 1991),
+        ("1997", 1997),
+        ("1995-12-30T23:00:00.000Z", 1995),
+        ("1987/1994", 1987),
+        ("TBA", None),
+        (None, None),
+        ("", None),
+    ],
+)
+def test_parse_year(raw, expected):
+    assert parse_year(raw) == expected
+
+
+def test_registry_complete_orders_title_prefix_first(registry: GameRegistry):
+    # titles starting with the query in title order, then word prefixes by length
+    assert registry.complete("mario") == [1, 4, 2, 3, 0]
+    assert registry.complete("MARIO   k") == [1, 4, 0]
+    assert registry.complete("kart") == [5, 1, 0, 4]
+    assert registry.complete("mario kart", limit=2) == [1, 4]
+    assert registry.complete("super k") == [0]
+    assert registry.complete("paint k") == []
+    assert registry.complete("zelda") == []
+    assert registry.complete("  ") == []
+
+
+def test_service_complete_returns_compact_rows(registry: GameRegistry):
+    service = GameSearchService(registry=registry)
+
+    assert service.complete(q="mario k", limit=2) == [
+        {"id": registry.ids[1], "title": "Mario Kart 64", "platform": "N64", "year": 1996},
+        {
+            "id": registry.ids[4],
+            "title": "Mario Kart: Double Dash!!",
+            "platform": "GameCube",
+            "year": None,
+        },
+    ]
+    assert service.complete(q="dr")[0] == {
+        "id": registry.ids[3],
+        "title": "Dr. Mario",
+        "platform": "NES",
+        "year": None,
+    }
+
+
+def test_games_autocomplete_endpoint(api_client, registry: GameRegistry, monkeypatch):
+    monkeypatch.setattr(GameAutocompleteView, "service", GameSearchService(registry=registry))
+    url = reverse("games-autocomplete")
+
+    assert api_client.get(url).status_code == 400
+
+    resp = api_client.get(url, {"q": "mario", "limit": "2"})
+    assert resp.status_code == 200
+    assert [row["title"] for row in resp.json()] == ["Mario Kart 64", "Mario Kart: Double Dash!!"]
+    assert set(resp.json()[0]) == {"id", "title", "platform", "year"}
+
+
+@pytest.mark.skipif(
+    not os.environ.get("GAMES_LATENCY_TESTS"),
+    reason="wall-clock budget, set GAMES_LATENCY_TESTS=1 to run on a quiet machine",
+)
+def test_games_autocomplete_p99_latency_on_full_dataset(api_client):
+    """
+    replay every keystroke of a sample of real titles against the endpoint.
+    """
+    url = reverse("games-autocomplete")
+    registry = GameAutocompleteView.service.registry
+    api_client.get(url, {"q": "a"})
+
+    rnd = random.Random(7)
+    titles = [registry.games[i]["Game"] for i in rnd.sample(range(len(registry.games)), 100)]
+    queries = [t[:k] for t in titles for k in range(1, min(len(t), 16) + 1) if t[:k].strip()]
+
+    latencies = []
+    for q in queries:
+        started = time.perf_counter()
+        resp = api_client.get(url, {"q": q})
+        latencies.append(time.perf_counter() - started)
+        assert resp.status_code == 200
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    assert len(registry.games) > 50_000
+    assert p99 < 0.010, f"p99 {p99 * 1000:.1f} ms over {len(latencies)} requests"
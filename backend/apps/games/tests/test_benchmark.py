@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+from django.core.management import call_command
+
+from apps.games.services.benchmark import (
+    QUERY_MIXES,
+    build_queries,
+    compare_results,
+    generate_games,
+    percentile,
+)
+from apps.games.services.registry import GameRegistry
+
+
+def test_generate_games_is_deterministic_and_loadable(tmp_path: Path):
+    paths = generate_games(tmp_path / "a", 2500, seed=3, per_file=1000)
+    again = generate_games(tmp_path / "b", 2500, seed=3, per_file=1000)
+
+    assert [p.name for p in paths] == [f"Synthetic00{n}Games.json" for n in range(3)]
+    assert [p.read_bytes() for p in paths] == [p.read_bytes() for p in again]
+
+    registry = GameRegistry()
+    assert registry.load_from_dir(tmp_path / "a")[0] == 2500
+    assert set(registry.games[0]) >= {"Game", "Year", "Dev", "Publisher", "Platform"}
+    assert len(registry.platform_names) > 5
+
+
+def test_build_queries_follows_mix(tmp_path: Path):
+    generate_games(tmp_path, 500)
+    registry = GameRegistry()
+    registry.load_from_dir(tmp_path)
+
+    queries = build_queries(registry, 200, QUERY_MIXES["mixed"], seed=1)
+    kinds = {kind for kind, _params in queries}
+    assert len(queries) == 200
+    assert kinds == set(QUERY_MIXES["mixed"])
+    assert all(len(p["q"]) <= 2 for k, p in queries if k == "short")
+    assert all(p["platform"] for k, p in queries if k == "platform")
+    assert queries == build_queries(registry, 200, QUERY_MIXES["mixed"], seed=1)
+
+
+def test_percentile_and_compare():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+    old = {"datasets": {"x": {"queries": {"short": {"p99_ms": 2.0, "qps": 100}}}}}
+    new = {"datasets": {"x": {"queries": {"short": {"p99_ms": 3.0, "qps": 100}}, "y": {}}}}
+    assert compare_results(old, new) == [
+        ("x.queries.short.p99_ms", 2.0, 3.0, 0.5),
+        ("x.queries.short.qps", 100.0, 100.0, 0.0),
+    ]
+
+
+def test_bench_games_command_writes_json(tmp_path: Path):
+    out = tmp_path / "bench.json"
+    call_command(
+        "bench_games",
+        "--no-gamesdb",
+        "--synthetic",
+        "1000",
+        "--queries",
+        "30",
+        "--mix",
+        "short",
+        "--mix",
+        "miss_heavy",
+        "--out",
+        str(out),
+        stdout=open(tmp_path / "log.txt", "w"),
+    )
+
+    data = json.loads(out.read_text())
+    result = data["datasets"]["synthetic-1000"]
+    assert result["games"] == 1000
+    assert result["load"]["json"]["games"] == 1000
+    assert result["load"]["json"]["peak_rss_mb"] > 0
+    assert set(result["queries"]) == {"short", "miss_heavy"}
+    assert {"p50_ms", "p90_ms", "p99_ms", "qps", "hit_ratio"} <= set(result["queries"]["short"])
+    assert "python" in data["environment"]
@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.games.models import Game
+from apps.games.services.db_search import DatabaseSearchBackend, import_games
+from apps.games.services.registry import game_id
+from apps.games.services.search import GameSearchService
+from apps.games.views.games import GameSearchView
+
+pytestmark = pytest.mark.django_db
+
+GAMES = [
+    {"Game": "Super Mario Bros.", "Platform": "the NES", "Year": 1985, "Dev": "Nintendo R&D4"},
+    {"Game": "Mario", "Platform": "Arcade (2 players)", "Year": "1983", "Publisher": "Nintendo"},
+    {"Game": "Dr. Mario", "Platform": "the NES", "Year": 1990, "Dev": "Nintendo R&D1"},
+    {"Game": "Super Mario World", "Platform": "the SNES", "Year": None},
+    {"Game": "Mario Kart 64", "Platform": "the N64", "Year": 1996},
+    {"Game": "Zelda", "Platform": "the NES"},
+    {"Game": 'Say "Hi"', "Platform": "Wii"},
+]
+
+
+@pytest.fixture
+def data_dir(games_dir) -> Path:
+    return games_dir(GAMES)
+
+
+@pytest.fixture
+def services(data_dir: Path, games_registry):
+    import_games(data_dir)
+    registry = games_registry()
+    return (
+        GameSearchService(registry=registry, cache_size=0),
+        GameSearchService(registry=registry, cache_size=0, backend=DatabaseSearchBackend()),
+    )
+
+
+def test_import_games_replaces_rows(data_dir: Path):
+    assert import_games(data_dir) == len(GAMES)
+    first = Game.objects.first()
+    assert (first.position, first.title_lower, first.platform_name, first.year) == (
+        0,
+        "super mario bros.",
+        "NES",
+        1985,
+    )
+    assert first.data == dict(GAMES[0], Id=game_id(GAMES[0]))
+
+    assert import_games(data_dir) == len(GAMES)
+    assert Game.objects.count() == len(GAMES)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"q": "mario"},
+        {"q": "Mario", "platform": "nes"},
+        {"q": "o k"},
+        {"q": "m"},
+        {"q": '"hi"'},
+        {"q": "mario", "limit": 2, "offset": 1},
+        {"q": "mario", "limit": 2, "count": "none"},
+        {"q": "mario", "offset": 10},
+        {"q": "mario", "facets": True},
+        {"q": "zzz"},
+        {"q": "mario", "year_from": 1984, "year_to": 1990},
+        {"q": "", "dev": "nintendo", "facets": True},
+        {"q": "nintendo", "field": "any", "publisher": "nin"},
+        {"q": "", "year_to": 1985, "count": "exact", "limit": 1},
+    ],
+)
+def test_database_backend_matches_registry(services, params):
+    registry_service, db_service = services
+    assert db_service.search_by_name(**params) == registry_service.search_by_name(**params)
+
+
+def test_database_backend_ranked_order(services):
+    registry_service, db_service = services
+
+    def titles(service, **kw):
+        return [g["Game"] for g in service.search_by_name(q="mario", ranked=True, **kw)["items"]]
+
+    assert titles(db_service) == titles(registry_service)
+    boosted = titles(db_service, boost_platform="snes")
+    assert boosted == titles(registry_service, boost_platform="snes")
+    assert boosted.index("Super Mario World") < boosted.index("Super Mario Bros.")
+
+
+def test_database_backend_fuzzy_uses_registry(services):
+    _registry_service, db_service = services
+    data = db_service.search_by_name(q="zelad", fuzzy=True)
+    assert [g["Game"] for g in data["items"]] == ["Zelda"]
+
+
+def test_games_search_endpoint_with_database_backend(api_client, services, monkeypatch):
+    _registry_service, db_service = services
+    monkeypatch.setattr(GameSearchView, "service", db_service)
+    url = reverse("games-search")
+
+    resp = api_client.get(url, {"q": "mario", "platform": "snes"})
+    assert resp.status_code == 200
+    assert [g["Game"] for g in resp.json()] == ["Super Mario World"]
+
+    etag = resp["ETag"]
+    assert etag.startswith('"db')
+    assert api_client.get(url, {"q": "mario"}, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+def test_import_games_command(data_dir: Path):
+    call_command("import_games", "--src", str(data_dir), stdout=open("/dev/null", "w"))
+    assert Game.objects.count() == len(GAMES)
@@ -0,0 +1,99 @@
+import pytest
+from django.urls import reverse
+
+from apps.games.services.fuzzy import build_delete_index, deletes, lookup, osa_distance_to
+from apps.games.services.registry import GameRegistry
+from apps.games.services.search import GameSearchService
+
+GAMES = """
+[
+  {"Game": "The Legend of Zelda: Ocarina of Time", "Platform": "N64"},
+  {"Game": "Mario Kart 64", "Platform": "N64"},
+  {"Game": "Mario Kart: Double Dash!!", "Platform": "GameCube"},
+  {"Game": "Super Mario Kart", "Platform": "SNES"},
+  {"Game": "Metroid", "Platform": "NES"}
+]
+"""
+
+
+@pytest.fixture
+def registry(games_registry) -> GameRegistry:
+    return games_registry(GAMES)
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ("kart", "kart", 0),
+        ("cart", "kart", 1),
+        ("ocarine", "ocarina", 1),
+        ("mairo", "mario", 1),
+        ("mro", "mario", 2),
+        ("zelda", "metroid", 6),
+        ("", "ab", 2),
+        ("ab", "", 2),
+        ("ab", "ba", 1),
+        ("ca", "abc", 3),
+    ],
+)
+def test_osa_distance(a, b, expected):
+    assert osa_distance_to(a)(b) == expected
+
+
+def test_deletes_depth():
+    assert deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+    assert "a" in deletes("abc", 2)
+
+
+def test_lookup_uses_delete_index():
+    vocab = ["kart", "mario", "metroid", "zelda"]
+    index = build_delete_index(vocab)
+
+    assert lookup(index, vocab.__getitem__, "cart", 1) == {0: 1}
+    assert lookup(index, vocab.__getitem__, "maroi", 2) == {1: 1}
+    assert lookup(index, vocab.__getitem__, "sonic", 2) == {}
+
+
+def test_fuzzy_matches_all_tokens(registry: GameRegistry):
+    titles = [registry.games[i]["Game"] for i, _d in registry.fuzzy_matches("mario cart")]
+    assert titles == ["Mario Kart 64", "Mario Kart: Double Dash!!", "Super Mario Kart"]
+
+    pairs = registry.fuzzy_matches("zelda ocarine")
+    assert pairs == [(0, 1)]
+
+    assert registry.fuzzy_matches("zelda kart") == []
+
+
+def test_delete_index_is_built_once_on_first_fuzzy_query(games_registry, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "apps.games.services.registry.build_delete_index",
+        lambda vocab: calls.append(vocab) or build_delete_index(vocab),
+    )
+    registry = games_registry(GAMES)
+    assert calls == []
+
+    view = registry.pinned()
+    assert [i for i, _d in view.fuzzy_matches("mairo kart")]
+    assert [i for i, _d in registry.fuzzy_matches("mairo kart")]
+    assert len(calls) == 1
+
+
+def test_search_by_name_fuzzy(registry: GameRegistry):
+    service = GameSearchService(registry=registry)
+
+    assert service.search_by_name(q="mario cart")["total"] == 0
+
+    result = service.search_by_name(q="Mario Cart", fuzzy=True, platform="snes")
+    assert [g["Game"] for g in result["items"]] == ["Super Mario Kart"]
+
+    result = service.search_by_name(q="mario cart", fuzzy=True, ranked=True, limit=1)
+    assert [g["Game"] for g in result["items"]] == ["Mario Kart 64"]
+    assert result["total"] == 3
+
+
+def test_games_search_fuzzy_view(api_client):
+    resp = api_client.get(reverse("games-search"), {"q": "zelda ocarine", "fuzzy": "1"})
+
+    assert resp.status_code == 200
+    assert any("Ocarina of Time" in g["Game"] for g in resp.data)
@@ -0,0 +1,131 @@
+from pathlib import Path
+
+import pytest
+from django.urls import reverse
+
+from apps.games.services.registry import GameRegistry, game_id
+from apps.games.services.search import GameSearchService
+from apps.games.views.games import GameDetailView, GameLookupView
+
+GAMES = [
+    {"Game": "Tetris", "Platform": "Game Boy", "Year": 1989},
+    {"Game": "Tetris", "Platform": "the NES", "Year": "1989-11-01T00:00:00.000Z"},
+    {"Game": "Super Mario Bros.", "Platform": "the NES", "Year": 1985},
+    {"Game": "tetris ", "Platform": "Game Boy", "Year": "1989", "Dev": "Nintendo"},
+]
+
+MORE = [
+    {"Game": "Metroid", "Platform": "NES", "Year": 1986},
+    {"Game": "Super  Mario Bros.", "Platform": "NES", "Year": 1985},
+]
+
+
+@pytest.fixture
+def data_dir(games_dir) -> Path:
+    games_dir(GAMES, "a.json")
+    return games_dir(MORE, "b.json")
+
+
+@pytest.fixture
+def registry(data_dir: Path, games_registry) -> GameRegistry:
+    return games_registry()
+
+
+def test_game_id_is_derived_from_title_platform_year_and_article():
+    gid = game_id(GAMES[0])
+    assert len(gid) == 16 and int(gid, 16) >= 0
+    assert game_id(GAMES[3]) == gid
+    assert game_id({"Game": "TETRIS", "Platform": "Game Boy", "Year": 1989, "Extra": 1}) == gid
+    assert game_id(GAMES[1]) != gid
+    assert game_id(dict(GAMES[0], Year=1990)) != gid
+    assert game_id(dict(GAMES[0], Year=None)) != gid
+    assert game_id(GAMES[2]) == game_id(MORE[1])
+
+    redlink = "https://en.wikipedia.org/w/index.php?title=Tetris&action=edit&redlink=1"
+    assert game_id(dict(GAMES[0], GameLink=redlink)) == gid
+    assert game_id(dict(GAMES[0], GameLink="https://en.wikipedia.org/wiki/Tetris")) != gid
+
+
+def test_registry_keeps_same_named_games_with_own_articles(games_registry):
+    cobra = {"Game": "Cobra", "Platform": "the Amstrad CPC", "Year": 1987}
+    rows = [
+        dict(cobra, Publisher="Ocean", GameLink="https://en.wikipedia.org/wiki/Cobra_(video_game)"),
+        dict(cobra, Publisher="Loriciels", GameLink="https://en.wikipedia.org/wiki/Cobra_(1987)"),
+        dict(cobra, Publisher="Loriciels", GameLink="https://en.wikipedia.org/wiki/Cobra_(1987)"),
+    ]
+    registry = games_registry(rows)
+
+    assert [g["Publisher"] for g in registry.games] == ["Ocean", "Loriciels"]
+    assert len(set(registry.ids)) == 2
+
+
+def test_registry_drops_duplicate_games(registry: GameRegistry):
+    assert [g["Game"] for g in registry.games] == [
+        "Tetris",
+        "Tetris",
+        "Super Mario Bros.",
+        "Metroid",
+    ]
+    assert list(registry.ids) == [g["Id"] for g in registry.games]
+    assert len(set(registry.ids)) == 4
+    assert registry.complete("metroid") == [3]
+
+
+def test_ids_survive_reorder_and_reload(registry: GameRegistry, games_registry):
+    ids = {g["Game"] + g["Platform"]: g["Id"] for g in registry.games}
+
+    reloaded = games_registry(GAMES[::-1], "a.json")
+
+    assert {g["Game"] + g["Platform"]: g["Id"] for g in reloaded.games} == {
+        "tetris Game Boy": ids["TetrisGame Boy"],
+        "Tetristhe NES": ids["Tetristhe NES"],
+        "Super Mario Bros.the NES": ids["Super Mario Bros.the NES"],
+        "MetroidNES": ids["MetroidNES"],
+    }
+
+
+def test_service_get_many_keeps_request_order(registry: GameRegistry):
+    service = GameSearchService(registry=registry)
+    ids = registry.ids
+
+    assert service.get(ids[2]) == registry.games[2]
+    assert service.get("0" * 16) is None
+    assert service.get_many([ids[3], "nope", ids[0]]) == [
+        registry.games[3],
+        None,
+        registry.games[0],
+    ]
+
+
+def test_game_detail_endpoint(api_client, registry: GameRegistry, monkeypatch):
+    monkeypatch.setattr(GameDetailView, "service", GameSearchService(registry=registry))
+    gid = registry.ids[2]
+
+    resp = api_client.get(reverse("games-detail", kwargs={"game_id": gid}))
+    assert resp.status_code == 200
+    assert resp.json() == registry.games[2]
+
+    etag = resp["ETag"]
+    again = api_client.get(
+        reverse("games-detail", kwargs={"game_id": gid}), HTTP_IF_NONE_MATCH=etag
+    )
+    assert again.status_code == 304
+
+    missing = api_client.get(reverse("games-detail", kwargs={"game_id": "0" * 16}))
+    assert missing.status_code == 404
+
+
+def test_game_lookup_endpoint(api_client, registry: GameRegistry, monkeypatch):
+    monkeypatch.setattr(GameLookupView, "service", GameSearchService(registry=registry))
+    url = reverse("games-lookup")
+    ids = registry.ids
+
+    assert api_client.get(url).status_code == 400
+    assert api_client.get(url, {"ids": " , "}).status_code == 400
+    assert api_client.get(url, {"ids": ",".join(f"{n:016x}" for n in range(101))}).status_code == (
+        400
+    )
+
+    resp = api_client.get(url, {"ids": f"{ids[3]},{'0' * 16},{ids[0]},{ids[3]}"})
+    assert resp.status_code == 200
+    assert [g["Id"] for g in resp.json()] == [ids[3], ids[0]]
@@ -0,0 +1,207 @@
+from pathlib import Path
+
+import pytest
+from django.urls import reverse
+
+from apps.collection.models import Collection, Item
+from apps.games.integrations.pricecharting.client import PricechartingClient
+from apps.games.models import GamePriceChartingLink, PriceChartingConnect
+from apps.games.services.game_links import GameLinkService, connect_platform, connect_title
+from apps.games.services.registry import GameRegistry
+from apps.games.services.search import GameSearchService
+from apps.games.views.games import GameSearchView
+
+pytestmark = pytest.mark.django_db
+
+GAMES = [
+    {"Game": "Super Mario World", "Platform": "the SNES", "Year": 1990},
+    {"Game": "Super Mario World", "Platform": "GameBoy Advance", "Year": 2001},
+    {"Game": "Super Mario Kart", "Platform": "the SNES", "Year": 1992},
+    {"Game": "Chrono Trigger", "Platform": "the SNES", "Year": 1995},
+]
+
+SMW_URL = "https://www.pricecharting.com/game/super-nintendo/super-mario-world"
+
+
+@pytest.fixture
+def service(games_registry, monkeypatch) -> GameSearchService:
+    service = GameSearchService(registry=games_registry(GAMES), cache_size=0)
+    monkeypatch.setattr(GameLinkService, "search", service)
+    return service
+
+
+def make_connect(url: str, title: str, platform: str, **prices) -> PriceChartingConnect:
+    return PriceChartingConnect.objects.create(
+        url=url,
+        current={"title": title, "platform": platform, "url": url, "prices": prices},
+    )
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("Super Nintendo", "snes"),
+        ("PAL Super Nintendo", "snes"),
+        ("JP Super Famicom", "snes"),
+        ("Playstation 2", "playstation 2"),
+        ("", ""),
+    ],
+)
+def test_connect_platform(raw, expected):
+    assert connect_platform(raw) == expected
+
+
+def test_connect_title():
+    assert connect_title("Super Mario World Super Nintendo", "Super Nintendo") == (
+        "Super Mario World"
+    )
+    assert connect_title("Chrono Trigger [Limited Edition]", "") == "Chrono Trigger"
+    assert connect_title("  Metroid  ") == "Metroid"
+
+
+def test_match_unlinked_links_confident_matches(service: GameSearchService):
+    make_connect(SMW_URL, "Super Mario World Super Nintendo", "Super Nintendo", loose=20)
+    make_connect("https://www.pricecharting.com/game/x/zelda", "Zelda", "Super Nintendo")
+    PriceChartingConnect.objects.create(url="https://www.pricecharting.com/game/x/empty")
+
+    assert GameLinkService.match_unlinked(batch_size=1) == {"total": 2, "linked": 1}
+
+    link = GamePriceChartingLink.objects.get()
+    assert link.game_id == service.registry.ids[0]
+    assert (link.title, link.platform, link.source) == (
+        "Super Mario World",
+        "the SNES",
+        GamePriceChartingLink.SOURCE_MATCH,
+    )
+    assert link.connect.url == SMW_URL
+
+    assert GameLinkService.match_unlinked() == {"total": 1, "linked": 0}
+
+
+def test_match_unlinked_is_stable_for_regional_listings(service: GameSearchService):
+    make_connect(SMW_URL, "Super Mario World", "Super Nintendo", loose=20)
+    make_connect(SMW_URL + "-pal", "Super Mario World", "PAL Super Nintendo", loose=30)
+
+    assert GameLinkService.match_unlinked() == {"total": 2, "linked": 1}
+    first = GamePriceChartingLink.objects.get()
+
+    assert GameLinkService.match_unlinked() == {"total": 1, "linked": 0}
+    link = GamePriceChartingLink.objects.get()
+    assert (link.connect_id, link.updated_at) == (first.connect_id, first.updated_at)
+
+
+def test_match_unlinked_loads_registry_when_not_autoloaded(
+    games_dir, tmp_path: Path, settings, monkeypatch
+):
+    settings.GAMES_DB_SNAPSHOT = tmp_path / "missing.snap"
+    settings.GAMES_DB_DIR = games_dir(GAMES)
+    registry = GameRegistry()
+    monkeypatch.setattr(
+        GameLinkService, "search", GameSearchService(registry=registry, cache_size=0)
+    )
+    make_connect(SMW_URL, "Super Mario World", "Super Nintendo")
+
+    assert GameLinkService.match_unlinked() == {"total": 1, "linked": 1}
+    assert registry.loaded
+
+
+def test_matcher_never_replaces_bound_link(service: GameSearchService):
+    game = service.registry.games[0]
+    bound = make_connect(SMW_URL, "Super Mario World", "Super Nintendo")
+    other = make_connect(SMW_URL + "-pal", "Super Mario World", "PAL Super Nintendo")
+
+    GameLinkService.link(game=game, connect=bound, source=GamePriceChartingLink.SOURCE_BIND)
+    GameLinkService.link(game=game, connect=other, source=GamePriceChartingLink.SOURCE_MATCH)
+    assert GamePriceChartingLink.objects.get().connect == bound
+
+    GameLinkService.link(game=game, connect=other, source=GamePriceChartingLink.SOURCE_BIND)
+    assert GamePriceChartingLink.objects.get().connect == other
+
+
+def test_bind_links_picked_game(auth_client, user, service: GameSearchService, monkeypatch):
+    def fake_item_details(token: str):
+        return {
+            "title": "Super Mario World GameBoy Advance",
+            "platform": "GameBoy Advance",
+            "url": token,
+            "prices": {"loose": 15},
+        }
+
+    monkeypatch.setattr(PricechartingClient, "item_details", staticmethod(fake_item_details))
+    collection = Collection.objects.create(owner=user, name="Games")
+    item = Item.objects.create(collection=collection, name="SMW")
+    url = reverse("pricecharting-connect-bind")
+
+    resp = auth_client.post(url, {"item_id": str(item.id), "url": SMW_URL, "game_id": "0" * 16})
+    assert resp.status_code == 400
+
+    game_id = service.registry.ids[2]
+    resp = auth_client.post(url, {"item_id": str(item.id), "url": SMW_URL, "game_id": game_id})
+    assert resp.status_code == 200
+    link = GamePriceChartingLink.objects.get()
+    assert (link.game_id, link.source) == (game_id, GamePriceChartingLink.SOURCE_BIND)
+
+    link.delete()
+    item2 = Item.objects.create(collection=collection, name="SMW GBA")
+    gba_url = SMW_URL.replace("super-nintendo", "gameboy-advance")
+    resp = auth_client.post(url, {"item_id": str(item2.id), "url": gba_url})
+    assert resp.status_code == 200
+    link = GamePriceChartingLink.objects.get()
+    assert (link.game_id, link.source) == (service.registry.ids[1], "match")
+
+
+def test_search_carries_linked_prices_without_scraping(
+    api_client, service: GameSearchService, monkeypatch
+):
+    def no_http(*args, **kwargs):
+        raise AssertionError("no outbound request expected")
+
+    monkeypatch.setattr(PricechartingClient, "item_details", staticmethod(no_http))
+    monkeypatch.setattr(PricechartingClient, "search", staticmethod(no_http))
+    monkeypatch.setattr(GameSearchView, "service", service)
+    connect = make_connect(SMW_URL, "Super Mario World", "Super Nintendo", loose=20)
+    GameLinkService.link(
+        game=service.registry.games[0], connect=connect, source=GamePriceChartingLink.SOURCE_BIND
+    )
+    url = reverse("games-search")
+
+    plain = api_client.get(url, {"q": "mario world"})
+    assert "pricecharting" not in plain.json()[0]
+
+    resp = api_client.get(url, {"q": "mario world", "pricecharting": "1"})
+    assert resp.status_code == 200
+    first, second = resp.json()
+    assert first["pricecharting"]["url"] == SMW_URL
+    assert first["pricecharting"]["prices"] == {"loose": 20}
+    assert second["pricecharting"] is None
+    assert resp["ETag"] != plain["ETag"]
+
+    etag = resp["ETag"]
+    connect.current = dict(connect.current, prices={"loose": 25})
+    connect.save()
+    again = api_client.get(url, {"q": "mario world", "pricecharting": "1"}, HTTP_IF_NONE_MATCH=etag)
+    assert again.status_code == 200
+    assert again.json()[0]["pricecharting"]["prices"] == {"loose": 25}
+
+
+def test_search_etag_reads_link_version_once(api_client, service: GameSearchService, monkeypatch):
+    monkeypatch.setattr(GameSearchView, "service", service)
+    version = GameLinkService.version
+    calls = []
+
+    def counted():
+        calls.append(1)
+        return version()
+
+    monkeypatch.setattr(GameLinkService, "version", staticmethod(counted))
+    url = reverse("games-search")
+
+    resp = api_client.get(url, {"q": "mario world", "pricecharting": "1"})
+    assert resp.status_code == 200
+    assert len(calls) == 1
+
+    again = api_client.get(
+        url, {"q": "mario world", "pricecharting": "1"}, HTTP_IF_NONE_MATCH=resp["ETag"]
+    )
+    assert again.status_code == 304
+    assert len(calls) == 2
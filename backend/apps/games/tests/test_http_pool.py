@@ -0,0 +1,126 @@
+import importlib.util
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from apps.games.integrations.pricecharting import client as client_module
+from apps.games.integrations.pricecharting import http as http_module
+from apps.games.integrations.pricecharting.client import PricechartingClient
+from apps.games.integrations.pricecharting.http import SharedHttpClient, client_options
+
+PAGE = b"""<html><body>
+<h1>Super Mario World <a href="/console/super-nintendo">Super Nintendo</a></h1>
+<td>Loose Price</td><td>$20.50</td>
+</body></html>"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = SharedHttpClient()
+    yield pool
+    pool.close()
+
+
+def test_client_options_follow_settings(settings):
+    settings.PRICECHARTING_HTTP_MAX_CONNECTIONS = 3
+    settings.PRICECHARTING_HTTP_MAX_KEEPALIVE = 2
+
+    options = client_options()
+
+    assert options["limits"].max_connections == 3
+    assert options["limits"].max_keepalive_connections == 2
+    assert options["follow_redirects"] is True
+
+
+def test_shared_client_reuses_connections(server: str, pool: SharedHttpClient):
+    client = pool.get()
+    for _ in range(3):
+        assert client.get(server + "/game/x").status_code == 200
+
+    assert pool.get() is client
+    stats = pool.stats()
+    assert (stats["requests"], stats["misses"], stats["hits"], stats["clients"]) == (3, 1, 2, 1)
+    assert stats["hit_ratio"] == 0.667
+
+
+def test_shared_client_keeps_existing_trace(server: str, pool: SharedHttpClient):
+    events = []
+    resp = pool.get().get(server, extensions={"trace": lambda name, info: events.append(name)})
+
+    assert resp.status_code == 200
+    assert "connection.connect_tcp.started" in events
+    assert pool.stats()["misses"] == 1
+
+
+def test_shared_client_is_rebuilt_after_fork(pool: SharedHttpClient, monkeypatch):
+    parent = pool.get()
+    closed = []
+    monkeypatch.setattr(parent, "close", lambda: closed.append(True))
+
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    child = pool.get()
+
+    assert child is not parent and not closed
+    assert pool.stats()["clients"] == 2
+
+
+def test_close_and_reset(pool: SharedHttpClient):
+    first = pool.get()
+    pool.close()
+    assert first.is_closed
+
+    second = pool.get()
+    pool.reset()
+    assert not second.is_closed
+    assert pool.get() is not second
+
+
+def test_missing_h2_falls_back_to_http11(pool: SharedHttpClient, settings, monkeypatch):
+    settings.PRICECHARTING_HTTP2 = True
+    warnings = []
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    monkeypatch.setattr(http_module.logger, "warning", lambda msg, *a: warnings.append(msg))
+
+    assert isinstance(pool.get(), httpx.Client)
+    assert warnings == ["PRICECHARTING_HTTP2 is set but the h2 package is missing"]
+
+
+def test_pricecharting_client_uses_shared_pool(server: str, pool: SharedHttpClient, monkeypatch):
+    monkeypatch.setattr(client_module, "HTTP", pool)
+
+    first = PricechartingClient.item_details(server + "/game/super-nintendo/super-mario-world")
+    PricechartingClient.item_details(server + "/game/super-nintendo/super-mario-world")
+
+    assert first["title"].startswith("Super Mario World")
+    assert str(first["prices"]["loose"]) == "20.50"
+    assert not pool.get().is_closed
+    assert pool.stats()["hits"] == 1
@@ -0,0 +1,74 @@
+import pytest
+from django.urls import reverse
+
+from apps.games.services.registry import game_id
+from apps.games.services.search import GameSearchService, match_confidence
+from apps.games.views.games import GameMatchView
+
+GAMES = [
+    {"Game": "Tetris", "Platform": "Game Boy"},
+    {"Game": "Tetris", "Platform": "the NES"},
+    {"Game": "Super Mario Bros.", "Platform": "the NES"},
+    {"Game": "The Legend of Zelda: Ocarina of Time", "Platform": "the N64"},
+    {"Game": "Tetris Attack", "Platform": "the SNES"},
+]
+
+
+def _stored(rec):
+    return dict(rec, Id=game_id(rec))
+
+
+@pytest.fixture
+def service(games_registry) -> GameSearchService:
+    return GameSearchService(registry=games_registry(GAMES))
+
+
+def test_match_confidence():
+    assert match_confidence("super mario bros.", "Super Mario Bros".lower()) == 1.0
+    assert 0.5 < match_confidence("tetris attack", "tetris") < 1.0
+    assert match_confidence("tetris", "") == 0.0
+
+
+def test_match_many_picks_best_row_per_title(service: GameSearchService):
+    rows = [
+        {"title": "Tetris", "platform": "NES"},
+        {"title": "tetris"},
+        {"title": "Super Mario Bros", "platform": "NES"},
+        {"title": "Zelda Ocarina of Tme", "platform": "N64"},
+        {"title": "Tetris", "platform": "Dreamcast"},
+        {"title": "Sonic", "platform": "Genesis"},
+        {"title": "  "},
+        {"title": "Tetris", "platform": "NES"},
+    ]
+    out = service.match_many(rows)
+
+    ids = service.registry.ids
+    assert [r["id"] for r in out] == [ids[1], ids[0], ids[2], ids[3], ids[0], None, None, ids[1]]
+    assert out[0] == {"id": game_id(GAMES[1]), "match": _stored(GAMES[1]), "confidence": 1.0}
+    assert out[1]["confidence"] == 1.0
+    assert out[2]["confidence"] == 1.0
+    assert 0.5 < out[3]["confidence"] < 1.0
+    assert out[4]["confidence"] == 0.75
+    assert out[5] == {"id": None, "match": None, "confidence": 0.0}
+    assert out[0] == out[7] and out[0] is not out[7]
+
+
+def test_games_match_endpoint(api_client, service: GameSearchService, monkeypatch):
+    monkeypatch.setattr(GameMatchView, "service", service)
+    url = reverse("games-match")
+
+    assert api_client.post(url, {}, format="json").status_code == 400
+    assert api_client.post(url, {"items": []}, format="json").status_code == 400
+    too_many = [{"title": "Tetris"}] * 1001
+    assert api_client.post(url, {"items": too_many}, format="json").status_code == 400
+
+    resp = api_client.post(
+        url,
+        {"items": [{"title": "Tetris Attack", "platform": "SNES"}, {"title": "Sonic"}]},
+        format="json",
+    )
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"id": game_id(GAMES[4]), "match": _stored(GAMES[4]), "confidence": 1.0},
+        {"id": None, "match": None, "confidence": 0.0},
+    ]
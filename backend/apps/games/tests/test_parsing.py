@@ -0,0 +1,146 @@
+import json
+import os
+from dataclasses import asdict
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from apps.games.integrations.pricecharting import parsing
+from apps.games.integrations.pricecharting.bench import measure_parsing, measure_price_extraction
+from apps.games.integrations.pricecharting.client import PricechartingClient
+from apps.games.integrations.pricecharting.stub import item_page, search_page
+
+PAGES = Path(__file__).parent / "pages"
+SMW_URL = "https://www.pricecharting.com/game/super-nintendo/super-mario-world"
+
+
+def read(name: str) -> str:
+    return (PAGES / name).read_text(encoding="utf-8")
+
+
+def golden_parse(page: Path, url: str):
+    html = page.read_text(encoding="utf-8")
+    if page.stem.startswith("search"):
+        data = [asdict(i) for i in PricechartingClient.parse_search(html, "", "all", 100)]
+    else:
+        data = PricechartingClient.parse_item_details(url, html)
+    return json.loads(json.dumps(data, default=str))
+
+
+@pytest.mark.parametrize("page", sorted(PAGES.glob("*.html")), ids=lambda p: p.stem)
+def test_saved_pages_match_golden_files(page: Path):
+    """
+    each saved page has a .json next to it with the expected parse;
+    run with UPDATE_GOLDEN=1 to rewrite them after a deliberate change.
+    """
+    golden = page.with_suffix(".json")
+    url = "" if page.stem.startswith("search") else json.loads(golden.read_text())["url"]
+    data = golden_parse(page, url)
+    if os.environ.get("UPDATE_GOLDEN"):
+        golden.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    assert data == json.loads(golden.read_text(encoding="utf-8"))
+
+
+def test_fragments_follow_nesting():
+    html = (
+        '<div id="a"><div><table id="t"><tr><td><table><tr><td>x</td></tr></table>'
+        "</td></tr></table></div></div><table id='t2'><tr><td>y</td></tr>"
+    )
+    parts = parsing.fragments(html, "t", "a", "t2", "missing")
+
+    assert parts["t"].startswith('<table id="t">') and parts["t"].endswith(
+        "</table></td></tr></table>"
+    )
+    assert parts["a"] == html[: html.index("<table id='t2'>")]
+    assert set(parts) == {"t", "a"}
+
+
+def test_text_snippet_drops_markup():
+    html = "<html><head><script>var x = 1;</script></head><body><p>Fish &amp; <b>chips</b></p>"
+    assert parsing.text_snippet(html) == "Fish & chips"
+
+
+def test_unknown_parser_setting_falls_back(settings, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(parsing.logger, "warning", lambda *args: warnings.append(args))
+    settings.PRICECHARTING_HTML_PARSER = "html5lib"
+
+    assert parsing.html_parser() in parsing.PARSERS
+    assert warnings
+
+    settings.PRICECHARTING_HTML_PARSER = "html.parser"
+    assert parsing.html_parser() == "html.parser"
+
+
+def test_parse_saved_search_page():
+    items = PricechartingClient.parse_search(read("search_mario.html"), "mario", "all", 100)
+
+    assert len(items) == 50
+    assert items[0].title == "Super Mario World"
+    assert items[0].platform == "Super Nintendo"
+    assert items[0].slug == "super-nintendo/super-mario-world"
+    assert items[21].title == "Mario & Luigi Superstar Saga"
+
+
+def test_search_without_results_table_id_uses_heuristics():
+    html = read("search_mario.html").replace('id="games_table"', 'id="results"')
+    items = PricechartingClient.parse_search(html, "mario", "all", 5)
+
+    assert [i.title for i in items] == [
+        "Super Mario World",
+        "Super Mario Bros",
+        "Super Mario Bros 3",
+        "Super Mario 64",
+        "Super Mario Kart",
+    ]
+
+    bare = '<ul><li><a href="/game/nes/metroid">Metroid</a></li></ul>'
+    assert [i.slug for i in PricechartingClient.parse_search(bare, "metroid", "all", 5)] == [
+        "nes/metroid"
+    ]
+
+
+def test_parse_saved_item_page():
+    data = PricechartingClient.parse_item_details(SMW_URL, read("item_super_mario_world.html"))
+
+    assert data["title"] == "Super Mario World Super Nintendo"
+    assert data["platform"] == "Super Nintendo"
+    assert data["prices"]["loose"] == Decimal("21.50")
+    assert data["prices"]["graded"] == Decimal("1150.00")
+
+
+def test_item_page_without_price_blocks_is_parsed_whole():
+    html = "<html><body><h1>Metroid <a href='/console/nes'>NES</a></h1>"
+    html += "<p>Loose Price $12.00</p></body></html>"
+    data = PricechartingClient.parse_item_details("https://x/game/nes/metroid", html)
+
+    assert data["platform"] == "NES"
+    assert data["prices"]["loose"] == Decimal("12.00")
+
+
+def test_stub_pages_parse_like_before():
+    items = PricechartingClient.parse_search(search_page("zelda", count=3), "zelda", "all", 10)
+    assert [i.slug for i in items] == [f"super-nintendo/zelda-{n}" for n in range(3)]
+
+    data = PricechartingClient.parse_item_details(
+        "https://x/game/super-nintendo/zelda", item_page("super-nintendo/zelda", filler=50)
+    )
+    assert data["title"].startswith("Zelda")
+    assert data["platform"] == "Super Nintendo"
+
+
+def test_measure_parsing_and_command(tmp_path: Path):
+    stats = measure_parsing({"search_mario": read("search_mario.html")}, rounds=1)
+    row = stats["pages"]["search_mario"]
+    assert stats["parser"] in parsing.PARSERS
+    assert row["kb"] > 50 and row["parse_ms"] > 0 and row["full_tree_ms"] > 0
+
+    stats = measure_price_extraction({"item": read("item_stub_zelda.html")}, rounds=1)
+    assert stats["item"]["structural_ms"] > 0
+    assert stats["item"]["differs"] == ["box_only", "cib", "graded", "manual_only", "new"]
+
+    out = tmp_path / "parse.json"
+    call_command("bench_pricecharting_parse", "--rounds", "1", "--out", str(out))
+    assert out.exists()
@@ -0,0 +1,162 @@
+import fakeredis
+import httpx
+import pytest
+import redis
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+
+from apps.games.integrations.pricecharting import (
+    LIMITER,
+    PricechartingBlocked,
+    PricechartingClient,
+    RateLimiter,
+    RateLimitExceeded,
+    lane,
+)
+from apps.games.integrations.pricecharting.ratelimit import LANE
+from apps.games.integrations.pricecharting.stub import StubServer
+from apps.games.models import PriceChartingConnect
+from apps.games.services.pricecharting import PricechartingService
+
+
+@pytest.fixture
+def limits(settings):
+    settings.PRICECHARTING_RATE = 10.0
+    settings.PRICECHARTING_RATE_BURST = 3
+    settings.PRICECHARTING_RATE_RESERVE = 1
+    settings.PRICECHARTING_RATE_MIN = 0.5
+    settings.PRICECHARTING_RATE_COOLDOWN = 0.2
+    return settings
+
+
+@pytest.fixture
+def limiter(limits, monkeypatch) -> RateLimiter:
+    """
+    the shared limiter on an in-process redis stand-in.
+    """
+    monkeypatch.setattr(LIMITER, "_client", fakeredis.FakeRedis())
+    monkeypatch.setattr(LIMITER, "_fixed", True)
+    monkeypatch.setattr(LIMITER, "_scripts", {})
+    return LIMITER
+
+
+def response(status: int = 200, text: str = "<html></html>", **headers) -> httpx.Response:
+    request = httpx.Request("GET", "https://www.pricecharting.com/game/x/y")
+    return httpx.Response(status, text=text, headers=headers, request=request)
+
+
+def test_bucket_allows_burst_then_paces(limiter: RateLimiter):
+    assert [limiter.try_acquire() for _ in range(3)] == [0, 0, 0]
+    wait = limiter.try_acquire()
+    assert 0.05 < wait <= 0.1
+
+
+def test_background_lane_leaves_reserve(limiter: RateLimiter):
+    assert limiter.try_acquire("background") == 0
+    assert limiter.try_acquire("background") == 0
+    assert limiter.try_acquire("background") > 0
+    assert limiter.try_acquire("interactive") == 0
+
+
+def test_reserve_must_leave_tokens_for_background(limiter: RateLimiter, settings):
+    settings.PRICECHARTING_RATE_RESERVE = settings.PRICECHARTING_RATE_BURST
+    with pytest.raises(ImproperlyConfigured):
+        limiter.try_acquire("background")
+    assert not limiter._is_down()
+
+
+def test_background_steps_aside_for_waiting_interactive(limiter: RateLimiter):
+    for _ in range(3):
+        limiter.try_acquire()
+    interactive = limiter.try_acquire("interactive")
+    background = limiter.try_acquire("background")
+
+    assert interactive > 0
+    assert background >= interactive
+
+
+def test_aimd_backoff(limiter: RateLimiter):
+    assert limiter.feedback(False, retry_after=5) == 5.0
+    assert 4.5 < limiter.try_acquire() <= 5
+    assert limiter.state()["blocked_for"] > 4
+
+    assert limiter.feedback(True) == pytest.approx(5.05)
+    for _ in range(5):
+        rate = limiter.feedback(False, retry_after=0)
+    assert rate == 0.5
+
+    limiter.reset()
+    assert limiter.feedback(True) == 10.0
+
+
+def test_observe_detects_push_back(limiter: RateLimiter):
+    limiter.observe(response())
+
+    with pytest.raises(PricechartingBlocked) as e:
+        limiter.observe(response(429, **{"Retry-After": "7"}))
+    assert e.value.retry_after == 7
+
+    with pytest.raises(PricechartingBlocked) as e:
+        limiter.observe(response(text="<h1>Please verify you are a human</h1>"))
+    assert e.value.retry_after == 0.2
+    assert limiter.state()["rate"] == 2.5
+
+
+def test_acquire_gives_up_after_max_wait(limiter: RateLimiter, settings):
+    settings.PRICECHARTING_RATE_MAX_WAIT = {"interactive": 1}
+    limiter.feedback(False, retry_after=30)
+
+    with pytest.raises(RateLimitExceeded) as e:
+        limiter.acquire()
+    assert e.value.retry_after > 29
+
+
+def test_lane_context():
+    assert LANE.get() == "interactive"
+    with lane("background"):
+        assert LANE.get() == "background"
+    assert LANE.get() == "interactive"
+
+
+def test_redis_outage_paces_locally(limits, monkeypatch):
+    client = redis.Redis(port=1, socket_connect_timeout=0.2)
+    limiter = RateLimiter(client=client)
+
+    assert limiter.try_acquire() == 0
+    assert 0 < limiter.try_acquire() <= 0.1
+
+    # redis is left alone until the outage window has passed
+    calls = []
+    monkeypatch.setattr(client, "evalsha", lambda *args: calls.append(args))
+    assert limiter.feedback(True) is None
+    assert calls == []
+
+    limiter._down_until = 0.0
+    limiter.feedback(True)
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_refresh_pauses_after_block_instead_of_failing(limiter: RateLimiter):
+    with StubServer(blocked=["snes/blocked"]) as stub:
+        connects = [
+            PriceChartingConnect.objects.create(url=f"{stub.url}/game/snes/game-{n}")
+            for n in range(4)
+        ]
+        connects.insert(2, PriceChartingConnect.objects.create(url=f"{stub.url}/game/snes/blocked"))
+        result = PricechartingService.refresh_many(connects, concurrency=1)
+
+    assert result["ok"] == 4
+    assert result["failed_ids"] == [str(connects[2].id)]
+    assert limiter.state()["rate"] < 10
+
+
+def test_blocked_search_answers_503(api_client, monkeypatch):
+    def blocked(**kwargs):
+        raise PricechartingBlocked("blocked", retry_after=12.5)
+
+    monkeypatch.setattr(PricechartingClient, "search", staticmethod(blocked))
+    resp = api_client.get(reverse("pricecharting-search"), {"q": "mario"})
+
+    assert resp.status_code == 503
+    assert resp["Retry-After"] == "13"
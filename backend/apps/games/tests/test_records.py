@@ -0,0 +1,61 @@
+import pytest
+
+from apps.games.services.records import ChainedRows, CodedColumn, RecordStore
+from apps.games.services.registry import game_id
+
+ROWS = [
+    {"Game": "Tetris", "Platform": "the NES", "Year": 1989, "Dev": "Nintendo"},
+    {"Game": "Doom", "Year": None, "Platform": "PC", "Tags": ["fps", "classic"]},
+    {"Game": "Pong", "Platform": "the NES", "Year": "1972"},
+    {"Game": "Tetris", "Platform": "Game Boy", "Year": 1989, "Dev": "Nintendo"},
+]
+
+
+def test_record_store_round_trips_rows():
+    store = RecordStore(coded=("Platform", "Year", "Dev"))
+    for row in ROWS:
+        store.append(row)
+
+    assert len(store) == 4
+    assert list(store) == ROWS
+    assert [list(r) for r in store] == [list(r) for r in ROWS]
+    assert store[-1] == ROWS[-1]
+    assert store[1:3] == ROWS[1:3]
+    with pytest.raises(IndexError):
+        store[4]
+
+    assert list(store.column("Dev")) == ["Nintendo", None, None, "Nintendo"]
+    assert list(store.column("Tags")) == [None, ["fps", "classic"], None, None]
+    assert list(store.column("Missing")) == [None] * 4
+
+
+def test_coded_column_shares_distinct_values():
+    col = CodedColumn()
+    for v in ["NES", "NES", 1, True, 1.0, "1", [1], [1]]:
+        col.append(v)
+
+    assert list(col) == ["NES", "NES", 1, True, 1.0, "1", [1], [1]]
+    assert type(col[3]) is bool and type(col[4]) is float
+    assert len(col.values) == 1 + 7
+
+    lowered = col.map(lambda v: str(v).lower(), "")
+    assert lowered.codes is col.codes
+    assert lowered[:3] == ["nes", "nes", "1"]
+    assert list(CodedColumn(2).map(str, "")) == ["", ""]
+
+
+def test_registry_keeps_records_column_wise(games_registry):
+    registry = games_registry(ROWS)
+
+    assert isinstance(registry.games, ChainedRows)
+    assert list(registry.games) == [dict(row, Id=game_id(row)) for row in ROWS]
+    assert registry.titles == ["tetris", "doom", "pong", "tetris"]
+    assert dict(registry.lowers[1]) == {
+        "game": "doom",
+        "platform": "pc",
+        "dev": "",
+        "publisher": "",
+        "blob": "doom | pc |  |  | None",
+    }
+    assert registry.lowers[0]["blob"] == "tetris | the nes | nintendo |  | 1989"
+    assert registry.platform_names == ["Game Boy", "PC", "the NES"]
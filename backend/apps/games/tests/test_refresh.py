@@ -0,0 +1,190 @@
+import asyncio
+import os
+import time
+from datetime import date
+
+import pytest
+
+from apps.games.integrations.pricecharting import (
+    AsyncPricechartingClient,
+    HostThrottle,
+    async_client,
+)
+from apps.games.integrations.pricecharting.bench import measure_refresh
+from apps.games.integrations.pricecharting.stub import StubServer
+from apps.games.models import PriceChartingConnect
+from apps.games.services.game_links import GameLinkService
+from apps.games.services.pricecharting import PricechartingService
+from apps.games.tasks import refresh_chord, refresh_pricecharting_chunk, update_all_pricecharting
+
+
+@pytest.fixture
+def stub():
+    with StubServer(latency=0.02, fail=["snes/broken"]) as server:
+        yield server
+
+
+def fetch_all(tokens, **kwargs):
+    async def run():
+        async with AsyncPricechartingClient(**kwargs) as api:
+            return [pair async for pair in api.item_details_many(tokens)]
+
+    return asyncio.run(run())
+
+
+def test_async_client_parses_like_blocking_client(stub: StubServer, monkeypatch):
+    monkeypatch.setattr(async_client, "BASE", stub.url)
+
+    async def run():
+        async with AsyncPricechartingClient() as api:
+            details = await api.item_details(stub.url + "/game/super-nintendo/chrono-trigger")
+            items = await api.search("mario", limit=3)
+        return details, items
+
+    details, items = asyncio.run(run())
+
+    assert details["title"].startswith("Chrono Trigger")
+    assert details["platform"] == "Super Nintendo"
+    assert details["slug"] == "super-nintendo/chrono-trigger"
+    assert details["prices"]["loose"] is not None
+    assert [i.title for i in items] == ["Mario 0", "Mario 1", "Mario 2"]
+
+
+def test_item_details_many_bounds_concurrency(stub: StubServer):
+    tokens = [f"{stub.url}/game/snes/game-{n}" for n in range(12)] + [
+        f"{stub.url}/game/snes/broken"
+    ]
+
+    results = dict(fetch_all(tokens, concurrency=3))
+
+    assert set(results) == set(tokens)
+    assert isinstance(results[tokens[-1]], Exception)
+    assert all(isinstance(results[t], dict) for t in tokens[:-1])
+    assert stub.max_in_flight == 3
+
+
+def test_host_throttle_spaces_requests():
+    async def run():
+        throttle = HostThrottle(0.05)
+        started = time.perf_counter()
+        await asyncio.gather(*(throttle.wait("a") for _ in range(4)), throttle.wait("b"))
+        return time.perf_counter() - started
+
+    assert 0.15 <= asyncio.run(run()) < 0.5
+
+
+def test_measure_refresh_reports_throughput(stub: StubServer):
+    tokens = [f"{stub.url}/game/snes/game-{n}" for n in range(8)]
+
+    serial = measure_refresh(tokens, concurrency=0)
+    concurrent = measure_refresh(tokens, concurrency=8)
+
+    assert serial["pages"] == concurrent["pages"] == 8
+    assert serial["failed"] == concurrent["failed"] == 0
+    assert concurrent["pages_per_s"] > serial["pages_per_s"] * 2
+
+
+@pytest.mark.django_db
+def test_refresh_many_writes_batches(stub: StubServer):
+    good = [
+        PriceChartingConnect.objects.create(url=f"{stub.url}/game/snes/game-{n}") for n in range(5)
+    ]
+    broken = PriceChartingConnect.objects.create(
+        url=f"{stub.url}/game/snes/broken", history={"2024-01-01": {"loose": 1}}
+    )
+    empty = PriceChartingConnect.objects.create(url="https://example.com/x")
+    empty.url = ""
+
+    result = PricechartingService.refresh_many(
+        [*good, broken, empty], concurrency=4, delay=0, batch_size=2
+    )
+
+    assert (result["total"], result["ok"], result["failed"], result["skipped"]) == (7, 5, 1, 1)
+    assert result["failed_ids"] == [str(broken.id)]
+
+    today = date.today().isoformat()
+    for connect in PriceChartingConnect.objects.filter(id__in=[c.id for c in good]):
+        assert connect.current["slug"].startswith("snes/game-")
+        assert connect.history[today] == connect.current["prices"]
+        assert connect.last_synced_at is not None
+
+    broken.refresh_from_db()
+    assert "_error" in broken.history[today]
+    assert broken.history["2024-01-01"] == {"loose": 1}
+
+
+@pytest.mark.django_db
+def test_update_all_pricecharting_task(stub: StubServer, settings):
+    settings.PRICECHARTING_REFRESH_DELAY = 0
+    settings.PRICECHARTING_REFRESH_CHUNK = 2
+    for n in range(5):
+        PriceChartingConnect.objects.create(url=f"{stub.url}/game/snes/game-{n}")
+
+    result = update_all_pricecharting.apply().get()
+
+    assert result["chunks"] == 3
+    assert PriceChartingConnect.objects.filter(last_synced_at__isnull=False).count() == 5
+
+
+@pytest.mark.django_db
+def test_refresh_chunks_cover_every_connect():
+    for n in range(5):
+        PriceChartingConnect.objects.create(url=f"https://x/game/snes/game-{n}")
+
+    chunks = PricechartingService.refresh_chunks(2)
+
+    assert chunks[0][0] is None and chunks[-1][1] is None
+    sizes = []
+    for from_id, to_id in chunks:
+        qs = PriceChartingConnect.objects.all()
+        if from_id:
+            qs = qs.filter(id__gte=from_id)
+        if to_id:
+            qs = qs.filter(id__lt=to_id)
+        sizes.append(qs.count())
+    assert sizes == [2, 2, 1]
+    assert PricechartingService.refresh_chunks(10) == [(None, None)]
+
+
+@pytest.mark.django_db
+def test_refresh_chord_summarizes_chunks(stub: StubServer, settings, monkeypatch):
+    settings.PRICECHARTING_REFRESH_DELAY = 0
+    matched = []
+    monkeypatch.setattr(
+        GameLinkService, "match_unlinked", classmethod(lambda cls: matched.append(1))
+    )
+    ok = [
+        PriceChartingConnect.objects.create(url=f"{stub.url}/game/snes/game-{n}") for n in range(3)
+    ]
+    broken = PriceChartingConnect.objects.create(url=f"{stub.url}/game/snes/broken")
+    PriceChartingConnect.objects.create(url="", current={})
+
+    summary = refresh_chord(PricechartingService.refresh_chunks(2)).apply_async().get()
+
+    assert summary["chunks"] == 3
+    assert (summary["total"], summary["ok"], summary["failed"], summary["skipped"]) == (5, 3, 1, 1)
+    assert summary["failed_ids"] == [str(broken.id)]
+    assert summary["errors"] == []
+    assert [stats["pid"] for stats in summary["http"]] == [os.getpid()]
+    assert matched == [1]
+    for connect in ok:
+        connect.refresh_from_db()
+        assert connect.last_synced_at is not None
+
+
+@pytest.mark.django_db
+def test_failing_chunk_is_reported_in_summary(monkeypatch):
+    def boom(cls, from_id=None, to_id=None):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(PricechartingService, "refresh_range", classmethod(boom))
+    monkeypatch.setattr(refresh_pricecharting_chunk, "max_retries", 0)
+
+    summary = refresh_chord([(None, "b"), ("b", None)]).apply_async().get()
+
+    assert summary["chunks"] == 2
+    assert summary["total"] == 0
+    assert summary["errors"] == [
+        {"from_id": None, "error": "database went away"},
+        {"from_id": "b", "error": "database went away"},
+    ]
@@ -0,0 +1,166 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from apps.games.services.registry import GameRegistry, source_manifest
+from apps.games.services.reloader import RegistryReloader
+from apps.games.services.search import GameSearchService
+from apps.games.services.snapshot import write_snapshot
+
+
+@pytest.fixture
+def data_dir(games_dir) -> Path:
+    games_dir([{"Game": "Super Mario Bros", "Platform": "NES"}], "nes.json", mtime_ns=10**18)
+    return games_dir(
+        [{"Game": "Super Mario World", "Platform": "SNES"}], "snes.json", mtime_ns=10**18
+    )
+
+
+def test_reload_rebuilds_only_changed_segments(data_dir: Path, games_dir, games_registry):
+    registry = games_registry()
+    version = registry.version
+    nes, snes = registry._segments["nes.json"], registry._segments["snes.json"]
+
+    assert registry.reload() is False
+    assert registry.version == version
+
+    games_dir([{"Game": "Super Mario World", "Platform": "SNES"}], "snes.json", mtime_ns=2 * 10**18)
+    assert registry.reload() is False
+    assert registry._segments["snes.json"].records is snes.records
+
+    games_dir(
+        [
+            {"Game": "Super Mario World", "Platform": "SNES"},
+            {"Game": "Mario Paint", "Platform": "SNES"},
+        ],
+        "snes.json",
+    )
+    assert registry.reload() is True
+    assert registry.version == version + 1
+    assert registry._segments["nes.json"] is nes
+    assert registry.match_title("mario") == [0, 1, 2]
+    assert registry.games[2]["Game"] == "Mario Paint"
+    assert registry.platforms() == [("SNES", 2), ("NES", 1)]
+
+    (data_dir / "nes.json").unlink()
+    assert registry.reload() is True
+    assert [g["Game"] for g in registry.games] == ["Super Mario World", "Mario Paint"]
+    assert registry.fuzzy_matches("mario paimt") == [(1, 1)]
+
+
+def test_reload_keeps_data_when_file_is_broken(data_dir: Path, games_dir, games_registry):
+    registry = games_registry()
+    version = registry.version
+
+    (data_dir / "nes.json").write_text('[{"Game": "Zelda"', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        registry.reload()
+
+    reloader = RegistryReloader(registry, interval=60)
+    assert reloader.poll() is False
+    assert registry.version == version
+    assert len(registry.games) == 2
+
+    games_dir([{"Game": "Zelda", "Platform": "NES"}], "nes.json")
+    assert reloader.poll() is True
+    assert registry.match_title("zelda") == [0]
+
+
+def test_reload_remaps_replaced_snapshot(data_dir: Path, games_dir, games_registry, tmp_path: Path):
+    path = tmp_path / "games.snap"
+    source = games_registry()
+    write_snapshot(source, path, sources=source_manifest(data_dir))
+
+    registry = GameRegistry()
+    registry.load_snapshot(path)
+    assert registry.reload() is False
+
+    games_dir([{"Game": "Metroid", "Platform": "NES"}], "nes.json")
+    source = games_registry()
+    write_snapshot(source, path, sources=source_manifest(data_dir))
+
+    assert registry.reload() is True
+    assert registry.snapshot is not None
+    assert registry.match_title("metroid") == [0]
+
+
+def test_searches_never_see_half_swapped_registry(data_dir: Path, games_dir, games_registry):
+    registry = games_registry()
+    service = GameSearchService(registry=registry)
+    small = [{"Game": "Super Mario Bros", "Platform": "NES"}]
+    big = [{"Game": f"Mario {i}", "Platform": "NES"} for i in range(300)]
+
+    stop = threading.Event()
+
+    def flip():
+        i = 0
+        while not stop.is_set():
+            games_dir(big if i % 2 else small, "nes.json")
+            registry.reload()
+            i += 1
+
+    t = threading.Thread(target=flip)
+    t.start()
+    try:
+        for _ in range(200):
+            result = service.search_by_name(q="mario", limit=1000)
+            titles = [g["Game"] for g in result["items"]]
+            assert result["total"] == len(titles)
+            assert all("Mario" in title for title in titles)
+            assert len(titles) in (2, 301)
+    finally:
+        stop.set()
+        t.join()
+
+
+def test_reloader_thread_picks_up_changes(data_dir: Path, games_dir, games_registry):
+    registry = games_registry()
+    version = registry.version
+
+    reloader = RegistryReloader(registry, interval=0.01).start()
+    try:
+        games_dir([{"Game": "Zelda", "Platform": "NES"}], "nes.json")
+        for _ in range(500):
+            if registry.version > version:
+                break
+            threading.Event().wait(0.01)
+    finally:
+        reloader.stop(timeout=5)
+
+    assert registry.version > version
+    assert registry.match_title("zelda") == [0]
+
+
+def test_reload_does_not_wait_for_running_searches(
+    data_dir: Path, games_dir, games_registry, monkeypatch
+):
+    registry = games_registry()
+    service = GameSearchService(registry=registry)
+    started, release = threading.Event(), threading.Event()
+    iter_title_matches = GameRegistry.iter_title_matches
+
+    def slow(self, *args, **kwargs):
+        started.set()
+        release.wait(5)
+        return iter_title_matches(self, *args, **kwargs)
+
+    monkeypatch.setattr(GameRegistry, "iter_title_matches", slow)
+    results = []
+    t = threading.Thread(target=lambda: results.append(service.search_by_name(q="mario")))
+    t.start()
+    try:
+        assert started.wait(5)
+        games_dir([{"Game": "Mario Paint", "Platform": "NES"}], "nes.json")
+        assert registry.reload() is True
+        assert t.is_alive()
+    finally:
+        release.set()
+        t.join()
+
+    assert [g["Game"] for g in results[0]["items"]] == ["Super Mario Bros", "Super Mario World"]
+    assert [g["Game"] for g in service.search_by_name(q="mario")["items"]] == [
+        "Mario Paint",
+        "Super Mario World",
+    ]
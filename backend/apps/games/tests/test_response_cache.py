@@ -0,0 +1,134 @@
+import pytest
+from django.urls import reverse
+
+from apps.games.integrations.pricecharting.client import PricechartingClient
+from apps.games.integrations.pricecharting.schemas import SearchItem
+from apps.games.services import response_cache as response_cache_module
+from apps.games.services.pricecharting import PricechartingService
+from apps.games.services.response_cache import RESPONSE_CACHE, ResponseCache
+
+SMW_URL = "https://www.pricecharting.com/game/super-nintendo/super-mario-world"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(response_cache_module.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def fake_item_details(token: str):
+        calls.append(token)
+        return {"title": "Super Mario World", "url": SMW_URL, "prices": {"loose": len(calls)}}
+
+    monkeypatch.setattr(PricechartingClient, "item_details", staticmethod(fake_item_details))
+    return calls
+
+
+def test_item_details_are_cached_by_page(calls):
+    first = PricechartingService.get_item_details(url=SMW_URL + "?utm=x")
+    again = PricechartingService.get_item_details(slug="super-nintendo/super-mario-world")
+
+    assert again == first
+    assert len(calls) == 1
+    assert RESPONSE_CACHE.stats()["item"] == {
+        "hit": 1,
+        "stale": 0,
+        "miss": 1,
+        "error": 0,
+        "hit_ratio": 0.5,
+    }
+
+
+def test_stale_entry_is_served_then_revalidated(calls, clock, settings):
+    settings.PRICECHARTING_CACHE_TTL = {"item": 10}
+    PricechartingService.get_item_details(url=SMW_URL)
+
+    clock.now += 11
+    stale = PricechartingService.get_item_details(url=SMW_URL)
+    assert stale["prices"] == {"loose": 1}
+    RESPONSE_CACHE.wait(timeout=5)
+    assert len(calls) == 2
+
+    fresh = PricechartingService.get_item_details(url=SMW_URL)
+    assert fresh["prices"] == {"loose": 2}
+    assert len(calls) == 2
+    assert RESPONSE_CACHE.stats()["item"]["stale"] == 1
+
+
+def test_entry_expires_after_stale_period(clock, settings):
+    settings.PRICECHARTING_CACHE_TTL = {"item": 10}
+    settings.PRICECHARTING_CACHE_STALE = {"item": 0}
+    cache = ResponseCache()
+
+    assert cache.get_or_fetch("item", ("x",), lambda: {"a": 1}) == {"a": 1}
+    clock.now += 11
+    assert cache.get_or_fetch("item", ("x",), lambda: {"a": 2}) == {"a": 2}
+    assert cache.stats()["item"]["miss"] == 2
+
+
+def test_empty_search_is_kept_briefly(monkeypatch, clock):
+    results = [
+        [],
+        [
+            SearchItem(
+                "Metroid", "NES", "ntsc", "https://x/game/nes/metroid", "nes/metroid", None, {}
+            )
+        ],
+    ]
+    monkeypatch.setattr(
+        PricechartingClient, "search", staticmethod(lambda **kwargs: results.pop(0))
+    )
+
+    assert PricechartingService.search_items(q="Metroid") == []
+    assert PricechartingService.search_items(q=" metroid ") == []
+
+    clock.now += response_cache_module.EMPTY_TTL + 1
+    assert PricechartingService.search_items(q="metroid")[0]["title"] == "Metroid"
+    RESPONSE_CACHE.wait(timeout=5)
+
+
+def test_cache_outage_falls_back_to_fetch(calls, monkeypatch):
+    tried = []
+
+    class Broken:
+        def get(self, *args, **kwargs):
+            tried.append(args)
+            raise ConnectionError("redis down")
+
+        set = add = incr = get_many = get
+
+    monkeypatch.setattr(ResponseCache, "cache", property(lambda self: Broken()))
+    monkeypatch.setattr(RESPONSE_CACHE, "_down_until", 0.0)
+
+    assert PricechartingService.get_item_details(url=SMW_URL)["prices"] == {"loose": 1}
+    assert len(tried) == 1
+    assert PricechartingService.get_item_details(url=SMW_URL)["prices"] == {"loose": 2}
+    assert len(tried) == 1
+    assert RESPONSE_CACHE.stats()["item"]["hit_ratio"] == 0.0
+
+    RESPONSE_CACHE._down_until = 0.0
+    PricechartingService.get_item_details(url=SMW_URL)
+    assert len(tried) == 3
+
+
+def test_cache_stats_endpoint_is_admin_only(auth_client, superuser_client, calls):
+    PricechartingService.get_item_details(url=SMW_URL)
+    url = reverse("pricecharting-cache-stats")
+
+    assert auth_client.get(url).status_code == 403
+    resp = superuser_client.get(url)
+    assert resp.status_code == 200
+    assert resp.json()["item"]["miss"] == 1
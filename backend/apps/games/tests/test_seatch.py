@@ -1,10 +1,13 @@
+import io
 import json
 from pathlib import Path
 
+import pytest
 from django.urls import reverse
 
-from apps.games.services.registry import GameRegistry
-from apps.games.services.search import GameSearchService
+from apps.games.services.registry import GameRegistry, _iter_json_array, normalize_platform
+from apps.games.services.result_cache import ResultCache
+from apps.games.services.search import GameSearchService, score_title
 from apps.games.views.games import GameSearchView
 
 
@@ -62,6 +65,54 @@ def test_search_by_name_with_platform(tmp_path: Path):
     assert result["items"][0]["Platform"] == "SNES"
 
 
+def test_registry_ngram_candidates(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+
+    (data_dir / "games.json").write_text(
+        """
+        [
+          {"Game": "Super Mario World", "Platform": "SNES"},
+          {"Game": "Metroid", "Platform": "NES"},
+          {"Game": "Mario Kart 64", "Platform": "N64"}
+        ]
+        """,
+        encoding="utf-8",
+    )
+
+    registry = GameRegistry()
+    registry.load_from_dir(data_dir)
+
+    assert registry.candidates("mario") == [0, 2]
+    assert registry.candidates("zelda") == []
+    assert registry.candidates("ma") is None
+
+
+def test_search_by_name_short_and_indexed_queries(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+
+    (data_dir / "games.json").write_text(
+        """
+        [
+          {"Game": "Super Mario World", "Platform": "SNES"},
+          {"Game": "Metroid", "Platform": "NES"},
+          {"Game": "Mario Kart 64", "Platform": "N64"}
+        ]
+        """,
+        encoding="utf-8",
+    )
+
+    registry = GameRegistry()
+    service = GameSearchService(registry=registry)
+
+    result = service.search_by_name(q="64", autoload_dir=data_dir)
+    assert [g["Game"] for g in result["items"]] == ["Mario Kart 64"]
+
+    result = service.search_by_name(q="o w", autoload_dir=data_dir)
+    assert [g["Game"] for g in result["items"]] == ["Super Mario World"]
+
+
 def test_search_by_name_empty_query(tmp_path: Path):
     data_dir = tmp_path / "gamesdb"
     data_dir.mkdir()
@@ -128,3 +179,371 @@ def test_games_search_single_mode(api_client):
     assert game_name
 
     assert "super" in game_name or "mario" in game_name
+
+
+RANK_GAMES = """
+[
+  {"Game": "Marion", "Platform": "PC"},
+  {"Game": "Dr. Mario", "Platform": "NES"},
+  {"Game": "Supermario", "Platform": "NES"},
+  {"Game": "Mario Bros.", "Platform": "NES"},
+  {"Game": "Mario", "Platform": "Arcade"},
+  {"Game": "Mario", "Platform": "NES"}
+]
+"""
+
+
+def test_score_title_levels():
+    assert score_title("mario", "mario") > score_title("mario bros.", "mario")
+    assert score_title("mario bros.", "mario") > score_title("marion", "mario")
+    assert score_title("marion", "mario") > score_title("dr. mario", "mario")
+    assert score_title("dr. mario", "mario") > score_title("supermario", "mario")
+
+
+def test_search_by_name_ranked(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    (data_dir / "games.json").write_text(RANK_GAMES, encoding="utf-8")
+
+    service = GameSearchService(registry=GameRegistry())
+    result = service.search_by_name(q="mario", ranked=True, autoload_dir=data_dir)
+
+    assert [(g["Game"], g["Platform"]) for g in result["items"]] == [
+        ("Mario", "Arcade"),
+        ("Mario", "NES"),
+        ("Mario Bros.", "NES"),
+        ("Marion", "PC"),
+        ("Dr. Mario", "NES"),
+        ("Supermario", "NES"),
+    ]
+    assert result["total"] == 6
+
+    result = service.search_by_name(
+        q="mario", ranked=True, boost_platform="nes", limit=2, offset=1, autoload_dir=data_dir
+    )
+    assert [(g["Game"], g["Platform"]) for g in result["items"]] == [
+        ("Mario", "Arcade"),
+        ("Mario Bros.", "NES"),
+    ]
+
+
+def test_search_by_name_stops_early_without_exact_total(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    (data_dir / "games.json").write_text(RANK_GAMES, encoding="utf-8")
+
+    service = GameSearchService(registry=GameRegistry())
+
+    result = service.search_by_name(q="mario", limit=2, count="none", autoload_dir=data_dir)
+    assert [g["Game"] for g in result["items"]] == ["Marion", "Dr. Mario"]
+    assert result["total"] is None
+
+    result = service.search_by_name(q="mario", limit=2, count="estimate", autoload_dir=data_dir)
+    assert result["estimated"] is True
+    assert result["total"] >= 3
+
+    result = service.search_by_name(
+        q="mario", limit=1, ranked=True, count="none", autoload_dir=data_dir
+    )
+    assert [(g["Game"], g["Platform"]) for g in result["items"]] == [("Mario", "Arcade")]
+    assert result["total"] is None
+
+    result = service.search_by_name(q="mario", limit=10, count="none", autoload_dir=data_dir)
+    assert result["total"] == 6
+    assert result["estimated"] is False
+
+
+def test_games_search_total_header(api_client):
+    url = reverse("games-search")
+
+    resp = api_client.get(url, {"q": "zelda", "total": "exact"})
+    assert int(resp["X-Total-Count"]) >= len(resp.data)
+
+    resp = api_client.get(url, {"q": "zelda"})
+    assert "X-Total-Count" not in resp
+
+    resp = api_client.get(url, {"q": "tetris", "rank": "1", "limit": 1})
+    assert resp.data[0]["Game"] == "Tetris"
+
+
+FACET_GAMES = """
+[
+  {"Game": "Super Mario World", "Platform": "the SNES"},
+  {"Game": "Super Mario Bros", "Platform": "the NES"},
+  {"Game": "Mario Kart", "Platform": "Arcade (2 players)"},
+  {"Game": "Mario Bros", "Platform": "Arcade"},
+  {"Game": "Metroid", "Platform": "the NES"}
+]
+"""
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("the Wii", "Wii"),
+        ("la Magnavox Odyssey", "Magnavox Odyssey"),
+        ("Arcade (CPS1)  (2 players)", "Arcade (CPS1)"),
+        ("the Sega Genesis (MegaDrive)", "Sega Genesis (MegaDrive)"),
+        ("Roblox", "Roblox"),
+    ],
+)
+def test_normalize_platform(raw, expected):
+    assert normalize_platform(raw) == expected
+
+
+def test_registry_platform_index(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    (data_dir / "games.json").write_text(FACET_GAMES, encoding="utf-8")
+
+    registry = GameRegistry()
+    registry.load_from_dir(data_dir)
+
+    nes = registry.platform_ids("nes")
+    assert {registry.platform_names[p] for p in nes} == {"the NES", "the SNES"}
+    assert registry.match_title("mario") == [0, 1, 2, 3]
+    assert list(registry.iter_title_matches("mario", registry.platform_ids("arcade"))) == [2, 3]
+    assert list(registry.iter_title_matches("o", registry.platform_ids("the nes"))) == [1, 4]
+
+    assert registry.platforms() == [("Arcade", 2), ("NES", 2), ("SNES", 1)]
+
+
+def test_search_by_name_facets(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    (data_dir / "games.json").write_text(FACET_GAMES, encoding="utf-8")
+
+    service = GameSearchService(registry=GameRegistry())
+    result = service.search_by_name(
+        q="mario", platform="arcade", facets=True, autoload_dir=data_dir
+    )
+
+    assert [g["Game"] for g in result["items"]] == ["Mario Kart", "Mario Bros"]
+    assert result["facets"] == [("Arcade", 2), ("NES", 1), ("SNES", 1)]
+
+
+def test_games_search_facets_and_platforms(api_client):
+    resp = api_client.get(reverse("games-search"), {"q": "zelda", "facets": "1"})
+
+    assert resp.status_code == 200
+    assert resp.data["items"]
+    assert sum(f["count"] for f in resp.data["facets"]) >= len(resp.data["items"])
+
+    resp = api_client.get(reverse("games-platforms"))
+
+    assert resp.status_code == 200
+    names = [p["platform"] for p in resp.data]
+    assert "Wii" in names
+    assert resp.data[0]["count"] >= resp.data[-1]["count"]
+
+
+def test_registry_streams_json_arrays(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr("apps.games.services.registry.READ_CHUNK", 16)
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    rows = [
+        {"Game": f"Game {i} é", "Platform": "the NES", "Dev": "Nintendo", "Year": 1990 + i}
+        for i in range(20)
+    ]
+    (data_dir / "array.json").write_text(json.dumps(rows + [1, "x"], indent=2), encoding="utf-8")
+    (data_dir / "lines.jsonl.json").write_text(
+        '{"Game": "Line One", "Platform": "SNES"}\nnot json\n\n{"Game": "Line Two"}\n',
+        encoding="utf-8",
+    )
+    (data_dir / "empty.json").write_text("  \n", encoding="utf-8")
+
+    registry = GameRegistry()
+    assert list(registry._iter_file(data_dir / "array.json")) == rows
+    assert [g["Game"] for g in registry._iter_file(data_dir / "lines.jsonl.json")] == [
+        "Line One",
+        "Line Two",
+    ]
+    assert list(registry._iter_file(data_dir / "empty.json")) == []
+
+    registry.load_from_dir(data_dir)
+    assert len(registry.games) == 22
+    first, second = [g for g in registry.games if g.get("Dev") == "Nintendo"][:2]
+    assert first["Platform"] is second["Platform"]
+    assert list(first)[0] is list(second)[0]
+
+    # a number cut by the end of a read chunk is decoded whole
+    text = "[ 1, %s ]" % ("7" * 40)
+    with io.StringIO(text[16:]) as f:
+        assert list(_iter_json_array(f, text[:16])) == [1, int("7" * 40)]
+
+    for broken in (
+        '[{"Game": "A"}, {"Game": ',
+        '[{"Game": "X"},, {"Game": "Y"}]',
+        '[{"Game": "X"}, {"Game": "Y"},]',
+        '[, {"Game": "X"}]',
+        '[{"Game": "X"} {"Game": "Y"}]',
+        '[{"Game": "X"}                     ',
+    ):
+        (data_dir / "broken.json").write_text(broken, encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            list(registry._iter_file(data_dir / "broken.json"))
+
+
+def test_registry_stream_peak_memory_is_bounded(tmp_path: Path):
+    import tracemalloc
+
+    path = tmp_path / "big.json"
+    row = {"Game": "x" * 200, "Platform": "Arcade", "Description": "y" * 800}
+    with path.open("w", encoding="utf-8") as f:
+        f.write("[" + ",\n".join(json.dumps(row) for _ in range(5000)) + "]")
+    assert path.stat().st_size > 5 * 2**20
+
+    tracemalloc.start()
+    try:
+        n = sum(1 for _ in GameRegistry()._iter_file(path))
+        _cur, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert n == 5000
+    assert peak < 2**20
+
+
+def test_result_cache_evicts_and_tracks_version():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1, {"n": 1})
+    cache.put("b", 1, {"n": 2})
+    assert cache.get("a", 1) == {"n": 1}
+    cache.put("c", 1, {"n": 3})
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == {"n": 1}
+    assert cache.get("a", 2) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_search_by_name_caches_per_data_version(tmp_path: Path):
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    (data_dir / "games.json").write_text(FACET_GAMES, encoding="utf-8")
+    registry = GameRegistry()
+    service = GameSearchService(registry=registry)
+
+    first = service.search_by_name(q="Mario ", autoload_dir=data_dir)
+    second = service.search_by_name(q="mario")
+    assert second == first
+    assert service.cache.hits == 1
+
+    service.search_by_name(q="mario", limit=1)
+    assert service.cache.misses == 2
+
+    (data_dir / "games.json").write_text(
+        '[{"Game": "Mario Golf", "Platform": "N64"}]', encoding="utf-8"
+    )
+    registry.reload()
+    assert [g["Game"] for g in service.search_by_name(q="mario")["items"]] == ["Mario Golf"]
+
+
+def test_games_search_etag_and_not_modified(api_client):
+    url = reverse("games-search")
+    resp = api_client.get(url, {"q": "zelda"})
+    etag = resp["ETag"]
+
+    assert resp.status_code == 200
+    assert "max-age=" in resp["Cache-Control"] and "public" in resp["Cache-Control"]
+    assert GameSearchView.service.registry.fingerprint[:20] in etag
+
+    resp = api_client.get(url, {"q": "zelda"}, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+    assert not resp.content
+
+    resp = api_client.get(url, {"q": "zelda"}, HTTP_IF_NONE_MATCH='"stale"')
+    assert resp.status_code == 200
+    assert api_client.get(reverse("games-platforms"), HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    assert api_client.get(url, {"year_from": "1990s"}, HTTP_IF_NONE_MATCH=etag).status_code == 400
+    assert api_client.get(url, {"q": " "}, HTTP_IF_NONE_MATCH=etag).status_code == 400
+    autocomplete = reverse("games-autocomplete")
+    assert api_client.get(autocomplete, HTTP_IF_NONE_MATCH=etag).status_code == 400
+    lookup = reverse("games-lookup")
+    assert api_client.get(lookup, HTTP_IF_NONE_MATCH=etag).status_code == 400
+    missing = reverse("games-detail", args=["0" * 16])
+    assert api_client.get(missing, HTTP_IF_NONE_MATCH=etag).status_code == 404
+
+
+FIELD_GAMES = [
+    {"Game": "Street Fighter II", "Dev": "Capcom", "Publisher": "Capcom", "Year": 1991},
+    {"Game": "Mega Man X", "Dev": "Capcom", "Publisher": "Nintendo", "Year": "1993"},
+    {"Game": "Final Fight", "Dev": "Capcom", "Publisher": "Capcom", "Year": 1989},
+    {"Game": "Fighter's History", "Dev": "Data East", "Publisher": None, "Year": 1993},
+    {"Game": "Capcom Classics", "Dev": "Digital Eclipse", "Publisher": "Capcom", "Year": None},
+    {"Game": "Super Street Fighter II", "Dev": "Capcom", "Publisher": "Capcom", "Year": "TBA"},
+]
+
+
+@pytest.fixture
+def field_registry(tmp_path: Path) -> GameRegistry:
+    data_dir = tmp_path / "gamesdb"
+    data_dir.mkdir()
+    games = [dict(g, Platform="SNES") for g in FIELD_GAMES]
+    (data_dir / "games.json").write_text(json.dumps(games), encoding="utf-8")
+    registry = GameRegistry()
+    registry.load_from_dir(data_dir)
+    return registry
+
+
+def test_registry_field_and_year_indexes(field_registry: GameRegistry):
+    registry = field_registry
+
+    assert registry.field_names["dev"] == ["capcom", "data east", "digital eclipse"]
+    assert registry.field_ids("dev", "cap") == {0, 1, 2, 5}
+    assert registry.field_ids("publisher", "none") == set()
+    assert list(registry.year_values) == [1989, 1991, 1993, 1993]
+    assert sorted(registry.year_ids(1990, 1993)) == [0, 1, 3]
+    assert list(registry.year_ids(year_to=1990)) == [2]
+    assert list(registry.year_ids(1994)) == []
+
+    assert registry.filter_ids() is None
+    assert registry.filter_ids(dev="capcom", publisher="capcom", year_from=1990) == {0}
+    assert list(registry.iter_title_matches("fight", allowed={0, 3, 4})) == [0, 3]
+    assert list(registry.iter_any_matches("capcom")) == [0, 1, 2, 4, 5]
+
+
+def test_search_by_name_field_filters(field_registry: GameRegistry):
+    service = GameSearchService(registry=field_registry)
+
+    def titles(**kw):
+        return [g["Game"] for g in service.search_by_name(**kw)["items"]]
+
+    assert titles(q="fight", dev="capcom") == [
+        "Street Fighter II",
+        "Final Fight",
+        "Super Street Fighter II",
+    ]
+    assert titles(q="fight", year_from=1990, year_to=1993) == [
+        "Street Fighter II",
+        "Fighter's History",
+    ]
+    assert titles(q="", publisher="nintendo") == ["Mega Man X"]
+    assert titles(q="fight", dev="capcom", publisher="capcom", year_to=1990) == ["Final Fight"]
+    assert titles(q="capcom", field="any", year_from=1993) == ["Mega Man X"]
+    assert titles(q="capcom") == ["Capcom Classics"]
+    assert titles(q="figter", fuzzy=True, dev="data") == ["Fighter's History"]
+    assert titles(q="") == []
+
+    data = service.search_by_name(q="fight", dev="capcom", facets=True, count="exact")
+    assert data["total"] == 3
+    assert data["facets"] == [("SNES", 3)]
+
+
+def test_games_search_field_params(api_client, field_registry: GameRegistry, monkeypatch):
+    monkeypatch.setattr(GameSearchView, "service", GameSearchService(registry=field_registry))
+    url = reverse("games-search")
+
+    resp = api_client.get(url, {"dev": "capcom", "year_from": "1990", "total": "exact"})
+    assert resp.status_code == 200
+    assert [g["Game"] for g in resp.json()] == ["Street Fighter II", "Mega Man X"]
+    assert resp["X-Total-Count"] == "2"
+
+    resp = api_client.get(url, {"q": "capcom", "field": "any", "publisher": "nintendo"})
+    assert [g["Game"] for g in resp.json()] == ["Mega Man X"]
+
+    assert api_client.get(url, {"q": "x", "year_to": "199x"}).status_code == 400
+    assert api_client.get(url, {"year_from": ""}).status_code == 400
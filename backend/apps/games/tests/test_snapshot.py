@@ -0,0 +1,182 @@
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from apps.games.apps import load_registry
+from apps.games.services.registry import GameRegistry, source_manifest
+from apps.games.services.search import GameSearchService
+from apps.games.services.snapshot import SnapshotError, StringTable, write_snapshot
+
+GAMES = """
+[
+  {"Game": "Super Mario World", "Platform": "SNES", "Year": 1990, "Dev": "Nintendo EAD"},
+  {"Game": "Super Mario Bros", "Platform": "NES", "Year": 1985},
+  {"Game": "Pokémon Red", "Platform": "Game Boy", "Year": "1996"},
+  {"Game": "Metroid", "Platform": "NES", "Year": null}
+]
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    d = tmp_path / "gamesdb"
+    d.mkdir()
+    (d / "games.json").write_text(GAMES, encoding="utf-8")
+    return d
+
+
+@pytest.fixture
+def snapshot_registry(data_dir: Path, tmp_path: Path) -> GameRegistry:
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+    path = tmp_path / "games.snap"
+    write_snapshot(source, path, sources=source_manifest(data_dir))
+
+    registry = GameRegistry()
+    assert registry.load_snapshot(path) == (4, 4)
+    return registry
+
+
+def test_snapshot_round_trip(data_dir: Path, snapshot_registry: GameRegistry):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    assert list(snapshot_registry.games) == list(source.games)
+    for lo_snap, lo_src in zip(snapshot_registry.lowers, source.lowers):
+        assert dict(lo_snap) == lo_src
+    st = (data_dir / "games.json").stat()
+    assert snapshot_registry.snapshot.header["sources"] == {
+        "games.json": [st.st_size, st.st_mtime_ns]
+    }
+    assert len(source.fingerprint) == 64
+    assert snapshot_registry.fingerprint == source.fingerprint
+
+
+@pytest.mark.parametrize("q", ["mario", "é", "o", "mon red", "zelda", "d s"])
+def test_snapshot_search_matches_json_registry(
+    data_dir: Path, snapshot_registry: GameRegistry, q: str
+):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    expected = GameSearchService(registry=source).search_by_name(q=q)
+    assert GameSearchService(registry=snapshot_registry).search_by_name(q=q) == expected
+
+
+def test_snapshot_rejects_foreign_file(tmp_path: Path):
+    path = tmp_path / "bogus.snap"
+    path.write_bytes(b"not a snapshot at all")
+
+    with pytest.raises(SnapshotError):
+        GameRegistry().load_snapshot(path)
+
+
+def test_build_games_snapshot_command(data_dir: Path, tmp_path: Path):
+    out = tmp_path / "out" / "games.snap"
+
+    call_command("build_games_snapshot", src=str(data_dir), out=str(out))
+
+    registry = GameRegistry()
+    registry.load_snapshot(out)
+    assert registry.games[0]["Game"] == "Super Mario World"
+
+
+def test_load_registry_prefers_snapshot(data_dir: Path, tmp_path: Path, settings):
+    settings.GAMES_DB_DIR = data_dir
+    settings.GAMES_DB_SNAPSHOT = tmp_path / "missing.snap"
+
+    registry = GameRegistry()
+    assert load_registry(registry) == "json"
+    assert len(registry.games) == 4
+
+    call_command("build_games_snapshot", src=str(data_dir), out=str(tmp_path / "games.snap"))
+    settings.GAMES_DB_SNAPSHOT = tmp_path / "games.snap"
+
+    registry = GameRegistry()
+    assert load_registry(registry) == "snapshot"
+    assert registry.snapshot is not None
+
+
+@pytest.mark.parametrize("q", ["super maro", "pokemon red", "metrod"])
+def test_snapshot_fuzzy_matches_json_registry(
+    data_dir: Path, snapshot_registry: GameRegistry, q: str
+):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    assert snapshot_registry.fuzzy_matches(q) == source.fuzzy_matches(q)
+    assert snapshot_registry.fuzzy_matches(q)
+
+
+@pytest.mark.parametrize("q,platform", [("mario", "nes"), ("o", "game boy"), ("e", "snes")])
+def test_snapshot_platform_filter_matches_json_registry(
+    data_dir: Path, snapshot_registry: GameRegistry, q: str, platform: str
+):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    kwargs = {"q": q, "platform": platform, "facets": True}
+    expected = GameSearchService(registry=source).search_by_name(**kwargs)
+    assert GameSearchService(registry=snapshot_registry).search_by_name(**kwargs) == expected
+    assert snapshot_registry.platforms() == source.platforms()
+
+
+@pytest.mark.parametrize("q", ["super", "super mario w", "m", "pok", "red"])
+def test_snapshot_completions_match_json_registry(
+    data_dir: Path, snapshot_registry: GameRegistry, q: str
+):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    assert snapshot_registry.complete(q) == source.complete(q)
+    assert snapshot_registry.complete(q)
+
+
+def test_in_memory_string_table_find():
+    values = ["ab", "", "ba", "aab", "ö x", "", "b", "a"]
+    table = StringTable.from_strings(values)
+
+    assert list(table) == values
+    for needle in ["a", "b", "ab", "ba", "ö", " x", "bb", "aa"]:
+        expected = [i for i, v in enumerate(values) if needle in v]
+        assert list(table.iter_find(needle)) == expected, needle
+
+    assert table.estimate_matches("a") == 5
+    assert table.estimate_matches("zz") == 0
+
+
+@pytest.mark.parametrize("q", ["o", "r", "é", "zz"])
+def test_short_queries_match_per_title_scan(data_dir: Path, q: str, monkeypatch):
+    registry = GameRegistry()
+    registry.load_from_dir(data_dir)
+    expected = [i for i, title in enumerate(registry.titles) if q in title]
+
+    assert list(registry.iter_title_matches(q)) == expected
+    monkeypatch.setattr("apps.games.services.registry.DENSE_MATCHES", 10**9)
+    assert list(registry.iter_title_matches(q)) == expected
+
+
+def test_snapshot_field_indexes_match_json_registry(
+    data_dir: Path, snapshot_registry: GameRegistry
+):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    assert (
+        list(snapshot_registry.field_names["dev"]) == source.field_names["dev"] == ["nintendo ead"]
+    )
+    assert snapshot_registry.field_ids("dev", "nintendo") == {0}
+    assert list(snapshot_registry.year_ids(1985, 1996)) == list(source.year_ids(1985, 1996))
+    assert snapshot_registry.filter_ids(year_from=1990) == {0, 2}
+
+
+def test_snapshot_id_index_matches_json_registry(data_dir: Path, snapshot_registry: GameRegistry):
+    source = GameRegistry()
+    source.load_from_dir(data_dir)
+
+    assert list(snapshot_registry.ids) == list(source.ids)
+    for i, gid in enumerate(source.ids):
+        assert snapshot_registry.game_index(gid) == i
+        assert snapshot_registry.games[i]["Id"] == gid
+    assert snapshot_registry.game_index("0" * 16) is None
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
-from apps.games.views.games import GameSearchView
+from apps.games.views.games import (
+    GameAutocompleteView,
+    GameDetailView,
+    GameLookupView,
+    GameMatchView,
+    GamePlatformsView,
+    GameSearchView,
+)
 from apps.games.views.pricecharting import (
+    PricechartingCacheStatsView,
     PriceChartingConnectViewSet,
     PricechartingItemView,
     PricechartingSearchView,
@@ -19,6 +27,11 @@ router.register(
 
 urlpatterns = [
     path("search/", GameSearchView.as_view(), name="games-search"),
+    path("platforms/", GamePlatformsView.as_view(), name="games-platforms"),
+    path("autocomplete/", GameAutocompleteView.as_view(), name="games-autocomplete"),
+    path("match/", GameMatchView.as_view(), name="games-match"),
+    path("lookup/", GameLookupView.as_view(), name="games-lookup"),
+    re_path(r"^(?P<game_id>[0-9a-f]{16})/$", GameDetailView.as_view(), name="games-detail"),
     path(
         "integrations/pricecharting/search/",
         PricechartingSearchView.as_view(),
@@ -29,5 +42,10 @@ urlpatterns = [
         PricechartingItemView.as_view(),
         name="pricecharting-item",
     ),
+    path(
+        "integrations/pricecharting/cache/",
+        PricechartingCacheStatsView.as_view(),
+        name="pricecharting-cache-stats",
+    ),
     path("", include(router.urls)),
 ]
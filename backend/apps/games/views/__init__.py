@@ -1,5 +1,13 @@
-from .games import GameSearchView
+from .games import (
+    GameAutocompleteView,
+    GameDetailView,
+    GameLookupView,
+    GameMatchView,
+    GamePlatformsView,
+    GameSearchView,
+)
 from .pricecharting import (
+    PricechartingCacheStatsView,
     PriceChartingConnectViewSet,
     PricechartingItemView,
     PricechartingSearchView,
@@ -7,7 +15,13 @@ from .pricecharting import (
 
 __all__ = [
     "GameSearchView",
+    "GamePlatformsView",
+    "GameAutocompleteView",
+    "GameMatchView",
+    "GameDetailView",
+    "GameLookupView",
     "PricechartingSearchView",
     "PricechartingItemView",
+    "PricechartingCacheStatsView",
     "PriceChartingConnectViewSet",
 ]
@@ -1,43 +1,199 @@
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
+from typing import Optional
 
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import permissions, response, status, views
 
-from apps.games.serializers import GameItemSerializer
+from apps.games.serializers import (
+    GameCompletionSerializer,
+    GameItemSerializer,
+    GameMatchQuerySerializer,
+    GameMatchSerializer,
+    GamePlatformSerializer,
+)
+from apps.games.services.db_search import search_backend
+from apps.games.services.game_links import GameLinkService
 from apps.games.services.search import GameSearchService
 
 
-class GameSearchView(views.APIView):
+def _flag(request, name: str) -> bool:
+    """
+    read boolean query parameter.
+    """
+    return str(request.query_params.get(name, "")).lower() in ("1", "true", "yes")
+
+
+def _year(request, name: str) -> Optional[int]:
+    """
+    read optional year query parameter.
+    """
+    raw = str(request.query_params.get(name, "")).strip()
+    if not raw:
+        return None
+    if not raw.isdigit():
+        raise ValueError(f"?{name}= must be a year")
+    return int(raw)
+
+
+class RegistryCachingMixin:
+    """
+    HTTP caching for read-only views over the static games registry.
+
+    the ETag is derived from the content fingerprint of the data a view
+    serves (plus the negotiated renderer), so it is the same in every
+    worker and changes only when the data does. views call `not_modified`
+    once their parameters are validated (an invalid request gets its 400,
+    not a 304) and before doing any work; the ETag is computed once per
+    request and reused for the response header.
+    """
+
+    _registry_etag: Optional[str] = None
+
+    def data_fingerprint(self) -> str:
+        registry = self.service.registry
+        registry.ensure_loaded(self.DB_PATH)
+        return registry.fingerprint
+
+    def registry_etag(self, request) -> str:
+        if self._registry_etag is None:
+            renderer = getattr(request, "accepted_renderer", None)
+            fingerprint = self.data_fingerprint()[:20]
+            self._registry_etag = f'"{fingerprint}-{getattr(renderer, "format", "json")}"'
+        return self._registry_etag
+
+    def not_modified(self, request) -> Optional[response.Response]:
+        """
+        return a 304 response if the client already has the current data.
+        """
+        return get_conditional_response(request, etag=self.registry_etag(request))
+
+    def finalize_response(self, request, resp, *args, **kwargs):
+        resp = super().finalize_response(request, resp, *args, **kwargs)
+        if request.method in ("GET", "HEAD") and resp.status_code in (200, 304):
+            resp["ETag"] = self.registry_etag(request)
+            patch_cache_control(
+                resp, public=True, max_age=getattr(settings, "GAMES_HTTP_MAX_AGE", 300)
+            )
+        return resp
+
+
+class GameSearchView(RegistryCachingMixin, views.APIView):
     """
     Search endpoint for local GamesDB (static JSON database).
     """
 
     permission_classes = [permissions.AllowAny]
     DB_PATH = Path(__file__).resolve().parent.parent / "gamesdb"
-    service = GameSearchService()
+    service = GameSearchService(
+        cache_size=getattr(settings, "GAMES_SEARCH_CACHE_SIZE", 1024),
+        backend=search_backend(),
+    )
+
+    def data_fingerprint(self) -> str:
+        fingerprint = self.service.fingerprint(self.DB_PATH)
+        if _flag(self.request, "pricecharting"):
+            raw = f"{fingerprint}|{GameLinkService.version()}".encode("utf-8")
+            fingerprint = hashlib.blake2b(raw, digest_size=10).hexdigest()
+        return fingerprint
 
     @extend_schema(
         summary="Game search",
         tags=["Games"],
         parameters=[
-            OpenApiParameter("q", OpenApiTypes.STR, OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(
+                "q",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description="Title text; optional when dev, publisher or a year is given",
+            ),
             OpenApiParameter("platform", OpenApiTypes.STR, OpenApiParameter.QUERY),
+            OpenApiParameter(
+                "dev",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description="Developer contains this text",
+            ),
+            OpenApiParameter(
+                "publisher",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description="Publisher contains this text",
+            ),
+            OpenApiParameter("year_from", OpenApiTypes.INT, OpenApiParameter.QUERY),
+            OpenApiParameter("year_to", OpenApiTypes.INT, OpenApiParameter.QUERY),
+            OpenApiParameter(
+                "field",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description="title (default) | any: q also matches developer and publisher",
+            ),
             OpenApiParameter("single", OpenApiTypes.BOOL, OpenApiParameter.QUERY),
             OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY),
             OpenApiParameter("offset", OpenApiTypes.INT, OpenApiParameter.QUERY),
+            OpenApiParameter(
+                "rank",
+                OpenApiTypes.BOOL,
+                OpenApiParameter.QUERY,
+                description="Order by relevance: exact > prefix > word > substring",
+            ),
+            OpenApiParameter(
+                "prefer_platform",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description="Rank games on this platform higher (with rank=1)",
+            ),
+            OpenApiParameter(
+                "fuzzy",
+                OpenApiTypes.BOOL,
+                OpenApiParameter.QUERY,
+                description="Tolerate typos in title words (edit distance 1-2)",
+            ),
+            OpenApiParameter(
+                "facets",
+                OpenApiTypes.BOOL,
+                OpenApiParameter.QUERY,
+                description="Wrap response as {items, facets} with per-platform match counts",
+            ),
+            OpenApiParameter(
+                "total",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description="exact | estimate; returned in X-Total-Count header",
+            ),
+            OpenApiParameter(
+                "pricecharting",
+                OpenApiTypes.BOOL,
+                OpenApiParameter.QUERY,
+                description="Attach the linked PriceCharting entry with its cached prices",
+            ),
         ],
         responses={200: GameItemSerializer(many=True)},
     )
     def get(self, request):
         """
         perform substring search over local games registry.
+
+        the total number of matches is only computed when asked for with
+        ?total=exact|estimate, so plain pages stop scanning once filled.
         """
         q = request.query_params.get("q", "")
         platform = request.query_params.get("platform")
-        single = str(request.query_params.get("single", "")).lower() in ("1", "true", "yes")
+        dev = request.query_params.get("dev", "")
+        publisher = request.query_params.get("publisher", "")
+        field = "any" if request.query_params.get("field") == "any" else "title"
+        single = _flag(request, "single")
+        ranked = _flag(request, "rank")
+        fuzzy = _flag(request, "fuzzy")
+        facets = _flag(request, "facets") and not single
+        total_mode = str(request.query_params.get("total", "")).lower()
+        if total_mode not in ("exact", "estimate") or single:
+            total_mode = "none"
 
         try:
             limit = max(1, min(int(request.query_params.get("limit") or 50), 50))
@@ -49,22 +205,237 @@ class GameSearchView(views.APIView):
         except ValueError:
             offset = 0
 
-        if not q.strip():
+        try:
+            year_from = _year(request, "year_from")
+            year_to = _year(request, "year_to")
+        except ValueError as e:
+            return response.Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not (q.strip() or dev.strip() or publisher.strip()) and year_from is year_to is None:
             return response.Response(
                 {"detail": "Please provide query parameter ?q="},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        cached = self.not_modified(request)
+        if cached is not None:
+            return cached
+
         data = self.service.search_by_name(
             q=q,
             platform=platform,
             limit=1 if single else limit,
             offset=0 if single else offset,
             autoload_dir=self.DB_PATH,
+            ranked=ranked,
+            boost_platform=request.query_params.get("prefer_platform"),
+            count=total_mode,
+            fuzzy=fuzzy,
+            facets=facets,
+            dev=dev,
+            publisher=publisher,
+            year_from=year_from,
+            year_to=year_to,
+            field=field,
         )
 
         items = data["items"]
+        if _flag(request, "pricecharting"):
+            items = GameLinkService.annotate(items)
         if single:
             return response.Response(items[0] if items else {}, status=status.HTTP_200_OK)
 
-        return response.Response(items, status=status.HTTP_200_OK)
+        body = items
+        if facets:
+            body = {
+                "items": items,
+                "facets": [{"platform": p, "count": n} for p, n in data["facets"]],
+            }
+
+        resp = response.Response(body, status=status.HTTP_200_OK)
+        if data["total"] is not None and total_mode != "none":
+            header = "X-Total-Estimate" if data["estimated"] else "X-Total-Count"
+            resp[header] = str(data["total"])
+        return resp
+
+
+class GamePlatformsView(RegistryCachingMixin, views.APIView):
+    """
+    List platforms of the local GamesDB with their number of games.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    DB_PATH = GameSearchView.DB_PATH
+    service = GameSearchView.service
+
+    @extend_schema(
+        summary="Game platforms",
+        tags=["Games"],
+        responses={200: GamePlatformSerializer(many=True)},
+    )
+    def get(self, request):
+        """
+        return all platforms from the platform index, largest first.
+        """
+        cached = self.not_modified(request)
+        if cached is not None:
+            return cached
+
+        registry = self.service.registry
+        registry.ensure_loaded(self.DB_PATH)
+        data = [{"platform": p, "count": n} for p, n in registry.platforms()]
+        return response.Response(data, status=status.HTTP_200_OK)
+
+
+class GameAutocompleteView(RegistryCachingMixin, views.APIView):
+    """
+    Typeahead completions of game titles from the local GamesDB.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    DB_PATH = GameSearchView.DB_PATH
+    service = GameSearchView.service
+    MAX_LIMIT = 20
+
+    @extend_schema(
+        summary="Game title autocomplete",
+        tags=["Games"],
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                OpenApiParameter.QUERY,
+                description="Number of completions (default 10, max 20)",
+            ),
+        ],
+        responses={200: GameCompletionSerializer(many=True)},
+    )
+    def get(self, request):
+        """
+        return compact completions: titles starting with q first, then
+        titles with a word starting with the last typed word.
+        """
+        q = request.query_params.get("q", "")
+        if not q.strip():
+            return response.Response(
+                {"detail": "Please provide query parameter ?q="},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = max(1, min(int(request.query_params.get("limit") or 10), self.MAX_LIMIT))
+        except ValueError:
+            limit = 10
+
+        cached = self.not_modified(request)
+        if cached is not None:
+            return cached
+
+        data = self.service.complete(q=q, limit=limit, autoload_dir=self.DB_PATH)
+        return response.Response(data, status=status.HTTP_200_OK)
+
+
+class GameMatchView(views.APIView):
+    """
+    Batch lookup of many {title, platform} rows in the local GamesDB.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    DB_PATH = GameSearchView.DB_PATH
+    service = GameSearchView.service
+
+    @extend_schema(
+        summary="Game batch match",
+        tags=["Games"],
+        request=GameMatchQuerySerializer,
+        responses={200: GameMatchSerializer(many=True)},
+    )
+    def post(self, request):
+        """
+        return the best match and a confidence in [0, 1] for every row,
+        in request order; rows without any match get match=null.
+        """
+        params = GameMatchQuerySerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        data = self.service.match_many(params.validated_data["items"], autoload_dir=self.DB_PATH)
+        return response.Response(data, status=status.HTTP_200_OK)
+
+
+class GameDetailView(RegistryCachingMixin, views.APIView):
+    """
+    A single game of the local GamesDB by its stable id.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    DB_PATH = GameSearchView.DB_PATH
+    service = GameSearchView.service
+
+    @extend_schema(
+        summary="Game detail",
+        tags=["Games"],
+        responses={200: GameItemSerializer},
+    )
+    def get(self, request, game_id: str):
+        """
+        return the game with this id from the registry id index.
+        """
+        game = self.service.get(game_id, autoload_dir=self.DB_PATH)
+        if game is None:
+            return response.Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        cached = self.not_modified(request)
+        if cached is not None:
+            return cached
+
+        return response.Response(game, status=status.HTTP_200_OK)
+
+
+class GameLookupView(RegistryCachingMixin, views.APIView):
+    """
+    Bulk lookup of games of the local GamesDB by their stable ids.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    DB_PATH = GameSearchView.DB_PATH
+    service = GameSearchView.service
+    MAX_IDS = 100
+
+    @extend_schema(
+        summary="Game bulk lookup",
+        tags=["Games"],
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                required=True,
+                description="Comma-separated game ids (max 100)",
+            ),
+        ],
+        responses={200: GameItemSerializer(many=True)},
+    )
+    def get(self, request):
+        """
+        return known games in the requested order; unknown ids are skipped.
+        """
+        raw = ",".join(request.query_params.getlist("ids"))
+        ids = list(dict.fromkeys(i.strip() for i in raw.split(",") if i.strip()))
+        if not ids:
+            return response.Response(
+                {"detail": "Please provide query parameter ?ids="},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > self.MAX_IDS:
+            return response.Response(
+                {"detail": f"At most {self.MAX_IDS} ids per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cached = self.not_modified(request)
+        if cached is not None:
+            return cached
+
+        games = self.service.get_many(ids, autoload_dir=self.DB_PATH)
+        return response.Response([g for g in games if g is not None], status=status.HTTP_200_OK)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import math
+from contextlib import contextmanager
+
 from django.db.models import Count
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from rest_framework import decorators, permissions, response, status, views, viewsets
+from rest_framework import decorators, exceptions, permissions, response, status, views, viewsets
 
+from apps.games.integrations.pricecharting import PricechartingThrottled
 from apps.games.models import PriceChartingConnect
 from apps.games.serializers import (
     BindSerializer,
@@ -13,6 +17,32 @@ from apps.games.serializers import (
     UnbindSerializer,
 )
 from apps.games.services.pricecharting import PricechartingService
+from apps.games.services.response_cache import RESPONSE_CACHE
+
+
+class PricechartingUnavailable(exceptions.APIException):
+    """
+    pricecharting is pushing back or our request budget is spent (503).
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "PriceCharting is temporarily unavailable, try again later."
+    default_code = "pricecharting_unavailable"
+
+    def __init__(self, wait: float = 0.0) -> None:
+        super().__init__()
+        self.wait = math.ceil(wait) or None
+
+
+@contextmanager
+def upstream_errors():
+    """
+    turn pricecharting throttling into a 503 with Retry-After.
+    """
+    try:
+        yield
+    except PricechartingThrottled as e:
+        raise PricechartingUnavailable(e.retry_after) from e
 
 
 @extend_schema(
@@ -45,7 +75,8 @@ class PricechartingSearchView(views.APIView):
         params = SearchQuerySerializer(data=request.query_params)
         params.is_valid(raise_exception=True)
 
-        items = PricechartingService.search_items(**params.validated_data)
+        with upstream_errors():
+            items = PricechartingService.search_items(**params.validated_data)
         return response.Response(items)
 
 
@@ -71,10 +102,23 @@ class PricechartingItemView(views.APIView):
         url = params.validated_data.get("url")
         slug = params.validated_data.get("slug")
 
-        data = PricechartingService.get_item_details(url=url, slug=slug)
+        with upstream_errors():
+            data = PricechartingService.get_item_details(url=url, slug=slug)
         return response.Response(data)
 
 
+@extend_schema(summary="PriceCharting response cache stats", tags=["Games"])
+class PricechartingCacheStatsView(views.APIView):
+    """
+    hit/stale/miss counters of the pricecharting response cache (admins only).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return response.Response(RESPONSE_CACHE.stats())
+
+
 @extend_schema(tags=["Games"])
 class PriceChartingConnectViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -110,7 +154,8 @@ class PriceChartingConnectViewSet(viewsets.ReadOnlyModelViewSet):
         """
         ser = self.get_serializer(data=request.data)
         ser.is_valid(raise_exception=True)
-        obj = ser.save()
+        with upstream_errors():
+            obj = ser.save()
 
         obj = (
             PriceChartingConnect.objects.filter(id=obj.id)
@@ -192,6 +192,64 @@ SPECTACULAR_SETTINGS = {
 
 
 PRICECHARTING_URL = os.getenv("PRICECHARTING_URL", "https://www.pricecharting.com")
+# shared keep-alive pool of the pricecharting scraper, one per process
+PRICECHARTING_HTTP_MAX_CONNECTIONS = int(os.getenv("PRICECHARTING_HTTP_MAX_CONNECTIONS", "10"))
+PRICECHARTING_HTTP_MAX_KEEPALIVE = int(os.getenv("PRICECHARTING_HTTP_MAX_KEEPALIVE", "5"))
+PRICECHARTING_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("PRICECHARTING_HTTP_KEEPALIVE_EXPIRY", "30"))
+PRICECHARTING_HTTP_TIMEOUT = float(os.getenv("PRICECHARTING_HTTP_TIMEOUT", "20"))
+PRICECHARTING_HTTP_CONNECT_TIMEOUT = float(os.getenv("PRICECHARTING_HTTP_CONNECT_TIMEOUT", "5"))
+# needs the h2 package (httpx[http2]); falls back to http/1.1 without it
+PRICECHARTING_HTTP2 = os.getenv("PRICECHARTING_HTTP2", "0") == "1"
+# bulk price refresh: pages fetched at once, seconds between requests, rows per write
+PRICECHARTING_REFRESH_CONCURRENCY = int(os.getenv("PRICECHARTING_REFRESH_CONCURRENCY", "8"))
+PRICECHARTING_REFRESH_DELAY = float(os.getenv("PRICECHARTING_REFRESH_DELAY", "0.25"))
+PRICECHARTING_REFRESH_BATCH = int(os.getenv("PRICECHARTING_REFRESH_BATCH", "100"))
+# connects per celery subtask of the scheduled refresh
+PRICECHARTING_REFRESH_CHUNK = int(os.getenv("PRICECHARTING_REFRESH_CHUNK", "500"))
+# html tree builder for scraped pages; empty picks lxml when installed
+PRICECHARTING_HTML_PARSER = os.getenv("PRICECHARTING_HTML_PARSER", "")
+# shared budget for requests to pricecharting.com (see RateLimiter); an
+# empty url turns the limiter off
+PRICECHARTING_RATE_LIMIT_URL = os.getenv("PRICECHARTING_RATE_LIMIT_URL", "")
+PRICECHARTING_RATE = float(os.getenv("PRICECHARTING_RATE", "2"))
+PRICECHARTING_RATE_BURST = int(os.getenv("PRICECHARTING_RATE_BURST", "5"))
+PRICECHARTING_RATE_MIN = float(os.getenv("PRICECHARTING_RATE_MIN", "0.1"))
+PRICECHARTING_RATE_RESERVE = int(os.getenv("PRICECHARTING_RATE_RESERVE", "2"))
+PRICECHARTING_RATE_COOLDOWN = float(os.getenv("PRICECHARTING_RATE_COOLDOWN", "30"))
+PRICECHARTING_RATE_MAX_WAIT = {
+    "interactive": float(os.getenv("PRICECHARTING_RATE_MAX_WAIT_INTERACTIVE", "10")),
+    "background": float(os.getenv("PRICECHARTING_RATE_MAX_WAIT_BACKGROUND", "300")),
+}
+
+# response cache of the search/item proxy endpoints: seconds an entry is fresh,
+# then seconds it may still be served while it is refetched in the background
+PRICECHARTING_CACHE_URL = os.getenv("PRICECHARTING_CACHE_URL", "redis://127.0.0.1:6379/2")
+PRICECHARTING_CACHE_TTL = {
+    "search": int(os.getenv("PRICECHARTING_CACHE_SEARCH_TTL", "600")),
+    "item": int(os.getenv("PRICECHARTING_CACHE_ITEM_TTL", "3600")),
+}
+PRICECHARTING_CACHE_STALE = {
+    "search": int(os.getenv("PRICECHARTING_CACHE_SEARCH_STALE", "86400")),
+    "item": int(os.getenv("PRICECHARTING_CACHE_ITEM_STALE", "86400")),
+}
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "pricecharting": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": PRICECHARTING_CACHE_URL,
+        "TIMEOUT": None,
+        "OPTIONS": {"socket_connect_timeout": 1, "socket_timeout": 1},
+    },
+}
+
+
+GAMES_DB_AUTOLOAD = os.getenv("GAMES_DB_AUTOLOAD", "1") == "1"
+GAMES_DB_RELOAD_INTERVAL = float(os.getenv("GAMES_DB_RELOAD_INTERVAL", "0"))
+GAMES_SEARCH_CACHE_SIZE = int(os.getenv("GAMES_SEARCH_CACHE_SIZE", "1024"))
+GAMES_HTTP_MAX_AGE = int(os.getenv("GAMES_HTTP_MAX_AGE", "300"))
+# "registry" (in-process) or "database" (games table, see manage.py import_games)
+GAMES_SEARCH_BACKEND = os.getenv("GAMES_SEARCH_BACKEND", "registry")
 
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
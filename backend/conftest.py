@@ -1,9 +1,14 @@
+import json
+import os
+
 import factory
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from rest_framework.test import APIClient
 
 from apps.accounts.models import Follow
+from apps.games.services.registry import GameRegistry
 
 User = get_user_model()
 
@@ -54,3 +59,46 @@ def superuser_client(superuser):
     client = APIClient()
     client.force_authenticate(user=superuser)
     return client
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def games_dir(tmp_path):
+    """
+    write a list of game records (or raw json text) to a file of one
+    gamesdb directory and return the directory:
+    games_dir(GAMES), games_dir(MORE, "b.json", mtime_ns=10**18), games_dir().
+    """
+    path = tmp_path / "gamesdb"
+    path.mkdir()
+
+    def write(games=None, name="games.json", *, mtime_ns=None):
+        if games is not None:
+            text = games if isinstance(games, str) else json.dumps(games)
+            (path / name).write_text(text, encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(path / name, ns=(mtime_ns, mtime_ns))
+        return path
+
+    return write
+
+
+@pytest.fixture
+def games_registry(games_dir):
+    """
+    registry loaded from the `games_dir` directory, after optionally
+    writing `games` to it: games_registry(GAMES).
+    """
+
+    def load(games=None, name="games.json"):
+        registry = GameRegistry()
+        registry.load_from_dir(games_dir(games, name))
+        return registry
+
+    return load
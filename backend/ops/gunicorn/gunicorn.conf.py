@@ -1,4 +1,6 @@
+import gc
 import os
+import sys
 
 bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
 
@@ -22,3 +24,32 @@ worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
 
 max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
 max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+
+# load the app (and the games registry) once in the master; workers inherit it
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+
+def when_ready(server):
+    """
+    move everything loaded by the preloaded app into the permanent gc
+    generation, so collections in workers do not touch (and copy) those pages.
+    """
+    if preload_app:
+        gc.freeze()
+        server.log.info("gc.freeze: %d objects frozen before fork", gc.get_freeze_count())
+
+
+def worker_exit(server, worker):
+    """
+    close the worker's pooled pricecharting connections.
+
+    only done when the worker has used the pool: importing it here would
+    need configured django settings. a forked worker drops the master's
+    connections by itself (see SharedHttpClient).
+    """
+    http = sys.modules.get("apps.games.integrations.pricecharting.http")
+    if http is None:
+        return
+    http.HTTP.close()
+    server.log.info("pricecharting http pool: %s", http.HTTP.stats())